@@ -0,0 +1,223 @@
+"""
+Benchmark: lxml main-content extractor vs the legacy BeautifulSoup heuristics
+
+Runs core.content_extractor and copies of the heuristics ContentScraper and
+ResearchWriter used before over a fixture set with known article text, in
+four layouts:
+
+    corpus      the bench suite's article pages (<article>, sidebar, nav, scripts)
+    div-soup    no <article>; a "content-promo" box and a link-heavy menu come
+                before the story div, reader comments follow it
+    main-text   story text directly in <div>s separated by <br>, inside <main>
+                next to a long comment thread
+    aspnet      WebForms page: the whole body inside <form id="aspnetForm">,
+                with a search box, view state and a poll beside the story
+
+For each extractor it reports pages/second, recall (share of the article's
+paragraphs found) and noise (share of returned text that is not article
+text). --pages DIR times saved pages (*.html) without scoring them.
+
+Usage:
+    python benchmarks/bench_extract.py [--articles 60] [--repeat 5] [--pages DIR]
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from html import escape
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from core.content_extractor import extract_main_content  # noqa: E402
+from fixtures import Corpus  # noqa: E402
+
+COMMENT = ('I have lived here for twenty years, and honestly this is the first time the council has listened, '
+           'although I doubt the money will arrive before the next election.')
+
+
+# ----------------------------------------------------------------------
+# Fixture layouts
+# ----------------------------------------------------------------------
+
+def div_soup_page(headline: str, paragraphs, byline: str) -> bytes:
+    menu = ''.join(f'<a href="/s/{i}">Section {i}</a> ' for i in range(30))
+    promo = ''.join(f'<p><a href="/promo/{i}">Subscribe today and get offer number {i} for just one dollar</a></p>'
+                    for i in range(4))
+    comments = ''.join(f'<div class="comment"><p>{COMMENT}</p></div>' for _ in range(6))
+    body = ''.join(f'<p>{escape(paragraph)}</p>' for paragraph in paragraphs)
+    return f"""<html><head><title>{escape(headline)} | Daily Synthetic</title></head><body>
+<div class="top-menu">{menu}</div>
+<div class="content-promo">{promo}</div>
+<div id="wrapper"><div class="col-8"><h1>{escape(headline)}</h1><span>By {escape(byline)}</span>
+<div id="story-body">{body}</div></div>
+<div class="col-4"><div class="comments">{comments}</div></div></div>
+</body></html>""".encode('utf-8')
+
+
+def main_text_page(headline: str, paragraphs, byline: str) -> bytes:
+    comments = ''.join(f'<p>{COMMENT}</p>' for _ in range(10))
+    body = '<br><br>'.join(escape(paragraph) for paragraph in paragraphs)
+    return f"""<html><head><title>{escape(headline)}</title>
+<script>{'var tracking = 1;' * 100}</script></head><body>
+<nav>{''.join(f'<a href="/n/{i}">Nav {i}</a>' for i in range(20))}</nav>
+<main><h1>{escape(headline)}</h1><div class="meta">By {escape(byline)}</div>
+<div class="entry-text"><div>{body}</div></div>
+<section id="discussion">{comments}</section></main>
+</body></html>""".encode('utf-8')
+
+
+def aspnet_page(headline: str, paragraphs, byline: str) -> bytes:
+    menu = ''.join(f'<li><a href="/Section.aspx?id={i}">Section {i}</a></li>' for i in range(15))
+    body = ''.join(f'<p>{escape(paragraph)}</p>' for paragraph in paragraphs)
+    poll = ''.join(f'<label><input type="radio" name="poll" value="{i}"> Option number {i} in the reader poll</label>'
+                   for i in range(4))
+    return f"""<html><head><title>{escape(headline)} - City Desk</title></head><body>
+<form method="post" action="./Article.aspx?id=1" id="aspnetForm">
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{'dDwtMTA4MzE0MjEwNTs7Pg' * 40}" />
+<div id="header"><ul class="menu">{menu}</ul>
+<input name="ctl00$Search" type="text" /><input type="submit" name="ctl00$Go" value="Search" /></div>
+<div id="ctl00_Main"><div class="article"><h1>{escape(headline)}</h1><span class="byline">By {escape(byline)}</span>
+{body}</div>
+<div class="poll"><p>Have your say on today's story?</p>{poll}<button type="submit">Vote</button></div></div>
+</form></body></html>""".encode('utf-8')
+
+
+def fixture_set(count: int):
+    """[(layout, html, expected paragraphs)]"""
+    corpus = Corpus(feeds=max(1, count // 20 + 1), entries_per_feed=20)
+    pages = []
+    for article in range(count):
+        event, paragraphs, byline = corpus.article_parts(article)
+        headline = corpus.headline(event, 0)
+        layout = ('corpus', 'div-soup', 'main-text', 'aspnet')[article % 4]
+        if layout == 'corpus':
+            html = corpus.article_html(article)
+        elif layout == 'div-soup':
+            html = div_soup_page(headline, paragraphs, byline)
+        elif layout == 'main-text':
+            html = main_text_page(headline, paragraphs, byline)
+        else:
+            html = aspnet_page(headline, paragraphs, byline)
+        pages.append((layout, html, paragraphs))
+    return pages
+
+
+# ----------------------------------------------------------------------
+# Extractors: pre-refactor heuristics and the shared lxml extractor
+# ----------------------------------------------------------------------
+
+def legacy_scraper(html: bytes) -> str:
+    """ContentScraper before: <article> / content-ish div / body, then its <p>s"""
+    soup = BeautifulSoup(html, 'html.parser')
+    article = soup.find('article') or soup.find('div', class_=re.compile('content|article|story', re.I))
+    if not article:
+        article = soup.body
+    return ' '.join(p.get_text() for p in article.find_all('p'))
+
+
+def legacy_research(html: bytes) -> str:
+    """ResearchWriter._parse_article before: first selector with > 200 chars, else body"""
+    soup = BeautifulSoup(html, 'html.parser')
+    content = None
+    for selector in [soup.find('article'), soup.find('main'), soup.find(class_='content'),
+                     soup.find(class_='article'), soup.find(class_='post')]:
+        if selector:
+            for tag in selector.find_all(['script', 'style', 'nav']):
+                tag.decompose()
+            content = selector.get_text(separator=' ', strip=True)
+            if len(content) > 200:
+                break
+    if not content or len(content) < 200:
+        body = soup.find('body')
+        if body:
+            for tag in body.find_all(['script', 'style', 'nav', 'aside']):
+                tag.decompose()
+            content = body.get_text(separator=' ', strip=True)
+    return content or ''
+
+
+def lxml_paragraphs(html: bytes) -> str:
+    page = extract_main_content(html)
+    return ' '.join(page['paragraphs']) if page else ''
+
+
+def lxml_text(html: bytes) -> str:
+    page = extract_main_content(html)
+    return page['text'] if page else ''
+
+
+EXTRACTORS = (
+    ('legacy scraper', legacy_scraper),
+    ('legacy research', legacy_research),
+    ('lxml paragraphs', lxml_paragraphs),
+    ('lxml text', lxml_text),
+)
+
+
+def normalise(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def quality(text: str, expected):
+    """(recall, noise) of extracted text against the article's paragraphs"""
+    text = normalise(text)
+    found = [paragraph for paragraph in expected if normalise(paragraph) in text]
+    recall = len(found) / len(expected) if expected else 1.0
+    useful = sum(len(normalise(paragraph)) + 1 for paragraph in found)
+    noise = max(0.0, 1 - useful / len(text)) if text else 1.0
+    return recall, noise
+
+
+def pages_per_second(func, pages, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            func(html)
+        timings.append(time.perf_counter() - start)
+    return len(pages) / statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--articles', type=int, default=60, help='Fixture pages (split over the four layouts)')
+    parser.add_argument('--pages', help='Directory of saved pages (*.html) to time instead')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.pages:
+        saved = [path.read_bytes() for path in sorted(Path(args.pages).glob('*.html'))]
+        if not saved:
+            sys.exit(f"No .html files in {args.pages}")
+        print(f"{len(saved)} saved pages\n\n{'extractor':<16} {'pages/s':>9} {'avg chars':>10}")
+        for name, func in EXTRACTORS:
+            rate = pages_per_second(func, saved, args.repeat)
+            chars = statistics.mean(len(func(html)) for html in saved)
+            print(f"{name:<16} {rate:>9.1f} {chars:>10.0f}")
+        return
+
+    fixtures = fixture_set(args.articles)
+    layouts = sorted({layout for layout, _, _ in fixtures})
+    print(f"{len(fixtures)} fixture pages ({', '.join(layouts)})\n")
+    header = f"{'extractor':<16} {'pages/s':>9}" + ''.join(f" {layout + ' R/N':>17}" for layout in layouts)
+    print(header)
+    for name, func in EXTRACTORS:
+        rate = pages_per_second(func, [html for _, html, _ in fixtures], args.repeat)
+        row = f"{name:<16} {rate:>9.1f}"
+        for layout in layouts:
+            scores = [quality(func(html), expected) for kind, html, expected in fixtures if kind == layout]
+            recall = statistics.mean(score[0] for score in scores)
+            noise = statistics.mean(score[1] for score in scores)
+            row += f" {recall:>8.0%}/{noise:>7.0%}"
+        print(row)
+    print("\nR = article paragraphs recovered, N = share of returned text that is not article text")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark: single-pass fact extraction vs the legacy per-pattern sweeps
+
+Extracts dates, entities, quotes and fact sentences from a corpus of saved
+article pages, with core.fact_extractor and with a copy of the methods
+ContentScraper used before. HTML parsing and paragraph joining happen once per
+page outside the timed region, so the numbers are the extraction cost alone.
+
+Pages come from --pages DIR (*.html, e.g. pages saved from real sources) or
+are generated from the synthetic corpus; --save DIR writes the generated
+pages so later runs use the same files.
+
+Usage:
+    python benchmarks/bench_facts.py [--pages DIR | --articles 200 [--save DIR]] [--repeat 20]
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from core.fact_extractor import extract_facts  # noqa: E402
+from fixtures import Corpus  # noqa: E402
+
+
+# ----------------------------------------------------------------------
+# Pre-refactor ContentScraper extraction (per-pattern findall, soup.get_text)
+# ----------------------------------------------------------------------
+
+def legacy_dates(text):
+    date_patterns = [
+        r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}',
+        r'\d{4}-\d{1,2}-\d{1,2}',
+        r'\d{1,2}/\d{1,2}/\d{4}'
+    ]
+    dates = []
+    for pattern in date_patterns:
+        dates.extend(re.findall(pattern, text, re.IGNORECASE))
+    return list(set(dates))
+
+
+def legacy_proper_nouns(text):
+    words = text.split()
+    proper_nouns = []
+    for i, word in enumerate(words):
+        if word and word[0].isupper() and len(word) > 2:
+            if i > 0 and words[i - 1][-1] not in '.!?':
+                proper_nouns.append(word.strip('.,;:'))
+    return list(set(proper_nouns))[:20]
+
+
+def legacy_quotes(article):
+    quotes = []
+    for blockquote in article.find_all('blockquote'):
+        text = blockquote.get_text().strip()
+        if text:
+            quotes.append(text)
+    text = article.get_text()
+    quotes.extend(re.findall(r'["“]([^"”]{20,200})["”]', text))
+    return quotes[:5]
+
+
+def legacy_facts(text):
+    facts = []
+    for sentence in re.split(r'[.!?]+', text):
+        sentence = sentence.strip()
+        if len(sentence) < 20 or len(sentence) > 300:
+            continue
+        has_number = bool(re.search(r'\d+', sentence))
+        has_keyword = any(kw in sentence.lower() for kw in [
+            'said', 'announced', 'confirmed', 'reported', 'found',
+            'according', 'however', 'yesterday', 'today', 'showed'
+        ])
+        if has_number or has_keyword:
+            facts.append(sentence)
+    return facts[:10]
+
+
+def legacy_extract(page):
+    article, text, _ = page
+    return {
+        'dates': legacy_dates(text),
+        'names': legacy_proper_nouns(text),
+        'quotes': legacy_quotes(article)[:5],
+        'facts': legacy_facts(text)[:10],
+    }
+
+
+def single_pass_extract(page):
+    _, text, blockquotes = page
+    return extract_facts(text, blockquotes)
+
+
+# ----------------------------------------------------------------------
+
+def load_pages(args):
+    if args.pages:
+        files = sorted(Path(args.pages).glob('*.html'))
+        if not files:
+            sys.exit(f"No .html files in {args.pages}")
+        return [path.read_bytes() for path in files]
+
+    corpus = Corpus(feeds=max(1, args.articles // 20 + 1), entries_per_feed=20)
+    pages = [corpus.article_html(article) for article in range(args.articles)]
+    if args.save:
+        target = Path(args.save)
+        target.mkdir(parents=True, exist_ok=True)
+        for index, html in enumerate(pages):
+            (target / f"article-{index:04d}.html").write_bytes(html)
+        print(f"Saved {len(pages)} pages to {target}")
+    return pages
+
+
+def prepare(html: bytes):
+    """Article soup (the legacy quotes need it), paragraph text and blockquotes"""
+    soup = BeautifulSoup(html, 'html.parser')
+    article = soup.find('article') or soup.find('div', class_=re.compile('content|article|story', re.I)) or soup.body
+    text = ' '.join(p.get_text() for p in article.find_all('p'))
+    blockquotes = [blockquote.get_text() for blockquote in article.find_all('blockquote')]
+    return article, text, blockquotes
+
+
+def bench(func, pages, repeat: int) -> float:
+    """Median milliseconds per article"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        timings.append((time.perf_counter() - start) / len(pages))
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', help='Directory of saved article pages (*.html)')
+    parser.add_argument('--articles', type=int, default=200, help='Generated pages when --pages is not given')
+    parser.add_argument('--save', help='Write the generated pages to this directory')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = [prepare(html) for html in load_pages(args)]
+    words = statistics.mean(len(page[1].split()) for page in pages)
+    print(f"Corpus: {len(pages)} pages, {words:.0f} paragraph words per page\n")
+
+    print(f"{'extractor':<14} {'ms/article':>11} {'facts':>7} {'names':>7} {'dates':>7} {'quotes':>7}")
+    for name, func in (('legacy', legacy_extract), ('single-pass', single_pass_extract)):
+        per_article = bench(func, pages, args.repeat)
+        results = [func(page) for page in pages]
+        totals = {key: sum(len(result[key]) for result in results) for key in ('facts', 'names', 'dates', 'quotes')}
+        print(f"{name:<14} {per_article:>11.3f} {totals['facts']:>7} {totals['names']:>7} "
+              f"{totals['dates']:>7} {totals['quotes']:>7}")
+
+    same = sum(1 for page in pages
+               if set(legacy_extract(page)['facts']) == set(single_pass_extract(page)['facts'])
+               and set(legacy_dates(page[1])) == set(single_pass_extract(page)['dates']))
+    print(f"\nPages with identical facts and dates: {same}/{len(pages)}")
+
+
+if __name__ == '__main__':
+    main()
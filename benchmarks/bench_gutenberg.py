@@ -0,0 +1,137 @@
+"""
+Benchmark: single-pass Gutenberg converter vs the legacy per-tag regex sweeps
+
+Builds a ~3,000-word article (headings, paragraphs with inline markup, nested
+lists, figures, quotes) and converts it with core.gutenberg and with a copy of
+the regex converter the WordPress clients used before. Reports time per
+conversion, block counts and whether each output keeps document order.
+
+Usage:
+    python benchmarks/bench_gutenberg.py [--words 3000] [--repeat 200]
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.gutenberg import convert_html_to_blocks  # noqa: E402
+
+WORDS = ('market', 'growth', 'policy', 'report', 'city', 'council', 'energy', 'data', 'river', 'school',
+         'budget', 'health', 'season', 'league', 'votes', 'storm', 'coast', 'transport', 'digital', 'farmers')
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def make_article(total_words: int, seed: int = 7) -> str:
+    """Editor-style article HTML with roughly total_words words"""
+    rng = random.Random(seed)
+    parts = []
+    words = 0
+    section = 0
+    while words < total_words:
+        section += 1
+        parts.append(f'<h2>Section {section}: {sentence(rng, 4)}</h2>')
+        for _ in range(3):
+            body = ' '.join(sentence(rng, rng.randint(12, 20)) for _ in range(3))
+            body = body.replace(' data ', ' <a href="https://example.com/data?x=1&amp;y=2">data</a> ', 1)
+            body = body.replace(' policy ', ' <strong>policy</strong> ', 1)
+            parts.append(f'<p>\n  {body}\n</p>')
+            words += len(body.split())
+        if section % 2:
+            parts.append(f'<h3>{sentence(rng, 3)}</h3>')
+            parts.append('<ul>\n' + '\n'.join(
+                f'  <li>{sentence(rng, 6)}' + (
+                    '<ol><li>' + sentence(rng, 4) + '</li><li>' + sentence(rng, 4) + '</li></ol>' if i == 1 else ''
+                ) + '</li>' for i in range(4)) + '\n</ul>')
+            words += 40
+        if section % 3 == 0:
+            parts.append(f'<figure><img src="https://cdn.example.com/{section}.jpg" alt="Photo {section}">'
+                         f'<figcaption>{sentence(rng, 6)}</figcaption></figure>')
+            parts.append(f'<blockquote><p>{sentence(rng, 15)}</p></blockquote>')
+            words += 21
+    return '\n'.join(parts)
+
+
+def legacy_convert(html_content: str) -> str:
+    """Pre-refactor WordPressAPIEnhanced._convert_to_gutenberg_blocks (per-tag sweeps)"""
+    blocks = []
+    content = html_content.strip()
+    for level, tag in enumerate(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'], 1):
+        for match in re.finditer(f'<{tag}[^>]*>(.*?)</{tag}>', content, re.DOTALL | re.IGNORECASE):
+            text = re.sub(r'<.*?>', '', match.group(1)).strip()
+            text = ' '.join(text.split())
+            if text:
+                if level == 1:
+                    blocks.append(f'<!-- wp:heading -->\n<h{level} class="wp-block-heading">{text}</h{level}>\n<!-- /wp:heading -->')
+                else:
+                    blocks.append(f'<!-- wp:heading {{"level":{level}}} -->\n<h{level} class="wp-block-heading">{text}</h{level}>\n<!-- /wp:heading -->')
+    for match in re.finditer(r'<p[^>]*>(.*?)</p>', content, re.DOTALL | re.IGNORECASE):
+        para_text = ' '.join(match.group(1).strip().split())
+        if para_text:
+            blocks.append(f'<!-- wp:paragraph -->\n<p>{para_text}</p>\n<!-- /wp:paragraph -->')
+    for match in re.finditer(r'<ul[^>]*>(.*?)</ul>', content, re.DOTALL | re.IGNORECASE):
+        items = re.findall(r'<li[^>]*>(.*?)</li>', match.group(1), re.DOTALL | re.IGNORECASE)
+        if items:
+            list_html = '\n'.join([f'<li>{" ".join(item.split())}</li>' for item in items])
+            blocks.append(f'<!-- wp:list -->\n<ul>{list_html}</ul>\n<!-- /wp:list -->')
+    for match in re.finditer(r'<ol[^>]*>(.*?)</ol>', content, re.DOTALL | re.IGNORECASE):
+        items = re.findall(r'<li[^>]*>(.*?)</li>', match.group(1), re.DOTALL | re.IGNORECASE)
+        if items:
+            list_html = '\n'.join([f'<li>{" ".join(item.split())}</li>' for item in items])
+            blocks.append(f'<!-- wp:list {{"ordered":true}} -->\n<ol>{list_html}</ol>\n<!-- /wp:list -->')
+    return '\n\n'.join(blocks)
+
+
+def block_sequence(blocks_html: str):
+    """Top-level block names (blocks are separated by blank lines)"""
+    return [re.match(r'<!-- wp:(\w+)', chunk).group(1) for chunk in blocks_html.split('\n\n') if chunk]
+
+
+def source_sequence(html: str):
+    """Expected top-level block order of the generated article"""
+    names = {'h2': 'heading', 'h3': 'heading', 'p': 'paragraph', 'ul': 'list', 'figure': 'image', 'blockquote': 'quote'}
+    return [names[tag] for tag in re.findall(r'^<(h2|h3|p|ul|figure|blockquote)\b', html, re.MULTILINE)]
+
+
+def bench(func, html: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--words', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    html = make_article(args.words)
+    print(f"Article: {len(re.sub(r'<[^>]+>', ' ', html).split())} words, {len(html):,} chars\n")
+
+    expected = source_sequence(html)
+    print(f"{'converter':<14} {'median ms':>10} {'best ms':>9} {'blocks':>7} {'order ok':>9}")
+    for name, func in (('legacy regex', legacy_convert), ('single-pass', convert_html_to_blocks)):
+        median, best = bench(func, html, args.repeat)
+        sequence = block_sequence(func(html))
+        # Legacy output has no quote/image blocks - compare the kinds it does emit
+        comparable = [b for b in expected if b in set(sequence)]
+        print(f"{name:<14} {median:>10.2f} {best:>9.2f} {len(sequence):>7} {str(sequence == comparable):>9}")
+
+    nested = convert_html_to_blocks(html)
+    print(f"\nNested lists kept inside their item: {'<li>' in nested and '<ol><li>' in nested}")
+
+
+if __name__ == '__main__':
+    main()
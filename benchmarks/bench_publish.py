@@ -0,0 +1,168 @@
+"""
+Benchmark: WordPress publish throughput against the local REST stand-in
+
+Creates a throwaway database with generated drafts (featured image, RSS
+category, keyword tags) and translations, starts benchmarks/wp_stub.py on a
+free port and drives:
+
+    WordPressAPI.publish_draft                          (single posts)
+    WordPressAPIEnhanced.publish_draft_with_translations (multilingual stories)
+
+Reports HTTP requests per post, p50/p95 publish latency and bytes uploaded,
+per route. The first post of each run hits a cold site (term creation, media
+uploads); later posts show the effect of caching, pooling and batching.
+
+Usage:
+    python benchmarks/bench_publish.py [--posts 20] [--stories 5] [--languages 4]
+                                       [--latency 0.05] [--error-rate 0] [--no-batch]
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from wp_stub import WPStubServer  # noqa: E402
+
+CATEGORIES = ['World', 'Business', 'Technology', 'Sports', 'Health', 'AI & Machine Learning']
+WORDS = ('election', 'market', 'energy', 'climate', 'startup', 'league', 'vaccine', 'budget', 'policy',
+         'satellite', 'banking', 'football', 'research', 'drought', 'chipmaker', 'inflation', 'harvest')
+LANGUAGES = ['es', 'fr', 'de', 'it', 'pt', 'hi', 'bn', 'ja']
+
+
+def make_body(rng: random.Random, paragraphs: int = 8) -> str:
+    parts = []
+    for i in range(paragraphs):
+        if i % 3 == 0:
+            parts.append(f"<h2>{' '.join(rng.choice(WORDS) for _ in range(4)).title()}</h2>")
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(60))
+        parts.append(f"<p>{sentence.capitalize()}.</p>")
+    return '\n'.join(parts)
+
+
+def build_database(db_path: str, site_url: str, posts: int, stories: int, languages: int, seed: int = 3):
+    """Minimal schema used by the publish path, filled with generated drafts"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('CREATE TABLE rss_feeds (id INTEGER PRIMARY KEY, workspace_id INTEGER, url TEXT, category TEXT)')
+    cursor.execute('CREATE TABLE news_queue (id INTEGER PRIMARY KEY, workspace_id INTEGER, headline TEXT, category TEXT)')
+    cursor.execute('''CREATE TABLE ai_drafts (id INTEGER PRIMARY KEY, workspace_id INTEGER, news_id INTEGER, title TEXT,
+                      body_draft TEXT, summary TEXT, image_url TEXT, source_url TEXT)''')
+    cursor.execute('''CREATE TABLE translations (id INTEGER PRIMARY KEY, draft_id INTEGER NOT NULL, language TEXT, title TEXT,
+                      body TEXT, approved BOOLEAN DEFAULT 0, translated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    cursor.execute('''CREATE TABLE wp_credentials (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, site_url TEXT,
+                      username TEXT, app_password TEXT, connected BOOLEAN DEFAULT 0)''')
+    cursor.execute("INSERT INTO wp_credentials (workspace_id, site_url, username, app_password) VALUES (1, ?, 'bench', 'pass')",
+                   (site_url,))
+
+    draft_ids = []
+    for i in range(posts + stories):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        cursor.execute('INSERT INTO news_queue (workspace_id, headline, category) VALUES (1, ?, ?)', (f'Story {i}', category))
+        news_id = cursor.lastrowid
+        # A few photos are shared between stories (wire photos), most are unique
+        image = f"{site_url}/images/photo-{i % max(1, (posts + stories) // 2)}.jpg"
+        cursor.execute('''INSERT INTO ai_drafts (workspace_id, news_id, title, body_draft, summary, image_url, source_url)
+                          VALUES (1, ?, ?, ?, ?, ?, ?)''',
+                       (news_id, f"{' '.join(rng.choice(WORDS) for _ in range(6)).title()} {i}",
+                        make_body(rng), ' '.join(rng.choice(WORDS) for _ in range(25)), image, f'https://news.example/{i}'))
+        draft_ids.append(cursor.lastrowid)
+
+    for draft_id in draft_ids[posts:]:
+        for lang in LANGUAGES[:languages]:
+            cursor.execute('INSERT INTO translations (draft_id, language, title, body) VALUES (?, ?, ?, ?)',
+                           (draft_id, lang, f'[{lang}] story {draft_id}', make_body(rng, 6)))
+    conn.commit()
+    conn.close()
+    return draft_ids[:posts], draft_ids[posts:]
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_phase(name: str, server: WPStubServer, func, items, posts_per_item):
+    server.state.reset_counters()
+    latencies = []
+    published = 0
+    for item in items:
+        start = time.perf_counter()
+        result = func(item)
+        latencies.append(time.perf_counter() - start)
+        published += posts_per_item(result)
+
+    stats = server.state.snapshot()
+    print(f"\n== {name} ==")
+    if not latencies:
+        print("  nothing to publish")
+        return
+    print(f"  calls: {len(items)}  posts created: {published}  errors injected: {stats['errors_injected']}")
+    print(f"  latency per call: p50 {statistics.median(latencies) * 1000:.0f} ms  "
+          f"p95 {percentile(latencies, 95) * 1000:.0f} ms  first {latencies[0] * 1000:.0f} ms")
+    site_requests = sum(count for route, count in stats['requests'].items() if '/wp-json' in route)
+    source_requests = stats['total_requests'] - site_requests
+    print(f"  REST requests: {site_requests} total, {site_requests / max(1, published):.2f} per post "
+          f"(+{source_requests} source image downloads)")
+    print(f"  bytes uploaded to site: {stats['bytes_in']:,} ({stats['bytes_in'] / max(1, published):,.0f} per post)")
+    for route, count in sorted(stats['requests'].items(), key=lambda item: -item[1]):
+        print(f"    {count:5d}  {route}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Publish throughput against a local WordPress stand-in')
+    parser.add_argument('--posts', type=int, default=20, help='Single posts (publish_draft)')
+    parser.add_argument('--stories', type=int, default=5, help='Multilingual stories (publish_draft_with_translations)')
+    parser.add_argument('--languages', type=int, default=4, help='Translations per story (max 8)')
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub latency per request, seconds')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--no-batch', action='store_true', help='Stub without the batch/v1 endpoint')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    original_cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='nexuzy-bench-publish-')
+    os.chdir(workdir)  # image store and config lookups stay inside the temp dir
+    db_path = os.path.join(workdir, 'bench.db')
+    try:
+        with WPStubServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          batch=not args.no_batch, seed=1) as server:
+            server.state.seed_terms('categories', ['Uncategorized', 'World', 'Business'])
+            server.state.seed_terms('tags', [f'existing-{i}' for i in range(150)])
+            posts, stories = build_database(db_path, server.url, args.posts, args.stories, min(args.languages, 8))
+
+            from core.wordpress_api import WordPressAPI
+            from core.wordpress_api_enhanced import WordPressAPIEnhanced
+
+            api = WordPressAPI(db_path)
+            enhanced = WordPressAPIEnhanced(db_path)
+
+            print(f"Stub: {server.url}  latency {args.latency * 1000:.0f} ms  "
+                  f"batch {'off' if args.no_batch else 'on'}  error rate {args.error_rate:.0%}")
+            run_phase('publish_draft', server, lambda d: api.publish_draft(d, 1), posts,
+                      lambda r: 1 if r else 0)
+            run_phase(f'publish_draft_with_translations ({min(args.languages, 8)} languages)', server,
+                      lambda d: enhanced.publish_draft_with_translations(d, 1, categories=['World'], tags=['bench']),
+                      stories, lambda r: r.get('total_posts_published', 0) if r else 0)
+    finally:
+        os.chdir(original_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Benchmark: per-entry summary text + image extraction, memoized parse vs legacy
+
+Parses a synthetic refresh (default 150 feeds x 20 entries, every image
+strategy of the fixture corpus) with feedparser once, then times the
+per-entry work fetch_news_from_feeds does after that: the summary text and
+RSSManager.extract_image_from_entry. The legacy path is a copy of the code
+before the shared parse (BeautifulSoup for the summary text, again for
+<img> tags in summary / content / content:encoded, and again for og:image).
+Stock-photo search is off, so no network is involved.
+
+Usage:
+    python benchmarks/bench_rss_images.py [--feeds 150] [--entries 20] [--repeat 5]
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import feedparser  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+from core import http_cache  # noqa: E402
+from core.rss_manager import RSSManager, parse_entry_html  # noqa: E402
+from fixtures import Corpus  # noqa: E402
+
+BASE_URL = 'http://127.0.0.1:8000'
+
+
+class LegacyRSSManager(RSSManager):
+    """RSSManager image extraction as it was before the shared entry parse"""
+
+    def _extract_all_images_from_html(self, html_content, base_url=""):
+        if not html_content:
+            return None
+        soup = BeautifulSoup(html_content, 'html.parser')
+        image_candidates = []
+        for img in soup.find_all('img'):
+            img_url = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
+            if img_url:
+                img_url = self._make_absolute_url(base_url, img_url)
+                if self._is_valid_image_url(img_url):
+                    image_candidates.append((img_url, self._get_image_quality_score(img_url)))
+        if not image_candidates:
+            return None
+        image_candidates.sort(key=lambda x: x[1], reverse=True)
+        return image_candidates[0][0]
+
+    def extract_image_from_entry(self, entry, headline="", category="", feed_url=""):
+        image_url = None
+        if hasattr(entry, 'media_content') and entry.media_content:
+            for media in entry.media_content:
+                if 'image' in media.get('medium', media.get('type', '')).lower():
+                    image_url = media.get('url')
+                    if image_url:
+                        image_url = self._make_absolute_url(feed_url, image_url)
+                        if self._is_valid_image_url(image_url):
+                            break
+        if not image_url and hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
+            if isinstance(entry.media_thumbnail, list) and len(entry.media_thumbnail) > 0:
+                image_url = entry.media_thumbnail[0].get('url')
+                if image_url:
+                    image_url = self._make_absolute_url(feed_url, image_url)
+        if not image_url and hasattr(entry, 'enclosures') and entry.enclosures:
+            for enclosure in entry.enclosures:
+                enc_url = enclosure.get('href', '')
+                if enc_url:
+                    enc_url = self._make_absolute_url(feed_url, enc_url)
+                    if 'image' in enclosure.get('type', '').lower() or self._is_valid_image_url(enc_url):
+                        image_url = enc_url
+                        break
+        if not image_url:
+            summary = entry.get('summary', entry.get('description', ''))
+            if summary:
+                image_url = self._extract_all_images_from_html(summary, feed_url)
+        if not image_url and hasattr(entry, 'content') and entry.content:
+            for content in entry.content:
+                image_url = self._extract_all_images_from_html(content.get('value', ''), feed_url)
+                if image_url:
+                    break
+        if not image_url and hasattr(entry, 'content_encoded'):
+            image_url = self._extract_all_images_from_html(entry.content_encoded, feed_url)
+        if not image_url and hasattr(entry, 'image'):
+            if isinstance(entry.image, dict):
+                image_url = entry.image.get('href', entry.image.get('url', ''))
+            elif isinstance(entry.image, str):
+                image_url = entry.image
+            if image_url:
+                image_url = self._make_absolute_url(feed_url, image_url)
+        if not image_url:
+            summary = entry.get('summary', entry.get('description', ''))
+            if summary:
+                soup = BeautifulSoup(summary, 'html.parser')
+                og_image = soup.find('meta', property='og:image')
+                if og_image and og_image.get('content'):
+                    image_url = self._make_absolute_url(feed_url, og_image.get('content'))
+                if not image_url:
+                    twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
+                    if twitter_image and twitter_image.get('content'):
+                        image_url = self._make_absolute_url(feed_url, twitter_image.get('content'))
+        if not image_url and hasattr(entry, 'links'):
+            for link in entry.links:
+                if link.get('rel') == 'image' or 'image' in link.get('type', '').lower():
+                    link_url = link.get('href')
+                    if link_url:
+                        link_url = self._make_absolute_url(feed_url, link_url)
+                        if self._is_valid_image_url(link_url):
+                            image_url = link_url
+                            break
+        if image_url and not self._is_valid_image_url(image_url):
+            image_url = None
+        return image_url
+
+
+def legacy_entry(manager, entry, feed_url):
+    summary = entry.get('summary', entry.get('description', ''))
+    if summary:
+        summary = BeautifulSoup(summary, 'html.parser').get_text(separator=' ', strip=True)[:800]
+    return summary, manager.extract_image_from_entry(entry, entry.get('title', ''), '', feed_url)
+
+
+def memoized_entry(manager, entry, feed_url):
+    summary = entry.get('summary', entry.get('description', ''))
+    if summary:
+        summary = parse_entry_html(summary).text[:800]
+    return summary, manager.extract_image_from_entry(entry, entry.get('title', ''), '', feed_url)
+
+
+def run(func, manager, feeds, repeat: int) -> float:
+    """Median microseconds per entry (parse memo cleared before every pass)"""
+    entries = sum(len(entries) for _, entries in feeds)
+    timings = []
+    for _ in range(repeat):
+        parse_entry_html.cache_clear()
+        start = time.perf_counter()
+        for feed_url, feed_entries in feeds:
+            for entry in feed_entries:
+                func(manager, entry, feed_url)
+        timings.append((time.perf_counter() - start) / entries)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--feeds', type=int, default=150)
+    parser.add_argument('--entries', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    http_cache.set_cache(None)  # managers are only used offline here
+
+    corpus = Corpus(feeds=args.feeds, entries_per_feed=args.entries)
+    feeds = []
+    for feed in range(args.feeds):
+        feed_url = f"{BASE_URL}/feeds/{feed}.xml"
+        feeds.append((feed_url, feedparser.parse(corpus.feed_xml(feed, BASE_URL)).entries[:args.entries]))
+    total = sum(len(entries) for _, entries in feeds)
+    print(f"Refresh: {args.feeds} feeds x {args.entries} entries = {total} entries\n")
+
+    legacy, current = LegacyRSSManager(':memory:'), RSSManager(':memory:')
+    for manager in (legacy, current):
+        manager.enable_web_search = False
+
+    print(f"{'path':<12} {'us/entry':>9} {'refresh s':>10}")
+    results = {}
+    for name, func, manager in (('legacy', legacy_entry, legacy), ('memoized', memoized_entry, current)):
+        per_entry = run(func, manager, feeds, args.repeat)
+        results[name] = per_entry
+        print(f"{name:<12} {per_entry:>9.1f} {per_entry * total / 1e6:>10.3f}")
+    print(f"\nSpeed-up: {results['legacy'] / results['memoized']:.1f}x")
+
+    parse_entry_html.cache_clear()
+    same = sum(1 for feed_url, entries in feeds for entry in entries
+               if legacy_entry(legacy, entry, feed_url) == memoized_entry(current, entry, feed_url))
+    print(f"Entries with identical summary text and image: {same}/{total}")
+
+
+if __name__ == '__main__':
+    main()
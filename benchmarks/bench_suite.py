@@ -0,0 +1,444 @@
+"""
+Benchmark suite: the desk's hot paths on synthetic data, offline
+
+Serves a generated RSS/Atom corpus and article pages from a local HTTP
+server (benchmarks/fixtures.py), publishes to the WordPress stand-in
+(benchmarks/wp_stub.py) and replaces the LLM, flan-t5, LanguageTool, NLLB and
+MiniLM with deterministic fakes (benchmarks/fake_models.py). Measures:
+
+    fetch      RSSManager.fetch_news_from_feeds       per entry stored
+    group      NewsMatchEngine.group_similar_headlines per headline
+    scrape     ContentScraper.scrape_articles (batch) per article
+    draft      DraftGenerator generation + clean-up chain (fake LLM) per draft
+    translate  Translator.translate_text              per article body
+    publish    WordPressAPI.publish_draft             per post
+    gutenberg  core.gutenberg.convert_html_to_blocks  per 3,000-word article
+
+Each run is appended to a JSON Lines history file together with the commit,
+so a change can be compared with earlier commits on the same machine:
+
+    python benchmarks/bench_suite.py                    # run everything, save
+    python benchmarks/bench_suite.py --only fetch,scrape --repeat 5
+    python benchmarks/bench_suite.py --compare          # vs latest other commit
+    python benchmarks/bench_suite.py --compare --fail-on-regression 0.15
+
+With fake models the numbers are the cost of the code around the models;
+--model-delay adds a per-token sleep to approximate real inference.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fake_models  # noqa: E402
+from fixtures import Corpus, FixtureServer  # noqa: E402
+
+DEFAULT_HISTORY = BENCH_DIR / 'results' / 'history.jsonl'
+BENCHMARKS = ('fetch', 'group', 'scrape', 'draft', 'translate', 'publish', 'gutenberg')
+
+
+class SuiteContext:
+    """Servers, fakes and scratch databases shared by the benchmarks"""
+
+    def __init__(self, args: argparse.Namespace, workdir: str, fixtures: FixtureServer, wp_stub):
+        self.args = args
+        self.workdir = workdir
+        self.fixtures = fixtures
+        self.wp_stub = wp_stub
+        self.fakes: Dict = {}
+        self._fetched_db: Optional[str] = None
+        self._counter = 0
+
+    def new_db_path(self, name: str) -> str:
+        self._counter += 1
+        return os.path.join(self.workdir, f"{name}-{self._counter}.db")
+
+    def empty_db(self, name: str) -> str:
+        """Desk schema, default workspace and the fixture feeds"""
+        from core.database import DatabaseSetup
+
+        db_path = self.new_db_path(name)
+        DatabaseSetup(db_path).ensure_default_workspace()
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            'INSERT INTO rss_feeds (workspace_id, feed_name, url, category) VALUES (1, ?, ?, ?)',
+            [(f'Feed {i}', url, ['World', 'Business', 'Technology'][i % 3])
+             for i, url in enumerate(self.fixtures.feed_urls())])
+        conn.commit()
+        conn.close()
+        return db_path
+
+    def fetched_db(self, name: str) -> str:
+        """Copy of a database after one fetch (built on first use)"""
+        if self._fetched_db is None:
+            from core.rss_manager import RSSManager
+
+            self._fetched_db = self.empty_db('fetched-template')
+            manager = RSSManager(self._fetched_db)
+            manager.enable_web_search = False
+            manager.fetch_news_from_feeds(1)
+        copy = self.new_db_path(name)
+        shutil.copyfile(self._fetched_db, copy)
+        return copy
+
+
+# ----------------------------------------------------------------------
+# Benchmarks - each returns (setup per repeat, timed body returning items)
+# ----------------------------------------------------------------------
+
+def bench_fetch(ctx: SuiteContext):
+    from core.rss_manager import RSSManager
+
+    def setup():
+        db_path = ctx.empty_db('fetch')
+        manager = RSSManager(db_path)
+        manager.enable_web_search = False  # no external stock-photo lookups
+        return manager
+
+    def body(manager):
+        count, _ = manager.fetch_news_from_feeds(1)
+        return count
+
+    return setup, body
+
+
+def bench_group(ctx: SuiteContext):
+    from core.news_matcher import NewsMatchEngine
+
+    def setup():
+        return NewsMatchEngine(ctx.fetched_db('group'))
+
+    def body(matcher):
+        conn = sqlite3.connect(matcher.db_path)
+        headlines = min(100, conn.execute("SELECT COUNT(*) FROM news_queue WHERE status = 'new'").fetchone()[0])
+        conn.close()
+        matcher.group_similar_headlines(1, threshold=0.7)
+        return headlines
+
+    return setup, body
+
+
+def bench_scrape(ctx: SuiteContext):
+    from core.content_scraper import ContentScraper
+    from core.scrape_engine import configure_engine
+
+    urls = ctx.fixtures.article_urls(ctx.args.articles)
+
+    def setup():
+        # Every fixture page is on one host: no politeness delay, 4 connections
+        configure_engine(per_domain=4, domain_delay=0)
+        return ContentScraper(ctx.fetched_db('scrape'))
+
+    def body(scraper):
+        scraper.scrape_articles(list(enumerate(urls, 1)))
+        return len(urls)
+
+    return setup, body
+
+
+def bench_draft(ctx: SuiteContext):
+    from core.ai_draft_generator import DraftGenerator
+
+    def setup():
+        db_path = ctx.fetched_db('draft')
+        conn = sqlite3.connect(db_path)
+        stories = conn.execute('SELECT headline, summary, category, source_domain FROM news_queue ORDER BY id LIMIT ?',
+                               (ctx.args.drafts,)).fetchall()
+        conn.close()
+        # Post-processing draws from `random`; a fixed seed keeps runs comparable
+        random.seed(ctx.args.seed)
+        return DraftGenerator(db_path), stories
+
+    def body(state):
+        generator, stories = state
+        for headline, summary, category, source in stories:
+            angle = generator._select_article_angle(headline, summary or '', category)
+            nouns = generator._extract_topic_nouns(headline, summary or '')
+            topic_info = generator._extract_topic_info(headline, summary or '', category)
+            draft = generator._generate_with_model(headline, summary, category, source, topic_info, angle, nouns)
+            if draft.get('error'):
+                raise RuntimeError(draft['error'])
+        return len(stories)
+
+    return setup, body
+
+
+def bench_translate(ctx: SuiteContext):
+    from core.translator import Translator
+
+    texts = [ctx.fakes['llm'](f"Topic: translation sample {i}\n") for i in range(ctx.args.translations)]
+    languages = ['Spanish', 'French', 'German', 'Hindi']
+
+    def setup():
+        return Translator(ctx.new_db_path('translate'))
+
+    def body(translator):
+        for index, text in enumerate(texts):
+            translator.translate_text(text, languages[index % len(languages)], force_refresh=True)
+        return len(texts)
+
+    return setup, body
+
+
+def bench_publish(ctx: SuiteContext):
+    from bench_publish import build_database
+    from core.wordpress_api import WordPressAPI
+
+    def setup():
+        db_path = ctx.new_db_path('publish')
+        posts, _ = build_database(db_path, ctx.wp_stub.url, ctx.args.posts, 0, 0, seed=ctx.args.seed)
+        return WordPressAPI(db_path), posts
+
+    def body(state):
+        api, posts = state
+        published = sum(1 for draft_id in posts if api.publish_draft(draft_id, 1))
+        if published < len(posts):
+            logging.getLogger('bench').warning(f"publish: {len(posts) - published} posts failed")
+        return len(posts)
+
+    return setup, body
+
+
+def bench_gutenberg(ctx: SuiteContext):
+    from bench_gutenberg import make_article
+    from core.gutenberg import convert_html_to_blocks
+
+    html = make_article(3000, seed=ctx.args.seed)
+    count = 20
+
+    def setup():
+        return None
+
+    def body(_):
+        for _ in range(count):
+            convert_html_to_blocks(html)
+        return count
+
+    return setup, body
+
+
+BENCHMARK_FUNCTIONS: Dict[str, Callable] = {
+    'fetch': bench_fetch,
+    'group': bench_group,
+    'scrape': bench_scrape,
+    'draft': bench_draft,
+    'translate': bench_translate,
+    'publish': bench_publish,
+    'gutenberg': bench_gutenberg,
+}
+
+
+def _http_requests(ctx: SuiteContext) -> int:
+    """Requests served so far by the fixture server and the WordPress stand-in"""
+    with ctx.fixtures.lock:
+        served = sum(ctx.fixtures.requests.values())
+    return served + ctx.wp_stub.state.snapshot()['total_requests']
+
+
+def run_benchmark(name: str, ctx: SuiteContext, repeat: int) -> Dict:
+    """Time the body `repeat` times (setup excluded); median per item is the headline number"""
+    setup, body = BENCHMARK_FUNCTIONS[name](ctx)
+    timings, items, requests = [], 0, 0
+    for _ in range(repeat):
+        state = setup()
+        requests_before = _http_requests(ctx)
+        start = time.perf_counter()
+        items = body(state)
+        timings.append(time.perf_counter() - start)
+        requests += _http_requests(ctx) - requests_before
+
+    median = statistics.median(timings)
+    return {
+        'items': items,
+        'repeat': repeat,
+        'median_s': round(median, 6),
+        'best_s': round(min(timings), 6),
+        'per_item_ms': round(median / max(1, items) * 1000, 4),
+        'items_per_s': round(items / median, 2) if median > 0 else None,
+        'http_requests': requests // max(1, repeat),
+    }
+
+
+# ----------------------------------------------------------------------
+# History
+# ----------------------------------------------------------------------
+
+def git_revision() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True, timeout=30).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                                    capture_output=True, text=True, timeout=60).stdout.strip())
+        return {'commit': commit or None, 'dirty': dirty}
+    except Exception:
+        return {'commit': None, 'dirty': None}
+
+
+def load_history(path: Path) -> List[Dict]:
+    if not path.exists():
+        return []
+    records = []
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def append_history(path: Path, record: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as handle:
+        handle.write(json.dumps(record) + '\n')
+
+
+def find_baseline(history: List[Dict], record: Dict, commit: Optional[str]) -> Optional[Dict]:
+    """
+    Run to compare with, among runs with the same parameters: the latest run
+    of `commit`, else the latest run of another commit, else the latest run
+    """
+    candidates = [previous for previous in history if previous.get('params') == record['params']]
+    if commit:
+        matches = [previous for previous in candidates if (previous.get('commit') or '').startswith(commit)]
+        return matches[-1] if matches else None
+    others = [previous for previous in candidates
+              if (previous.get('commit'), previous.get('dirty')) != (record.get('commit'), record.get('dirty'))]
+    if others:
+        return others[-1]
+    return candidates[-1] if candidates else None
+
+
+def compare(record: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print per-item deltas; returns the benchmarks slower than threshold"""
+    print(f"\nCompared with {baseline.get('commit')}{' (dirty)' if baseline.get('dirty') else ''} "
+          f"from {baseline.get('timestamp')}:")
+    regressions = []
+    for name, result in record['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before or not before.get('per_item_ms'):
+            print(f"  {name:<10} no baseline")
+            continue
+        change = result['per_item_ms'] / before['per_item_ms'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"  {name:<10} {before['per_item_ms']:>10.3f} → {result['per_item_ms']:>10.3f} ms/item "
+              f"({change:+.1%}){flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Offline benchmark suite for the desk\'s hot paths')
+    parser.add_argument('--only', help=f"Comma-separated subset of {','.join(BENCHMARKS)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--feeds', type=int, default=30)
+    parser.add_argument('--entries', type=int, default=20, help='Entries per feed')
+    parser.add_argument('--articles', type=int, default=40, help='Pages to scrape')
+    parser.add_argument('--drafts', type=int, default=5)
+    parser.add_argument('--translations', type=int, default=8)
+    parser.add_argument('--posts', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help='Fixture/WordPress server latency, seconds')
+    parser.add_argument('--model-delay', type=float, default=0.0, help='Fake model sleep per token, seconds')
+    parser.add_argument('--seed', type=int, default=11)
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument('--label', help='Free-text note stored with the run')
+    parser.add_argument('--no-save', action='store_true', help='Do not append this run to the history')
+    parser.add_argument('--compare', nargs='?', const='', metavar='COMMIT',
+                        help='Compare with COMMIT (default: latest run of another commit)')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Relative change reported as a regression')
+    parser.add_argument('--fail-on-regression', type=float, metavar='FRACTION',
+                        help='Exit 1 if any benchmark is slower than FRACTION (implies --compare)')
+    parser.add_argument('--json', action='store_true', help='Print the run record as JSON')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    selected = [name.strip() for name in (args.only or ','.join(BENCHMARKS)).split(',') if name.strip()]
+    unknown = [name for name in selected if name not in BENCHMARK_FUNCTIONS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    history_path = args.history.resolve()
+    workdir = tempfile.mkdtemp(prefix='nexuzy-bench-suite-')
+    os.chdir(workdir)  # image store, config lookups and caches stay inside the temp dir
+
+    from wp_stub import WPStubServer
+
+    params = {name: getattr(args, name) for name in
+              ('repeat', 'feeds', 'entries', 'articles', 'drafts', 'translations', 'posts', 'latency',
+               'model_delay', 'seed')}
+    record = {'timestamp': datetime.now().isoformat(timespec='seconds'), **git_revision(), 'label': args.label,
+              'python': platform.python_version(), 'platform': platform.platform(terse=True),
+              'params': params, 'results': {}}
+
+    corpus = Corpus(feeds=args.feeds, entries_per_feed=args.entries, seed=args.seed)
+    try:
+        with FixtureServer(corpus, latency=args.latency) as fixtures, \
+                WPStubServer(latency=args.latency, seed=args.seed) as wp_stub:
+            ctx = SuiteContext(args, workdir, fixtures, wp_stub)
+            ctx.fakes = fake_models.install(seconds_per_token=args.model_delay)
+
+            print(f"{'benchmark':<10} {'items':>6} {'median s':>10} {'ms/item':>10} {'items/s':>10} {'http':>6}")
+            for name in selected:
+                try:
+                    result = run_benchmark(name, ctx, args.repeat)
+                except Exception as e:
+                    print(f"{name:<10} FAILED: {e}")
+                    record['results'][name] = {'error': str(e)}
+                    continue
+                record['results'][name] = result
+                print(f"{name:<10} {result['items']:>6} {result['median_s']:>10.3f} {result['per_item_ms']:>10.3f} "
+                      f"{result['items_per_s'] or 0:>10.1f} {result['http_requests']:>6}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(record, indent=2))
+
+    history = load_history(history_path)
+    regressions = []
+    if args.compare is not None or args.fail_on_regression is not None:
+        baseline = find_baseline(history, record, args.compare or None)
+        threshold = args.fail_on_regression if args.fail_on_regression is not None else args.threshold
+        if baseline:
+            measured = {k: v for k, v in record['results'].items() if 'error' not in v}
+            regressions = compare({**record, 'results': measured}, baseline, threshold)
+        else:
+            print("\nNo earlier run with the same parameters to compare with")
+
+    if not args.no_save:
+        append_history(history_path, record)
+        print(f"\nSaved to {history_path}")
+
+    failed = [name for name, result in record['results'].items() if 'error' in result]
+    if failed or (args.fail_on_regression is not None and regressions):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark: VisionAI.detect_watermark working-size pipeline vs full resolution
+
+Generates synthetic press-photo sized JPEGs (gradients, noise, shapes, a
+text-like overlay and a corner logo), then runs detect_watermark with the
+default bounded working size and with max_analysis_size=None (full
+resolution). Reports wall time, peak traced memory and the metric drift of
+each detector.
+
+Usage:
+    python benchmarks/bench_vision.py [--size 4000x3000] [--images 3] [--repeat 2]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.vision_ai import VisionAI  # noqa: E402
+
+
+def make_photo(path: str, width: int, height: int, seed: int, watermark: bool):
+    """Write a synthetic photo-like JPEG"""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([
+        120 + 80 * np.sin(x / width * 3 + seed),
+        110 + 70 * np.cos(y / height * 2 + seed),
+        100 + 60 * np.sin((x + y) / (width + height) * 4),
+    ], axis=2)
+    del x, y
+    base += rng.normal(0, 12, base.shape).astype(np.float32)
+    image = Image.fromarray(np.clip(base, 0, 255).astype(np.uint8))
+    del base
+
+    draw = ImageDraw.Draw(image)
+    for _ in range(25):
+        x0, y0 = int(rng.integers(0, width)), int(rng.integers(0, height))
+        r = int(rng.integers(width // 40, width // 8))
+        colour = tuple(int(c) for c in rng.integers(0, 255, 3))
+        draw.ellipse((x0 - r, y0 - r, x0 + r, y0 + r), fill=colour)
+    image = image.filter(ImageFilter.GaussianBlur(3))
+
+    if watermark:
+        overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
+        odraw = ImageDraw.Draw(overlay)
+        step = max(width // 12, 40)
+        for ty in range(0, height, step):
+            for tx in range(0, width, step * 3):
+                odraw.text((tx, ty), "SAMPLE WATERMARK", fill=(255, 255, 255, 90))
+        logo = width // 10
+        odraw.rectangle((width - logo - 20, height - logo - 20, width - 20, height - 20),
+                        fill=(255, 255, 255, 200), outline=(0, 0, 0, 255), width=8)
+        image = Image.alpha_composite(image.convert('RGBA'), overlay).convert('RGB')
+
+    image.save(path, 'JPEG', quality=88)
+
+
+def run(vision: VisionAI, path: str, repeat: int):
+    times = []
+    peak = 0
+    result = None
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = vision.detect_watermark(path)
+        times.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(times), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='4000x3000')
+    parser.add_argument('--images', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=2)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.lower().split('x'))
+
+    fast = VisionAI()
+    full = VisionAI(max_analysis_size=None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.images):
+            path = os.path.join(tmp, f'photo_{i}.jpg')
+            make_photo(path, width, height, seed=i, watermark=bool(i % 2 == 0))
+
+            full_time, full_peak, full_result = run(full, path, args.repeat)
+            fast_time, fast_peak, fast_result = run(fast, path, args.repeat)
+
+            print(f"\n=== {os.path.basename(path)} ({width}x{height}, "
+                  f"{os.path.getsize(path) / 1024:.0f} KB) ===")
+            print(f"full resolution : {full_time * 1000:8.1f} ms  peak {full_peak / 2**20:7.1f} MB  "
+                  f"detected={full_result['watermark_detected']} conf={full_result['confidence']}")
+            print(f"working size    : {fast_time * 1000:8.1f} ms  peak {fast_peak / 2**20:7.1f} MB  "
+                  f"detected={fast_result['watermark_detected']} conf={fast_result['confidence']}")
+            print(f"speedup         : {full_time / fast_time:8.1f}x   memory {full_peak / max(fast_peak, 1):.1f}x less")
+
+            for name, detail in full_result['details'].items():
+                other = fast_result['details'][name]
+                for metric, value in detail.get('metrics', {}).items():
+                    new_value = other.get('metrics', {}).get(metric, float('nan'))
+                    rel = abs(new_value - value) / abs(value) if value else 0.0
+                    print(f"  {name:18s} {metric:22s} full={value:10.4f} work={new_value:10.4f} "
+                          f"drift={rel:6.1%}  detected {detail['detected']}/{other['detected']}")
+
+
+if __name__ == '__main__':
+    main()
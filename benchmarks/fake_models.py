@@ -0,0 +1,207 @@
+"""
+Deterministic stand-ins for the desk's models, for offline benchmarks
+
+    FakeLLM                  GGUF model (ctransformers call signature)
+    FakeText2Text            flan-t5 text2text-generation pipeline
+    FakeGrammarChecker       LanguageTool (reports no matches)
+    FakeNLLBTokenizer/Model  NLLB-200 tokenizer + generate/batch_decode
+    FakeSentenceTransformer  MiniLM encode() + util.pytorch_cos_sim
+
+Outputs depend only on the input text, so two runs do the same work. An
+optional per-token delay approximates model cost; by default it is zero and
+the benchmarks measure the code around the models.
+
+install() registers the fakes in the model registry (llm, translator, ...)
+and a stub `sentence_transformers` module, so the core classes never load
+real weights.
+"""
+
+import hashlib
+import math
+import random
+import re
+import sys
+import time
+import types
+from typing import Dict, List
+
+_WORD = re.compile(r"[A-Za-z0-9']+")
+
+LLM_VOCABULARY = ('officials', 'residents', 'the council', 'budget', 'analysts', 'the plan', 'investors',
+                  'growth', 'the region', 'local firms', 'critics', 'supporters', 'the agency', 'schools',
+                  'transport', 'energy', 'prices', 'workers', 'the report', 'the vote')
+
+
+def _rng_for(text: str) -> random.Random:
+    return random.Random(int(hashlib.md5(text.encode('utf-8')).hexdigest()[:12], 16))
+
+
+def _delay(tokens: int, seconds_per_token: float):
+    if seconds_per_token:
+        time.sleep(tokens * seconds_per_token)
+
+
+class FakeLLM:
+    """Returns a ~650-word article with the artefacts the clean-up chain removes"""
+
+    def __init__(self, words: int = 650, seconds_per_token: float = 0.0):
+        self.words = words
+        self.seconds_per_token = seconds_per_token
+        self.calls = 0
+
+    def __call__(self, prompt: str, max_new_tokens: int = 2500, **kwargs) -> str:
+        self.calls += 1
+        rng = _rng_for(prompt)
+        topic = re.search(r'Topic: (.+)', prompt)
+        topic = topic.group(1).strip() if topic else 'the story'
+        paragraphs, words = [], 0
+        while words < min(self.words, max_new_tokens):
+            sentences = []
+            for index in range(rng.randint(3, 5)):
+                body = ' '.join(rng.choice(LLM_VOCABULARY) for _ in range(rng.randint(4, 22)))
+                sentence = f"{body.capitalize()} {rng.choice(['is', 'was', 'will be'])} affected by {topic.lower()}."
+                if index == 0 and rng.random() < 0.3:
+                    sentence = f"Furthermore, it is important to note that {sentence[0].lower()}{sentence[1:]}"
+                if rng.random() < 0.15:
+                    sentence = sentence[:-1] + f" ({rng.choice(['Reuters', 'City Report', 'Survey'])}, 2024)."
+                if rng.random() < 0.1:
+                    sentence = f'"We do not think the {rng.choice(LLM_VOCABULARY)} will change soon," a spokesperson said.'
+                sentences.append(sentence)
+            paragraph = ' '.join(sentences)
+            if rng.random() < 0.1:
+                paragraph = 'Background: ' + paragraph
+            paragraphs.append(paragraph)
+            words += len(paragraph.split())
+        _delay(words, self.seconds_per_token)
+        return '\n\n'.join(paragraphs)
+
+
+class FakeText2Text:
+    """flan-t5 pipeline: returns the sentence it was asked to rephrase, lightly reworded"""
+
+    def __init__(self, seconds_per_token: float = 0.0):
+        self.seconds_per_token = seconds_per_token
+
+    def __call__(self, prompt: str, **kwargs) -> List[Dict]:
+        sentence = prompt.split(': ', 1)[-1]
+        _delay(len(sentence.split()), self.seconds_per_token)
+        return [{'generated_text': sentence.replace(' is ', " is really ", 1)}]
+
+
+class FakeGrammarChecker:
+    """LanguageTool stand-in: no JVM, no matches"""
+
+    def check(self, text: str) -> List:
+        return []
+
+
+class FakeNLLBTokenizer:
+    """Word-level tokenizer with the NLLB call signatures used by Translator"""
+
+    def __init__(self):
+        self.src_lang = 'eng_Latn'
+        self.vocabulary: Dict[str, int] = {}
+        self.words: List[str] = []
+
+    def _id(self, token: str) -> int:
+        if token not in self.vocabulary:
+            self.vocabulary[token] = len(self.words)
+            self.words.append(token)
+        return self.vocabulary[token]
+
+    def __call__(self, text: str, return_tensors=None, max_length: int = 256, truncation: bool = True, **kwargs):
+        ids = [self._id(token) for token in text.split()]
+        if truncation:
+            ids = ids[:max_length]
+        return {'input_ids': [ids], 'attention_mask': [[1] * len(ids)]}
+
+    def convert_tokens_to_ids(self, token: str) -> int:
+        return self._id(token)
+
+    def batch_decode(self, sequences, skip_special_tokens: bool = True) -> List[str]:
+        decoded = []
+        for sequence in sequences:
+            target, ids = sequence[0], sequence[1:]
+            suffix = self.words[target].split('_')[0]
+            decoded.append(' '.join(f"{self.words[i]}~{suffix}" for i in ids))
+        return decoded
+
+
+class FakeNLLBModel:
+    """generate(): echoes the input ids behind the forced target-language token"""
+
+    def __init__(self, seconds_per_token: float = 0.0):
+        self.seconds_per_token = seconds_per_token
+
+    def generate(self, input_ids=None, forced_bos_token_id: int = 0, max_length: int = 256, **kwargs):
+        output = []
+        for ids in input_ids:
+            ids = list(ids)[:max_length - 1]
+            _delay(len(ids), self.seconds_per_token)
+            output.append([forced_bos_token_id] + ids)
+        return output
+
+
+class _Scalar(float):
+    def item(self) -> float:
+        return float(self)
+
+
+class FakeSentenceTransformer:
+    """Hashed bag-of-words embeddings: headlines sharing most words score high"""
+
+    DIMENSIONS = 128
+
+    def __init__(self, model_name: str = 'fake-minilm', seconds_per_token: float = 0.0, **kwargs):
+        self.model_name = model_name
+        self.seconds_per_token = seconds_per_token
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.DIMENSIONS
+        for word in _WORD.findall(text.lower()):
+            digest = hashlib.md5(word.encode('utf-8')).digest()
+            vector[digest[0] % self.DIMENSIONS] += 1.0 if digest[1] % 2 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def encode(self, sentences, convert_to_tensor: bool = False, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        _delay(sum(len(t.split()) for t in texts), self.seconds_per_token)
+        vectors = [self._embed(text) for text in texts]
+        return vectors[0] if single else vectors
+
+
+def pytorch_cos_sim(a, b):
+    """[[similarity]] like sentence_transformers.util for two 1-D vectors"""
+    return [[_Scalar(sum(x * y for x, y in zip(a, b)))]]
+
+
+def install(seconds_per_token: float = 0.0) -> Dict[str, object]:
+    """Replace every model the core modules would load with a fake"""
+    fakes = {
+        'llm': FakeLLM(seconds_per_token=seconds_per_token),
+        'sentence_model': FakeText2Text(seconds_per_token=seconds_per_token),
+        'grammar_checker': FakeGrammarChecker(),
+        'nllb_tokenizer': FakeNLLBTokenizer(),
+        'nllb_model': FakeNLLBModel(seconds_per_token=seconds_per_token),
+    }
+
+    module = types.ModuleType('sentence_transformers')
+    util = types.ModuleType('sentence_transformers.util')
+    util.pytorch_cos_sim = pytorch_cos_sim
+    util.cos_sim = pytorch_cos_sim
+    module.util = util
+    module.SentenceTransformer = lambda name='fake-minilm', **kwargs: FakeSentenceTransformer(
+        name, seconds_per_token=seconds_per_token)
+    sys.modules['sentence_transformers'] = module
+    sys.modules['sentence_transformers.util'] = util
+
+    from core.model_registry import models
+
+    for name, model in (('llm', fakes['llm']),
+                        ('sentence_model', fakes['sentence_model']),
+                        ('grammar_checker', fakes['grammar_checker']),
+                        ('translator', (fakes['nllb_tokenizer'], fakes['nllb_model']))):
+        models.register(name, lambda model=model: model, display_name=f"fake {name}", replace=True)
+    return fakes
@@ -0,0 +1,318 @@
+"""
+Synthetic news corpus and local HTTP fixture server for offline benchmarks
+
+Generates RSS 2.0 and Atom feeds whose entries cover the image strategies of
+RSSManager.extract_image_from_entry (media:content, media:thumbnail,
+enclosures, <img> in summary and content:encoded, none), with the same
+events reported by several feeds so headline grouping has work to do. Each
+entry links to a generated article page (navigation, sidebar, scripts, and a
+body with dates, names, quotes and figures for ContentScraper).
+
+    GET /feeds/<n>.xml      feed n (even n: RSS 2.0, odd n: Atom)
+    GET /articles/<n>.html  article page n
+    GET /images/<name>.jpg  small JPEG-like payload
+
+Everything is generated from a seed: runs differ only in the timestamps
+(entries are dated relative to "now" so today-only filters keep them).
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+PLACES = ['Lisbon', 'Nairobi', 'Osaka', 'Denver', 'Kolkata', 'Glasgow', 'Quito', 'Perth', 'Tallinn', 'Accra']
+SUBJECTS = ['city council', 'central bank', 'port authority', 'health ministry', 'football club', 'energy regulator',
+            'university', 'chipmaker', 'rail operator', 'climate panel']
+ACTIONS = ['approves', 'delays', 'unveils', 'rejects', 'expands', 'cuts', 'reviews', 'launches']
+OBJECTS = ['budget plan', 'flood defences', 'vaccine rollout', 'stadium deal', 'tariff changes', 'research centre',
+           'night trains', 'water reforms', 'tax relief', 'housing scheme']
+NAMES = ['Maria Okafor', 'James Whitfield', 'Aiko Tanaka', 'Rahul Mehta', 'Sofia Lindqvist', 'Daniel Mensah',
+         'Lucia Romero', 'Tom Gallagher']
+FILLER = ('officials', 'residents', 'analysts', 'the plan', 'the proposal', 'investors', 'the region', 'local firms',
+          'next year', 'the committee', 'critics', 'supporters', 'the agency', 'the project')
+# Article dates rotate through the formats ContentScraper recognises, plus one it does not
+DATE_FORMATS = ('%d %B %Y', '%Y-%m-%d', '%d/%m/%Y', '%B %d, %Y')
+
+_JPEG = bytes([0xFF, 0xD8, 0xFF, 0xE0]) + bytes(20_000 - 6) + bytes([0xFF, 0xD9])
+
+
+class Corpus:
+    """Deterministic set of events, feeds and article pages"""
+
+    def __init__(self, feeds: int = 30, entries_per_feed: int = 20, events: Optional[int] = None, seed: int = 11):
+        self.feeds = feeds
+        self.entries_per_feed = entries_per_feed
+        self.seed = seed
+        # Fewer events than entries, so most events are reported by several feeds
+        count = events or max(10, feeds * entries_per_feed // 4)
+        rng = random.Random(seed)
+        self.events = [
+            (rng.choice(PLACES), rng.choice(SUBJECTS), rng.choice(ACTIONS), rng.choice(OBJECTS), index)
+            for index in range(count)
+        ]
+        self.published = datetime.now(timezone.utc).replace(microsecond=0)
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def headline(self, event, variant: int) -> str:
+        place, subject, action, obj, index = event
+        templates = [
+            f"{place} {subject} {action} {obj} ({index})",
+            f"{place}: {subject} {action} {obj} after long debate ({index})",
+            f"{subject.capitalize()} in {place} {action} {obj} ({index})",
+        ]
+        return templates[variant % len(templates)]
+
+    def article_id(self, feed: int, entry: int) -> int:
+        return feed * self.entries_per_feed + entry
+
+    def entries(self, feed: int, base_url: str) -> List[Dict]:
+        rng = random.Random(self.seed * 1000 + feed)
+        items = []
+        for entry in range(self.entries_per_feed):
+            event = self.events[(feed * 7 + entry * 3) % len(self.events)]
+            article = self.article_id(feed, entry)
+            summary_words = ' '.join(rng.choice(FILLER) for _ in range(40))
+            items.append({
+                'title': self.headline(event, feed + entry),
+                'link': f"{base_url}/articles/{article}.html",
+                'summary': f"<p>{escape(summary_words.capitalize())}.</p>",
+                'published': self.published - timedelta(minutes=feed * 3 + entry),
+                'image_mode': (feed + entry) % 6,
+                'image': f"{base_url}/images/photo-{article}-1200.jpg",
+                'thumb': f"{base_url}/images/thumb-{article}-150.jpg",
+            })
+        return items
+
+    # ------------------------------------------------------------------
+    # Feeds
+    # ------------------------------------------------------------------
+
+    def feed_xml(self, feed: int, base_url: str) -> bytes:
+        return (self._atom(feed, base_url) if feed % 2 else self._rss(feed, base_url)).encode('utf-8')
+
+    @staticmethod
+    def _summary_html(item: Dict) -> str:
+        """Summary HTML; image modes 3 and 4 carry their picture as <img> tags"""
+        html = item['summary']
+        if item['image_mode'] == 3:
+            html = (f'<img src="{item["thumb"]}" width="150"/>{html}'
+                    f'<img src="{item["image"]}" alt="photo"/>')
+        return html
+
+    def _rss(self, feed: int, base_url: str) -> str:
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/" '
+            'xmlns:content="http://purl.org/rss/1.0/modules/content/">',
+            f'<channel><title>Synthetic Feed {feed}</title><link>{base_url}/</link>'
+            f'<description>Benchmark feed {feed}</description>',
+        ]
+        for item in self.entries(feed, base_url):
+            mode = item['image_mode']
+            extra = ''
+            if mode == 0:
+                extra = f'<media:content url="{item["image"]}" medium="image" width="1200"/>'
+            elif mode == 1:
+                extra = f'<media:thumbnail url="{item["image"]}"/>'
+            elif mode == 2:
+                extra = f'<enclosure url="{item["image"]}" type="image/jpeg" length="20000"/>'
+            elif mode == 4:
+                extra = (f'<content:encoded><![CDATA[<p>Full text.</p><img src="{item["image"]}"/>'
+                         f'<p>More text.</p>]]></content:encoded>')
+            parts.append(
+                f'<item><title>{escape(item["title"])}</title><link>{item["link"]}</link>'
+                f'<guid>{item["link"]}</guid><pubDate>{format_datetime(item["published"])}</pubDate>'
+                f'<description>{escape(self._summary_html(item))}</description>{extra}</item>')
+        parts.append('</channel></rss>')
+        return '\n'.join(parts)
+
+    def _atom(self, feed: int, base_url: str) -> str:
+        parts = [
+            '<?xml version="1.0" encoding="utf-8"?>',
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/">',
+            f'<title>Synthetic Atom Feed {feed}</title><id>{base_url}/feeds/{feed}.xml</id>'
+            f'<updated>{self.published.isoformat()}</updated>',
+        ]
+        for item in self.entries(feed, base_url):
+            mode = item['image_mode']
+            extra = ''
+            if mode == 0:
+                extra = f'<media:content url="{item["image"]}" medium="image"/>'
+            elif mode == 2:
+                extra = f'<link rel="enclosure" type="image/jpeg" href="{item["image"]}"/>'
+            content = ''
+            if mode in (1, 4):
+                body = f'<p>Full text.</p><img src="{item["image"]}"/>'
+                content = f'<content type="html">{escape(body)}</content>'
+            parts.append(
+                f'<entry><title>{escape(item["title"])}</title><link href="{item["link"]}"/>'
+                f'<id>{item["link"]}</id><updated>{item["published"].isoformat()}</updated>'
+                f'<summary type="html">{escape(self._summary_html(item))}</summary>{content}{extra}</entry>')
+        parts.append('</feed>')
+        return '\n'.join(parts)
+
+    # ------------------------------------------------------------------
+    # Article pages
+    # ------------------------------------------------------------------
+
+    def article_parts(self, article: int):
+        """(event, body paragraphs as plain text, byline name) of article page n"""
+        rng = random.Random(self.seed * 7919 + article)
+        feed, entry = divmod(article, max(1, self.entries_per_feed))
+        event = self.events[(feed * 7 + entry * 3) % len(self.events)]
+        place, subject, action, obj, _ = event
+        day = self.published - timedelta(days=rng.randint(0, 30))
+
+        paragraphs = []
+        for index in range(rng.randint(8, 14)):
+            name = rng.choice(NAMES)
+            sentences = [
+                f"The {subject} in {place} {action} the {obj} on {day.strftime(DATE_FORMATS[index % len(DATE_FORMATS)])}.",
+                f"{name} said the decision affects {rng.randint(2, 900)} thousand people and costs "
+                f"{rng.randint(5, 95)} million dollars.",
+                ' '.join(rng.choice(FILLER) for _ in range(rng.randint(12, 24))).capitalize() + '.',
+                f"According to {rng.choice(NAMES)}, the vote was {rng.randint(5, 20)} to {rng.randint(0, 9)}.",
+            ]
+            if index % 3 == 1:
+                sentences.append(f'"We expect the {obj} to change how {place} works for years," {name} said.')
+            rng.shuffle(sentences)
+            paragraphs.append(' '.join(sentences))
+        return event, paragraphs, rng.choice(NAMES)
+
+    def article_html(self, article: int) -> bytes:
+        event, paragraphs, byline = self.article_parts(article)
+        body = ''.join(f"<p>{escape(paragraph)}</p>" for paragraph in paragraphs)
+        nav = ''.join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(25))
+        related = ''.join(f'<li><a href="/articles/{article + i}.html">Related story {i}</a></li>' for i in range(1, 9))
+        html = f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{escape(self.headline(event, 0))}</title>
+<meta property="og:image" content="/images/photo-{article}-1200.jpg">
+<script>window.dataLayer = window.dataLayer || []; {'var x = 1;' * 200}</script>
+<style>{'.c{{color:#333}}' * 200}</style></head>
+<body><header><nav><ul>{nav}</ul></nav></header>
+<div class="layout"><aside class="sidebar"><h3>Trending</h3><ul>{related}</ul></aside>
+<article class="story"><h1>{escape(self.headline(event, 0))}</h1>
+<div class="byline">By {escape(byline)}</div>
+<div class="article-content">{body}</div></article>
+<div class="comments"><p>Comments are closed.</p></div></div>
+<footer><p>Copyright Synthetic News</p><ul>{nav}</ul></footer>
+<script>{'console.log(1);' * 300}</script></body></html>"""
+        return html.encode('utf-8')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_state: 'FixtureServer' = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _handle(self):
+        state = self.server_state
+        path = urlparse(self.path).path
+        kind = path.strip('/').split('/')[0] or 'root'
+        with state.lock:
+            state.requests[kind] += 1
+        if state.latency:
+            time.sleep(state.latency)
+
+        corpus = state.corpus
+        try:
+            if kind == 'feeds':
+                feed = int(path.rsplit('/', 1)[1].split('.')[0])
+                if feed >= corpus.feeds:
+                    raise ValueError(path)
+                body = state.cached(path, lambda: corpus.feed_xml(feed, state.url))
+                content_type = 'application/atom+xml' if feed % 2 else 'application/rss+xml'
+            elif kind == 'articles':
+                article = int(path.rsplit('/', 1)[1].split('.')[0])
+                body = state.cached(path, lambda: corpus.article_html(article))
+                content_type = 'text/html; charset=utf-8'
+            elif kind == 'images':
+                body, content_type = _JPEG, 'image/jpeg'
+            else:
+                raise ValueError(path)
+        except (ValueError, IndexError):
+            return self._send(404, b'not found', 'text/plain')
+
+        with state.lock:
+            state.bytes_out += len(body)
+        self._send(200, body, content_type)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_HEAD(self):
+        self._handle()
+
+
+class FixtureServer:
+    """Threaded fixture server on 127.0.0.1 (port 0 = any free port)"""
+
+    def __init__(self, corpus: Corpus, port: int = 0, latency: float = 0.0):
+        self.corpus = corpus
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.bytes_out = 0
+        self._cache: Dict[str, bytes] = {}
+        handler = type('FixtureHandler', (_Handler,), {'server_state': self})
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def cached(self, key: str, build) -> bytes:
+        """Generated documents are built once, so serving cost stays out of the measurements"""
+        with self.lock:
+            body = self._cache.get(key)
+        if body is None:
+            body = build()
+            with self.lock:
+                self._cache[key] = body
+        return body
+
+    def feed_urls(self) -> List[str]:
+        return [f"{self.url}/feeds/{feed}.xml" for feed in range(self.corpus.feeds)]
+
+    def article_urls(self, count: int) -> List[str]:
+        total = self.corpus.feeds * self.corpus.entries_per_feed
+        return [f"{self.url}/articles/{article % total}.html" for article in range(count)]
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests = Counter()
+            self.bytes_out = 0
+
+    def start(self) -> 'FixtureServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,322 @@
+"""
+Local WordPress REST stand-in for offline publish benchmarks
+
+Implements just enough of the REST API for the publishing code paths:
+
+    GET  /wp-json/                              index (namespaces, batch/v1 optional)
+    GET  /wp-json/wp/v2/users/me                credentials check
+    GET  /wp-json/wp/v2/categories|tags         paginated, X-WP-Total/TotalPages
+    POST /wp-json/wp/v2/categories|tags         create (term_exists on duplicates)
+    POST /wp-json/wp/v2/media                   upload (body consumed and counted)
+    GET  /wp-json/wp/v2/posts?search=...        search in raw content
+    POST /wp-json/wp/v2/posts[/<id>]            create / update
+    POST /wp-json/batch/v1                      up to 25 sub-requests
+    GET  /images/<name>.jpg                     synthetic source images
+
+Every request can be delayed (latency + jitter) and a fraction of REST calls
+answered with 503 (error injection). Counters record requests per route and
+bytes received/sent.
+
+Usage (standalone):
+    python benchmarks/wp_stub.py [--port 8089] [--latency 0.05] [--error-rate 0.0] [--no-batch]
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+BATCH_LIMIT = 25
+
+
+class WPStubState:
+    """Site content and request counters (shared by all handler threads)"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 batch: bool = True, image_size: int = 200_000, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.batch = batch
+        self.image_size = image_size
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.next_id = 1000
+        self.terms: Dict[str, Dict[int, Dict]] = {'categories': {}, 'tags': {}}
+        self.posts: Dict[int, Dict] = {}
+        self.media: Dict[int, Dict] = {}
+        self.reset_counters()
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests = Counter()
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.errors_injected = 0
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                'requests': dict(self.requests),
+                'total_requests': sum(self.requests.values()),
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'errors_injected': self.errors_injected,
+            }
+
+    def new_id(self) -> int:
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+    def seed_terms(self, taxonomy: str, names):
+        for name in names:
+            term_id = self.new_id()
+            self.terms[taxonomy][term_id] = {'id': term_id, 'name': name, 'slug': name.lower().replace(' ', '-')}
+
+    # ------------------------------------------------------------------
+    # REST routes (shared by direct requests and batch sub-requests)
+    # ------------------------------------------------------------------
+
+    def dispatch(self, method: str, path: str, query: Dict, body) -> Tuple[int, object, Dict]:
+        """Returns (status, json body, extra headers)"""
+        route = path[len('/wp-json'):] if path.startswith('/wp-json') else path
+        route = route.rstrip('/') or '/'
+
+        if route == '/' and method == 'GET':
+            namespaces = ['oembed/1.0', 'wp/v2'] + (['batch/v1'] if self.batch else [])
+            return 200, {'name': 'WP Stub', 'namespaces': namespaces}, {}
+
+        if route == '/wp/v2/users/me':
+            return 200, {'id': 1, 'name': 'Stub Editor'}, {}
+
+        match = re.fullmatch(r'/wp/v2/(categories|tags)', route)
+        if match:
+            taxonomy = match.group(1)
+            if method == 'GET':
+                return self._list_terms(taxonomy, query)
+            return self._create_term(taxonomy, body or {})
+
+        if route == '/wp/v2/media' and method == 'POST':
+            media_id = self.new_id()
+            self.media[media_id] = {'id': media_id}
+            return 201, {'id': media_id, 'source_url': f'/uploads/{media_id}.jpg'}, {}
+
+        if route == '/wp/v2/posts':
+            if method == 'GET':
+                return self._search_posts(query)
+            return self._save_post(None, body or {})
+
+        match = re.fullmatch(r'/wp/v2/posts/(\d+)', route)
+        if match and method in ('POST', 'PUT', 'PATCH'):
+            return self._save_post(int(match.group(1)), body or {})
+
+        return 404, {'code': 'rest_no_route', 'message': 'No route was found', 'data': {'status': 404}}, {}
+
+    def _list_terms(self, taxonomy: str, query: Dict):
+        per_page = int(query.get('per_page', ['10'])[0])
+        page = int(query.get('page', ['1'])[0])
+        terms = sorted(self.terms[taxonomy].values(), key=lambda t: t['id'],
+                       reverse=query.get('order', ['asc'])[0] == 'desc')
+        total_pages = max(1, -(-len(terms) // per_page))
+        if page > total_pages:
+            return 400, {'code': 'rest_post_invalid_page_number'}, {}
+        chunk = terms[(page - 1) * per_page:page * per_page]
+        return 200, chunk, {'X-WP-Total': str(len(terms)), 'X-WP-TotalPages': str(total_pages)}
+
+    def _create_term(self, taxonomy: str, body: Dict):
+        name = (body.get('name') or '').strip()
+        if not name:
+            return 400, {'code': 'rest_missing_callback_param'}, {}
+        with self.lock:
+            for term in self.terms[taxonomy].values():
+                if term['name'].lower() == name.lower():
+                    return 400, {'code': 'term_exists', 'message': 'A term with the name provided already exists.',
+                                 'data': {'status': 400, 'term_id': term['id']}}, {}
+            self.next_id += 1
+            term = {'id': self.next_id, 'name': name, 'slug': name.lower().replace(' ', '-')}
+            self.terms[taxonomy][term['id']] = term
+        return 201, term, {}
+
+    def _search_posts(self, query: Dict):
+        needle = query.get('search', [''])[0]
+        found = [
+            {'id': post['id'], 'link': post['link'], 'content': {'raw': post['content']}}
+            for post in self.posts.values() if needle and needle in post['content']
+        ]
+        return 200, found, {}
+
+    def _save_post(self, post_id: Optional[int], body: Dict):
+        if post_id is not None and post_id not in self.posts:
+            return 404, {'code': 'rest_post_invalid_id'}, {}
+        created = post_id is None
+        if created:
+            post_id = self.new_id()
+            self.posts[post_id] = {'id': post_id, 'link': f'/?p={post_id}', 'content': '', 'title': '',
+                                   'categories': [], 'tags': [], 'meta': {}}
+        post = self.posts[post_id]
+        for field in ('title', 'content', 'excerpt', 'status', 'featured_media'):
+            if field in body:
+                post[field] = body[field]
+        for taxonomy in ('categories', 'tags'):
+            if taxonomy in body:
+                # Like WordPress: ids of deleted terms are silently dropped
+                post[taxonomy] = [t for t in body[taxonomy] if t in self.terms[taxonomy]]
+        if 'meta' in body:
+            post['meta'].update(body['meta'] or {})
+        response = dict(post)
+        response['content'] = {'raw': post['content'], 'rendered': post['content']}
+        return (201 if created else 200), response, {}
+
+    def batch_dispatch(self, body: Dict):
+        requests = (body or {}).get('requests') or []
+        if len(requests) > BATCH_LIMIT:
+            return 400, {'code': 'rest_batch_max_requests'}, {}
+        responses = []
+        for sub in requests:
+            parsed = urlparse(sub.get('path', ''))
+            status, payload, _ = self.dispatch(sub.get('method', 'POST'), '/wp-json' + parsed.path,
+                                               parse_qs(parsed.query), sub.get('body'))
+            responses.append({'body': payload, 'status': status, 'headers': {}})
+        return 207, {'responses': responses}, {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state: WPStubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            data = bytearray()
+            while True:
+                size = int(self.rfile.readline().strip() or b'0', 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                data += self.rfile.read(size)
+                self.rfile.readline()
+            return bytes(data)
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _send(self, status: int, payload, headers: Optional[Dict] = None, content_type: str = 'application/json'):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        with self.state.lock:
+            self.state.bytes_out += len(data)
+
+    def _handle(self, method: str):
+        state = self.state
+        raw = self._read_body()
+        parsed = urlparse(self.path)
+        route_key = re.sub(r'/\d+', '/<id>', parsed.path)
+        with state.lock:
+            state.requests[f"{method} {route_key}"] += 1
+            state.bytes_in += len(raw)
+            inject = parsed.path.startswith('/wp-json') and state.random.random() < state.error_rate
+            if inject:
+                state.errors_injected += 1
+            delay = state.latency + (state.random.uniform(0, state.jitter) if state.jitter else 0)
+
+        if delay:
+            time.sleep(delay)
+
+        if parsed.path.startswith('/images/'):
+            body = bytes([0xFF, 0xD8, 0xFF, 0xE0]) + bytes(state.image_size - 4)
+            return self._send(200, body, content_type='image/jpeg')
+
+        if inject:
+            return self._send(503, {'code': 'service_unavailable', 'message': 'Injected failure'})
+
+        body = None
+        if raw and 'json' in (self.headers.get('Content-Type') or ''):
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                return self._send(400, {'code': 'rest_invalid_json'})
+
+        if parsed.path.rstrip('/') == '/wp-json/batch/v1' and method == 'POST':
+            if not state.batch:
+                return self._send(404, {'code': 'rest_no_route'})
+            status, payload, headers = state.batch_dispatch(body)
+        else:
+            status, payload, headers = state.dispatch(method, parsed.path, parse_qs(parsed.query), body)
+        self._send(status, payload, headers)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+
+class WPStubServer:
+    """Threaded stub server on 127.0.0.1 (port 0 = any free port)"""
+
+    def __init__(self, port: int = 0, **state_options):
+        self.state = WPStubState(**state_options)
+        handler = type('WPStubHandler', (_Handler,), {'state': self.state})
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def start(self) -> 'WPStubServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='wp-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local WordPress REST stand-in')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of REST calls answered with 503')
+    parser.add_argument('--no-batch', action='store_true', help='Hide the batch/v1 endpoint (pre-5.6 site)')
+    args = parser.parse_args()
+
+    server = WPStubServer(args.port, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, batch=not args.no_batch)
+    print(f"WordPress stub on {server.url} (Ctrl+C to stop)")
+    try:
+        server.start()
+        while True:
+            time.sleep(5)
+            print(json.dumps(server.state.snapshot()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""
+Content Extractor - Readability-style main-content extraction on lxml
+Shared by ContentScraper and ResearchWriter.
+
+    from core.content_extractor import extract_main_content
+
+    page = extract_main_content(response.content)
+    page['title'], page['text'], page['paragraphs'], page['blockquotes']
+
+FEATURES:
+✅ One streaming lxml parse - no tree is built, no BeautifulSoup
+✅ script/style/nav/aside/footer and form controls skipped while parsing
+   (not <form> itself - ASP.NET pages wrap the whole body in one)
+✅ Blocks scored by text length and commas, passed up to parent and grandparent
+✅ Class/id hints (article, content, story vs comment, sidebar, related)
+✅ Link density penalty - menus and "related stories" lists lose
+✅ Sibling containers of the winner kept when they score close to it
+✅ Falls back to every text block when no container wins
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Union
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Subtrees dropped while parsing (their text never reaches the scorer)
+SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg', 'iframe', 'object', 'canvas',
+                       'nav', 'aside', 'footer', 'button', 'select', 'option', 'textarea', 'label'})
+# Elements whose own text forms one block of output
+BLOCK_TAGS = frozenset({'body', 'article', 'main', 'section', 'div', 'p', 'pre', 'blockquote', 'li', 'dd', 'dt',
+                        'td', 'th', 'figcaption', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'address'})
+PARAGRAPH_TAGS = frozenset({'p', 'pre'})
+HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'th'})
+# Blocks whose text length is scored (divs count only when they hold text directly)
+SCORED_TAGS = frozenset({'p', 'pre', 'td', 'div', 'section', 'li'})
+TAG_WEIGHTS = {'div': 5, 'article': 8, 'main': 5, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+               'ol': -3, 'ul': -3, 'li': -3, 'dl': -3, 'dd': -3, 'dt': -3, 'address': -3,
+               'h1': -5, 'h2': -5, 'h3': -5, 'h4': -5, 'h5': -5, 'h6': -5, 'th': -5}
+CLASS_WEIGHT = 25
+
+POSITIVE_RE = re.compile(r'article|body|content|entry|hentry|h-entry|main|page|post|text|blog|story', re.I)
+NEGATIVE_RE = re.compile(r'comment|discussion|disqus|respond|reply|com-|contact|foot|masthead|meta|outbrain|'
+                         r'promo|related|scroll|share|shoutbox|sidebar|skyscraper|sponsor|shopping|tags|tool|'
+                         r'widget|trending|banner|ad-', re.I)
+CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_-]+)', re.I)
+
+MIN_BLOCK_CHARS = 25       # shorter blocks are not scored
+MIN_CONTENT_CHARS = 200    # a winner shorter than this falls back to all blocks
+SIBLING_MIN_SCORE = 10     # siblings of the winner scoring max(10, 20% of it) are kept
+SIBLING_SCORE_RATIO = 0.2
+SIBLING_MIN_CHARS = 80     # ... as are sibling <p>s this long with few links
+SIBLING_MAX_LINK_DENSITY = 0.25
+
+
+class _Frame:
+    __slots__ = ('tag', 'weight', 'chunks', 'text_chars', 'link_chars', 'score', 'first_block', 'parent')
+
+    def __init__(self, tag: str, weight: int, first_block: int, parent: Optional['_Frame']):
+        self.tag = tag
+        self.parent = parent
+        self.weight = weight
+        self.chunks = []
+        self.text_chars = 0
+        self.link_chars = 0
+        self.score = 0.0
+        self.first_block = first_block
+
+
+class _ContentTarget:
+    """lxml parser target: builds blocks and scores containers as the page streams in"""
+
+    def __init__(self):
+        self.stack: List[_Frame] = []
+        self.block_stack: List[_Frame] = []
+        self.blocks: List[tuple] = []          # (tag, text) in document order, inner blocks first
+        self.blockquotes: List[tuple] = []     # (block index, text)
+        self.skip_depth = 0
+        self.link_depth = 0
+        self.title = None
+        self.h1 = None
+        self.candidates: List[tuple] = []      # (score, first_block, end_block, parent, tag, weight, chars, link density)
+
+    def start(self, tag, attrib):
+        if self.skip_depth or tag in SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        weight = TAG_WEIGHTS.get(tag, 0)
+        hints = f"{attrib.get('class', '')} {attrib.get('id', '')}"
+        if hints.strip():
+            if NEGATIVE_RE.search(hints):
+                weight -= CLASS_WEIGHT
+            if POSITIVE_RE.search(hints):
+                weight += CLASS_WEIGHT
+        frame = _Frame(tag, weight, len(self.blocks), self.stack[-1] if self.stack else None)
+        self.stack.append(frame)
+        if tag in BLOCK_TAGS:
+            self.block_stack.append(frame)
+        elif tag == 'a':
+            self.link_depth += 1
+
+    def data(self, text):
+        if self.skip_depth or not self.stack:
+            return
+        frame = self.stack[-1]
+        if frame.tag == 'title':
+            self.title = (self.title or '') + text
+            return
+        length = len(text.strip())
+        frame.text_chars += length
+        if self.link_depth:
+            frame.link_chars += length
+        if self.block_stack:
+            self.block_stack[-1].chunks.append(text)
+
+    def end(self, tag):
+        if self.skip_depth:
+            self.skip_depth -= 1
+            return
+        if not self.stack:
+            return
+        frame = self.stack.pop()
+        if frame.tag in BLOCK_TAGS:
+            self.block_stack.pop()
+            text = ' '.join(''.join(frame.chunks).split())
+            if text:
+                self.blocks.append((frame.tag, text))
+                if frame.tag == 'h1' and self.h1 is None:
+                    self.h1 = text
+            if frame.tag == 'blockquote':
+                quote = ' '.join(block for _, block in self.blocks[frame.first_block:])
+                if quote:
+                    self.blockquotes.append((frame.first_block, quote))
+            if frame.tag in SCORED_TAGS and len(text) >= MIN_BLOCK_CHARS:
+                self._score_block(text)
+        elif frame.tag == 'a':
+            self.link_depth -= 1
+
+        if frame.score or frame.tag in PARAGRAPH_TAGS:
+            density = self._link_density(frame)
+            score = (frame.score + frame.weight) * (1 - density) if frame.score else 0.0
+            self.candidates.append((score, frame.first_block, len(self.blocks), frame.parent,
+                                    frame.tag, frame.weight, frame.text_chars, density))
+
+        if self.stack:
+            parent = self.stack[-1]
+            parent.text_chars += frame.text_chars
+            parent.link_chars += frame.link_chars
+
+    def _score_block(self, text: str):
+        """Readability: 1 + commas + one point per 100 chars (max 3) -> parent, half to grandparent"""
+        points = 1 + text.count(',') + min(len(text) // 100, 3)
+        if len(self.stack) >= 1:
+            self.stack[-1].score += points
+        if len(self.stack) >= 2:
+            self.stack[-2].score += points / 2
+
+    @staticmethod
+    def _link_density(frame: _Frame) -> float:
+        return frame.link_chars / frame.text_chars if frame.text_chars else 0.0
+
+    def _select(self) -> List[int]:
+        """Block indexes of the winning container plus qualifying siblings"""
+        scored = [candidate for candidate in self.candidates if candidate[0] > 0]
+        if not scored:
+            return []
+        best = max(scored, key=lambda candidate: candidate[0])
+        threshold = max(SIBLING_MIN_SCORE, best[0] * SIBLING_SCORE_RATIO)
+        indexes = []
+        for score, first, last, parent, tag, weight, chars, density in self.candidates:
+            if parent is not best[3] or parent is None:
+                continue
+            # Article split over sibling containers, or loose <p>s next to the winner;
+            # comment threads and other negatively hinted siblings stay out
+            if (first, last) == best[1:3] or (score >= threshold and weight >= 0) or \
+                    (tag in PARAGRAPH_TAGS and chars > SIBLING_MIN_CHARS and density < SIBLING_MAX_LINK_DENSITY):
+                indexes.extend(range(first, last))
+        if best[3] is None:
+            indexes = list(range(best[1], best[2]))
+        return indexes
+
+    def close(self) -> Dict:
+        indexes = self._select()
+        fallback = sum(len(self.blocks[index][1]) for index in indexes) < MIN_CONTENT_CHARS
+        if fallback:
+            indexes = list(range(len(self.blocks)))
+        selected = [self.blocks[index] for index in indexes]
+        kept = set(indexes)
+        paragraphs = [text for tag, text in selected if tag in PARAGRAPH_TAGS]
+        if not paragraphs:
+            # Text kept directly in <div>s (<br>-separated layouts)
+            paragraphs = [text for tag, text in selected if tag not in HEADING_TAGS]
+        return {
+            'title': self.h1 or (' '.join(self.title.split()) if self.title else None),
+            'page_title': ' '.join(self.title.split()) if self.title else None,
+            'text': '\n\n'.join(text for _, text in selected),
+            'paragraphs': paragraphs,
+            'blockquotes': [text for index, text in self.blockquotes if index in kept],
+            'fallback': fallback,
+        }
+
+
+def _decode(html: bytes) -> str:
+    """Bytes -> text using the page's <meta charset>, else UTF-8"""
+    match = CHARSET_RE.search(html[:4096])
+    if match:
+        try:
+            return html.decode(match.group(1).decode('ascii'), errors='replace')
+        except LookupError:
+            pass
+    return html.decode('utf-8', errors='replace')
+
+
+def extract_main_content(html: Union[bytes, str]) -> Optional[Dict]:
+    """
+    Main content of an HTML page
+
+    Returns:
+        {'title' (first h1, else <title>), 'page_title', 'text' (blocks joined
+         by blank lines), 'paragraphs' (<p>/<pre> texts, or the non-heading
+         blocks when the content has no <p>), 'blockquotes',
+         'fallback' (True when no container won and every block was kept)}
+        or None if lxml is missing or the page can't be parsed
+    """
+    if not LXML_AVAILABLE:
+        logger.warning("⚠️ lxml not installed - main-content extraction unavailable")
+        return None
+    if isinstance(html, bytes):
+        html = _decode(html)
+    if not html.strip():
+        return None
+    try:
+        parser = etree.HTMLParser(target=_ContentTarget(), remove_comments=True, remove_pis=True)
+        parser.feed(html)
+        return parser.close()
+    except Exception as e:
+        logger.debug(f"Content extraction failed: {e}")
+        return None
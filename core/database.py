@@ -0,0 +1,65 @@
+"""
+Database Setup - Core schema shared by the desktop app and the headless CLI
+"""
+
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseSetup:
+    def __init__(self, db_path='nexuzy.db'):
+        self.db_path = db_path
+        self.init_database()
+    
+    def init_database(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('CREATE TABLE IF NOT EXISTS workspaces (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
+        cursor.execute('CREATE TABLE IF NOT EXISTS rss_feeds (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, feed_name TEXT NOT NULL, url TEXT NOT NULL, category TEXT DEFAULT "General", enabled BOOLEAN DEFAULT 1, added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (workspace_id) REFERENCES workspaces(id), UNIQUE(workspace_id, url))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS news_queue (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, headline TEXT NOT NULL, summary TEXT, source_url TEXT, source_domain TEXT, category TEXT, publish_date TEXT, image_url TEXT, verified_score REAL DEFAULT 0, verified_sources INTEGER DEFAULT 1, fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, status TEXT DEFAULT "new", FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS ai_drafts (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, news_id INTEGER, title TEXT, headline_suggestions TEXT, body_draft TEXT, summary TEXT, image_url TEXT, source_url TEXT, word_count INTEGER DEFAULT 0, generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS translations (id INTEGER PRIMARY KEY, draft_id INTEGER NOT NULL, language TEXT, title TEXT, body TEXT, approved BOOLEAN DEFAULT 0, translated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (draft_id) REFERENCES ai_drafts(id))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS wp_credentials (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, site_url TEXT, username TEXT, app_password TEXT, connected BOOLEAN DEFAULT 0, FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS ads_settings (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, header_code TEXT, footer_code TEXT, content_code TEXT, enabled BOOLEAN DEFAULT 1, FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS news_groups (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, group_hash TEXT, source_count INTEGER DEFAULT 1, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS grouped_news (id INTEGER PRIMARY KEY, group_id INTEGER NOT NULL, news_id INTEGER NOT NULL, similarity_score REAL, FOREIGN KEY (group_id) REFERENCES news_groups(id), FOREIGN KEY (news_id) REFERENCES news_queue(id))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS scraped_facts (id INTEGER PRIMARY KEY, news_id INTEGER NOT NULL, fact_type TEXT, content TEXT, confidence REAL DEFAULT 0.5, source_url TEXT, FOREIGN KEY (news_id) REFERENCES news_queue(id))')
+        cursor.execute('CREATE TABLE IF NOT EXISTS wordpress_posts (id INTEGER PRIMARY KEY, draft_id INTEGER NOT NULL, wp_post_id INTEGER, wp_site_url TEXT, status TEXT DEFAULT "draft", published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (draft_id) REFERENCES ai_drafts(id))')
+        self._ensure_unique_facts(cursor)
+        
+        conn.commit()
+        conn.close()
+        logger.info("[OK] Database initialized with all tables")
+    
+    def _ensure_unique_facts(self, cursor):
+        """One row per (news_id, fact_type, content) in scraped_facts"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_scraped_facts_unique'")
+        if cursor.fetchone():
+            return
+        # Older databases stored the same fact once per scrape; keep the first copy
+        cursor.execute('''
+            DELETE FROM scraped_facts WHERE id NOT IN (
+                SELECT MIN(id) FROM scraped_facts GROUP BY news_id, fact_type, content
+            )
+        ''')
+        if cursor.rowcount:
+            logger.info(f"🧹 Removed {cursor.rowcount} duplicate scraped facts")
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_scraped_facts_unique
+            ON scraped_facts(news_id, fact_type, content)
+        ''')
+    
+    def ensure_default_workspace(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM workspaces')
+            if cursor.fetchone()[0] == 0:
+                cursor.execute('INSERT INTO workspaces (name) VALUES (?)', ('Default Workspace',))
+                conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error: {e}")
@@ -0,0 +1,86 @@
+"""
+Fact Extractor - Single-pass extraction of dates, entities, quotes and fact sentences
+Used by ContentScraper on the paragraph text it has already joined.
+
+    from core.fact_extractor import extract_facts
+
+    extracted = extract_facts(text, blockquotes=['...'])
+
+FEATURES:
+✅ Patterns compiled once at import (one date alternation, not three findall calls)
+✅ One walk over the sentences yields dates, entities and fact sentences together
+✅ Quotes scanned from the same paragraph text - no second soup.get_text()
+✅ Order-preserving de-duplication (stable results between runs)
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+MAX_QUOTES = 5
+MAX_FACTS = 10
+MAX_ENTITIES = 20
+MIN_FACT_CHARS = 20
+MAX_FACT_CHARS = 300
+
+# "12 March 2024", "2024-03-12", "12/03/2024" - one alternation behind a
+# shared leading digit, so positions without a digit are skipped cheaply
+DATE_RE = re.compile(
+    r'\d(?:\d?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}'
+    r'|\d{3}-\d{1,2}-\d{1,2}'
+    r'|\d?/\d{1,2}/\d{4})',
+    re.IGNORECASE,
+)
+# Text between sentence terminators
+SENTENCE_RE = re.compile(r'[^.!?]+')
+# A digit or a reporting word makes a sentence a fact candidate
+FACT_HINT_RE = re.compile(
+    r'\d|said|announced|confirmed|reported|found|according|however|yesterday|today|showed',
+    re.IGNORECASE,
+)
+QUOTE_RE = re.compile(r'["“]([^"”]{20,200})["”]')
+
+
+def extract_facts(text: str, blockquotes: Iterable[str] = ()) -> Dict[str, List[str]]:
+    """
+    Extract facts from an article's paragraph text
+
+    Args:
+        text: paragraph text of the article body
+        blockquotes: text of <blockquote> elements (listed before inline quotes)
+
+    Returns:
+        {'dates', 'names', 'quotes', 'facts'} - lists of strings
+    """
+    dates = {}
+    names = {}
+    facts = []
+
+    # One walk over the sentences for dates, entities and fact candidates
+    # (no date format contains a terminator, so none spans two fragments)
+    for match in SENTENCE_RE.finditer(text):
+        fragment = match.group()
+        for date in DATE_RE.findall(fragment):
+            dates[date] = None
+
+        # Capitalised words, except the first word after a terminator
+        words = fragment.split()
+        for word in words[1:]:
+            if len(word) > 2 and word[0].isupper():
+                names[word.strip(',;:')] = None
+
+        if len(facts) < MAX_FACTS:
+            sentence = fragment.strip()
+            if MIN_FACT_CHARS <= len(sentence) <= MAX_FACT_CHARS and FACT_HINT_RE.search(sentence):
+                facts.append(sentence)
+
+    # Quotes get their own scan: they run across sentence terminators
+    quotes = [quote.strip() for quote in blockquotes if quote and quote.strip()]
+    if len(quotes) < MAX_QUOTES:
+        quotes.extend(QUOTE_RE.findall(text))
+
+    return {
+        'dates': list(dates),
+        'names': list(names)[:MAX_ENTITIES],
+        'quotes': quotes[:MAX_QUOTES],
+        'facts': facts,
+    }
@@ -0,0 +1,323 @@
+"""
+Gutenberg Block Converter - HTML → WordPress block markup in one pass
+Shared by WordPressAPI, WordPressAPIEnhanced and WordPressFormatter.
+
+FEATURES:
+✅ Single streaming pass (html.parser events), blocks kept in document order
+✅ Headings (h1-h6), paragraphs, lists (nested lists stay inside their item),
+   images/figures with captions, quotes, tables, code, separators
+✅ Inline markup (links, bold, italics, line breaks) preserved
+✅ Layout wrappers (div, section, article...) are flattened, scripts dropped
+"""
+
+import json
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+LIST_TAGS = ('ul', 'ol')
+# Tags that start a block of their own at top level
+BLOCK_TAGS = HEADING_TAGS + LIST_TAGS + ('p', 'figure', 'blockquote', 'table', 'pre', 'hr', 'img')
+# Tags that also end an open paragraph (HTML auto-closes <p> before these)
+PARAGRAPH_BREAKERS = BLOCK_TAGS + ('div', 'section', 'article', 'main', 'header', 'footer', 'aside', 'nav')
+VOID_TAGS = ('br', 'img', 'hr', 'wbr', 'source', 'input', 'col')
+SKIP_TAGS = ('script', 'style', 'noscript', 'iframe', 'form', 'button', 'svg')
+# Attributes worth keeping on inline elements
+KEEP_ATTRS = ('href', 'src', 'alt', 'title', 'class', 'target', 'rel', 'width', 'height',
+              'colspan', 'rowspan', 'cite', 'srcset', 'sizes')
+
+_WHITESPACE = re.compile(r'\s+')
+_WP_IMAGE_ID = re.compile(r'\bwp-image-(\d+)\b')
+_LIST_TAG_SPACE = re.compile(r'\s*(</?(?:ul|ol|li)\b[^>]*>)\s*')
+_CODE_ELEMENT = re.compile(r'<code\b[^>]*>(.*)</code>', re.DOTALL)
+
+
+def _start_tag(tag: str, attrs: List[Tuple[str, Optional[str]]], extra_class: str = '') -> str:
+    parts = [tag]
+    classes = extra_class
+    for name, value in attrs:
+        if name not in KEEP_ATTRS:
+            continue
+        if name == 'class':
+            classes = f"{classes} {value}".strip() if value else classes
+            continue
+        if value is None:
+            parts.append(name)
+        else:
+            parts.append(f'{name}="{escape(value, quote=True)}"')
+    if classes:
+        parts.insert(1, f'class="{escape(classes, quote=True)}"')
+    return '<' + ' '.join(parts) + ('/>' if tag in VOID_TAGS else '>')
+
+
+def _collapse(html_fragment: str) -> str:
+    return _WHITESPACE.sub(' ', html_fragment).strip()
+
+
+def _comment(name: str, attrs: Optional[Dict] = None) -> str:
+    if attrs:
+        return f"<!-- wp:{name} {json.dumps(attrs, separators=(',', ':'))} -->"
+    return f"<!-- wp:{name} -->"
+
+
+def _wrap(name: str, body: str, attrs: Optional[Dict] = None) -> str:
+    return f"{_comment(name, attrs)}\n{body}\n<!-- /wp:{name} -->"
+
+
+def featured_image_block(media_id: int) -> str:
+    """Image block for an uploaded featured image"""
+    return _wrap('image',
+                 f'<figure class="wp-block-image size-large"><img src="" alt="" class="wp-image-{media_id}"/></figure>',
+                 {'id': media_id, 'sizeSlug': 'large'})
+
+
+class _Block:
+    """A top-level block being captured"""
+
+    __slots__ = ('tag', 'attrs', 'parts', 'open_tags', 'images', 'text', 'implicit', 'quote_paragraph')
+
+    def __init__(self, tag: str, attrs, implicit: bool = False):
+        self.tag = tag
+        self.attrs = attrs
+        self.parts: List[str] = []
+        self.open_tags: List[str] = [tag]
+        self.images: List[List[Tuple[str, Optional[str]]]] = []
+        self.text = False
+        self.implicit = implicit
+        self.quote_paragraph = False
+
+
+class GutenbergConverter(HTMLParser):
+    """
+    Streaming HTML → Gutenberg converter
+
+    Use convert_html_to_blocks() rather than driving the parser directly.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self._block: Optional[_Block] = None
+        self._skip_depth = 0
+
+    # ------------------------------------------------------------------
+    # Parser events
+    # ------------------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_depth:
+            if tag not in VOID_TAGS:
+                self._skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth = 1
+            return
+
+        block = self._block
+        if block is None:
+            if tag in BLOCK_TAGS:
+                self._open(tag, attrs)
+            elif tag not in PARAGRAPH_BREAKERS and tag not in ('li', 'tr', 'td', 'th', 'tbody', 'thead', 'figcaption'):
+                # Inline content outside any block becomes a paragraph
+                self._open('p', [], implicit=True)
+                self._append_start(tag, attrs)
+            return
+
+        if block.tag in ('p',) + HEADING_TAGS and tag in PARAGRAPH_BREAKERS:
+            self._flush()
+            self.handle_starttag(tag, attrs)
+            return
+
+        if block.tag == 'blockquote' and tag == 'p' and len(block.open_tags) == 1:
+            block.parts.append('<!-- wp:paragraph -->\n')
+            block.quote_paragraph = True
+
+        self._append_start(tag, attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+
+        block = self._block
+        if block is None or tag in VOID_TAGS:
+            return
+
+        if tag not in block.open_tags:
+            if block.implicit and tag in PARAGRAPH_BREAKERS:
+                # </div> closing the wrapper around loose inline content
+                self._flush()
+            return
+
+        # Close everything opened after the matching tag (tolerates bad nesting)
+        while block.open_tags:
+            open_tag = block.open_tags.pop()
+            if not block.open_tags:
+                self._flush()
+                return
+            block.parts.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+        if block.tag == 'blockquote' and tag == 'p' and len(block.open_tags) == 1:
+            block.parts.append('\n<!-- /wp:paragraph -->\n')
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        block = self._block
+        if block is None:
+            if not data.strip():
+                return
+            self._open('p', [], implicit=True)
+            block = self._block
+        if block.tag == 'pre':
+            block.text = block.text or bool(data.strip())
+            block.parts.append(escape(data, quote=False))
+            return
+        if data.strip():
+            block.text = True
+        elif block.open_tags[-1] in LIST_TAGS + ('table', 'tbody', 'thead', 'tr', 'figure', 'blockquote'):
+            # Formatting whitespace between structural tags
+            return
+        block.parts.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        if self._block:
+            self._flush()
+
+    # ------------------------------------------------------------------
+    # Block assembly
+    # ------------------------------------------------------------------
+
+    def _open(self, tag: str, attrs, implicit: bool = False):
+        self._block = _Block(tag, attrs, implicit)
+        if tag in VOID_TAGS:
+            if tag == 'img':
+                self._block.images.append(attrs)
+            self._flush()
+
+    def _append_start(self, tag: str, attrs):
+        block = self._block
+        if tag == 'img':
+            block.images.append(attrs)
+        extra_class = 'wp-element-caption' if tag == 'figcaption' else ''
+        block.parts.append(_start_tag(tag, attrs, extra_class))
+        if tag not in VOID_TAGS:
+            block.open_tags.append(tag)
+
+    def _flush(self):
+        block, self._block = self._block, None
+        if block is None:
+            return
+        inner = ''.join(block.parts)
+        rendered = getattr(self, f'_render_{block.tag}', self._render_heading)(block, inner)
+        if rendered:
+            self.blocks.append(rendered)
+
+    def _render_p(self, block: _Block, inner: str) -> Optional[str]:
+        inner = _collapse(inner)
+        if not block.text and block.images:
+            # Paragraph that only wraps an image (common editor output)
+            return self._image_block(block.images[0], '')
+        if not block.text:
+            return None
+        return _wrap('paragraph', f'<p>{inner}</p>')
+
+    def _render_heading(self, block: _Block, inner: str) -> Optional[str]:
+        inner = _collapse(inner)
+        if not block.text:
+            return None
+        level = int(block.tag[1])
+        return _wrap('heading', f'<h{level} class="wp-block-heading">{inner}</h{level}>',
+                     None if level == 2 else {'level': level})
+
+    def _render_list(self, block: _Block, inner: str) -> Optional[str]:
+        if not block.text:
+            return None
+        items = _LIST_TAG_SPACE.sub(r'\1', inner).strip()
+        return _wrap('list', f'<{block.tag}>{items}</{block.tag}>', {'ordered': True} if block.tag == 'ol' else None)
+
+    _render_ul = _render_list
+    _render_ol = _render_list
+
+    def _image_block(self, img_attrs, caption: str) -> Optional[str]:
+        attrs = dict(img_attrs)
+        if not attrs.get('src'):
+            return None
+        match = _WP_IMAGE_ID.search(attrs.get('class') or '')
+        block_attrs = {'id': int(match.group(1)), 'sizeSlug': 'large'} if match else None
+        figure_class = 'wp-block-image size-large' if match else 'wp-block-image'
+        img = _start_tag('img', [(k, v) for k, v in img_attrs if k in ('src', 'alt', 'class', 'title')])
+        if 'alt' not in attrs:
+            img = img[:-2] + ' alt=""/>'
+        return _wrap('image', f'<figure class="{figure_class}">{img}{caption}</figure>', block_attrs)
+
+    def _render_img(self, block: _Block, inner: str) -> Optional[str]:
+        return self._image_block(block.images[0], '')
+
+    def _render_figure(self, block: _Block, inner: str) -> Optional[str]:
+        if '<table' in inner:
+            return _wrap('table', f'<figure class="wp-block-table">{_collapse(inner)}</figure>')
+        if not block.images:
+            return None
+        caption = re.search(r'<figcaption.*</figcaption>', inner, re.DOTALL)
+        return self._image_block(block.images[0], _collapse(caption.group(0)) if caption else '')
+
+    def _render_blockquote(self, block: _Block, inner: str) -> Optional[str]:
+        if not block.text:
+            return None
+        inner = inner.strip()
+        if not block.quote_paragraph:
+            inner = _wrap('paragraph', f'<p>{_collapse(inner)}</p>')
+        return _wrap('quote', f'<blockquote class="wp-block-quote">{inner}</blockquote>')
+
+    def _render_table(self, block: _Block, inner: str) -> Optional[str]:
+        if not block.text:
+            return None
+        return _wrap('table', f'<figure class="wp-block-table"><table>{_collapse(inner)}</table></figure>')
+
+    def _render_pre(self, block: _Block, inner: str) -> Optional[str]:
+        if not block.text:
+            return None
+        code = inner.strip()
+        # <pre><code>…</code></pre>: the block supplies its own <code>
+        match = _CODE_ELEMENT.fullmatch(code)
+        if match and code.count('<code') == 1:
+            inner = match.group(1)
+        return _wrap('code', f'<pre class="wp-block-code"><code>{inner.strip(chr(10))}</code></pre>')
+
+    def _render_hr(self, block: _Block, inner: str) -> str:
+        return _wrap('separator', '<hr class="wp-block-separator has-alpha-channel-opacity"/>')
+
+
+def convert_html_to_blocks(html_content: str, featured_media_id: Optional[int] = None) -> str:
+    """
+    Convert article HTML to Gutenberg block markup
+
+    Args:
+        html_content: Article HTML
+        featured_media_id: Media id to show as a leading image block
+
+    Returns:
+        Block markup in document order ('' if the HTML has no content)
+    """
+    if not html_content or not html_content.strip():
+        return ""
+
+    converter = GutenbergConverter()
+    converter.feed(html_content)
+    converter.close()
+
+    blocks = converter.blocks
+    if featured_media_id and blocks:
+        blocks.insert(0, featured_image_block(featured_media_id))
+    return '\n\n'.join(blocks)
@@ -0,0 +1,450 @@
+"""
+HTTP Cache Module - Shared on-disk cache for the desk's HTTP traffic
+A requests transport adapter, so any session can use it: feeds, article
+pages, research sources, stock-image checks and image downloads. The
+authenticated WordPress sessions are not routed through it.
+
+    from core.http_cache import cached_session
+    session = cached_session('feeds', stage='fetch')
+
+FEATURES:
+✅ Honours Cache-Control (max-age, no-store, no-cache), Expires, Vary
+✅ Conditional requests with ETag / Last-Modified - 304s refresh the entry
+✅ zlib-compressed bodies in http_cache/<k[:2]>/<key>, SQLite index
+✅ Size cap with LRU eviction (config.json http_cache_max_mb, default 500)
+✅ Hit / miss / revalidation counters (core.metrics and stats())
+✅ Requests carrying Authorization always go to the network
+"""
+
+import email.utils
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = 'http_cache'
+DEFAULT_MAX_MB = 500
+MAX_ENTRY_BYTES = 20 * 1024 * 1024   # larger bodies stream through uncached
+HEURISTIC_FRACTION = 0.1             # of (Date - Last-Modified), RFC 9111 4.2.2
+HEURISTIC_MAX_SECONDS = 24 * 3600
+
+CACHEABLE_STATUSES = (200, 203, 301, 308, 404, 410)
+# Hop-by-hop or no longer true once the body is stored decoded
+_DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'connection', 'keep-alive', 'content-length')
+# A HEAD has no body: its Content-Length describes the resource and is kept
+_HEAD_DROPPED_HEADERS = ('transfer-encoding', 'connection', 'keep-alive')
+# Already compressed: stored as-is
+_COMPRESSED_TYPES = ('image/', 'video/', 'audio/', 'application/zip', 'application/gzip', 'font/woff')
+
+
+def _load_settings() -> Dict:
+    try:
+        config_path = Path('config.json')
+        if config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            return {key: config[key] for key in ('http_cache_enabled', 'http_cache_dir', 'http_cache_max_mb')
+                    if key in config}
+    except Exception as e:
+        logger.debug(f"Could not load HTTP cache settings from config.json: {e}")
+    return {}
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """'max-age=60, no-cache' -> {'max-age': '60', 'no-cache': None}"""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except Exception:
+        return None
+
+
+def freshness_lifetime(headers) -> float:
+    """Seconds a response stays fresh (0 = revalidate before every use)"""
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    if 'no-cache' in directives:
+        return 0.0
+    if 'max-age' in directives:
+        try:
+            return max(0.0, float(directives['max-age']))
+        except (TypeError, ValueError):
+            return 0.0
+    date = _http_date(headers.get('Date')) or time.time()
+    expires = headers.get('Expires')
+    if expires is not None:
+        expires_at = _http_date(expires)
+        return max(0.0, expires_at - date) if expires_at else 0.0
+    last_modified = _http_date(headers.get('Last-Modified'))
+    if last_modified and date > last_modified:
+        return min(HEURISTIC_MAX_SECONDS, (date - last_modified) * HEURISTIC_FRACTION)
+    return 0.0
+
+
+class HTTPCache:
+    """Compressed response bodies on disk, metadata in an SQLite index"""
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.index_path = str(self.root / 'index.sqlite')
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0, 'bypassed': 0}
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._ensure_tables()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_path, timeout=30)
+
+    def _ensure_tables(self):
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                cache_key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                vary TEXT,
+                encoding TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                fresh_until REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_http_cache_access ON http_cache(last_access)')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def cache_key(method: str, url: str) -> str:
+        return hashlib.sha256(f"{method.upper()} {url}".encode('utf-8')).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def count(self, event: str, service: str):
+        with self._lock:
+            self._stats[event] += 1
+        metrics.count(f"http_cache_{event}", 1, stage='http', service=service)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        try:
+            conn = self._connect()
+            stats['entries'], stats['bytes'] = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache').fetchone()
+            conn.close()
+        except Exception:
+            pass
+        return stats
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        conn = self._connect()
+        row = conn.execute('''
+            SELECT method, url, status, headers, vary, encoding, size, stored_at, fresh_until
+            FROM http_cache WHERE cache_key = ?
+        ''', (key,)).fetchone()
+        conn.close()
+        if not row:
+            return None
+        return {
+            'key': key, 'method': row[0], 'url': row[1], 'status': row[2],
+            'headers': json.loads(row[3]), 'vary': json.loads(row[4]) if row[4] else {},
+            'encoding': row[5], 'size': row[6], 'stored_at': row[7], 'fresh_until': row[8],
+        }
+
+    def read_body(self, entry: Dict) -> Optional[bytes]:
+        try:
+            data = self._body_path(entry['key']).read_bytes()
+            return zlib.decompress(data) if entry['encoding'] == 'zlib' else data
+        except Exception:
+            return None
+
+    def touch(self, key: str):
+        conn = self._connect()
+        conn.execute('UPDATE http_cache SET last_access = ?, hits = hits + 1 WHERE cache_key = ?', (time.time(), key))
+        conn.commit()
+        conn.close()
+
+    def refresh(self, entry: Dict, headers) -> Dict:
+        """Merge a 304's headers into the entry and restart its freshness"""
+        merged = CaseInsensitiveDict(entry['headers'])
+        for name, value in headers.items():
+            if name.lower() not in _DROPPED_HEADERS:
+                merged[name] = value
+        now = time.time()
+        entry['headers'] = dict(merged)
+        entry['fresh_until'] = now + freshness_lifetime(merged)
+        conn = self._connect()
+        conn.execute('''
+            UPDATE http_cache SET headers = ?, fresh_until = ?, stored_at = ?, last_access = ?, hits = hits + 1
+            WHERE cache_key = ?
+        ''', (json.dumps(entry['headers']), entry['fresh_until'], now, now, entry['key']))
+        conn.commit()
+        conn.close()
+        return entry
+
+    def store(self, key: str, method: str, url: str, status: int, headers, vary: Dict, body: bytes) -> bool:
+        dropped = _HEAD_DROPPED_HEADERS if method == 'HEAD' else _DROPPED_HEADERS
+        stored_headers = {name: value for name, value in headers.items() if name.lower() not in dropped}
+        content_type = headers.get('Content-Type', '').lower()
+        data, encoding = body, 'identity'
+        if body and not content_type.startswith(_COMPRESSED_TYPES):
+            compressed = zlib.compress(body, 6)
+            if len(compressed) < len(body):
+                data, encoding = compressed, 'zlib'
+
+        path = self._body_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except Exception as e:
+            logger.debug(f"HTTP cache write failed for {url}: {e}")
+            return False
+
+        now = time.time()
+        conn = self._connect()
+        conn.execute('''
+            INSERT OR REPLACE INTO http_cache
+            (cache_key, method, url, status, headers, vary, encoding, size, stored_at, fresh_until, last_access, hits)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+        ''', (key, method, url, status, json.dumps(stored_headers), json.dumps(vary) if vary else None,
+              encoding, len(data), now, now + freshness_lifetime(headers), now))
+        conn.commit()
+        conn.close()
+        self._evict_if_needed()
+        return True
+
+    def delete(self, key: str):
+        conn = self._connect()
+        conn.execute('DELETE FROM http_cache WHERE cache_key = ?', (key,))
+        conn.commit()
+        conn.close()
+        try:
+            self._body_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict_if_needed(self):
+        """Least recently used entries go first, down to 90% of the cap"""
+        with self._lock:
+            conn = self._connect()
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+            if total <= self.max_bytes:
+                conn.close()
+                return
+            target = self.max_bytes * 0.9
+            victims = []
+            for key, size in conn.execute('SELECT cache_key, size FROM http_cache ORDER BY last_access'):
+                if total <= target:
+                    break
+                victims.append(key)
+                total -= size
+            conn.executemany('DELETE FROM http_cache WHERE cache_key = ?', [(key,) for key in victims])
+            conn.commit()
+            conn.close()
+        for key in victims:
+            try:
+                self._body_path(key).unlink()
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._stats['evicted'] += len(victims)
+        metrics.count('http_cache_evicted', len(victims), stage='http')
+        logger.info(f"🧹 HTTP cache: evicted {len(victims)} entries")
+
+    def clear(self):
+        conn = self._connect()
+        keys = [row[0] for row in conn.execute('SELECT cache_key FROM http_cache')]
+        conn.execute('DELETE FROM http_cache')
+        conn.commit()
+        conn.close()
+        for key in keys:
+            try:
+                self._body_path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that answers GET/HEAD from the HTTP cache when allowed"""
+
+    def __init__(self, cache: Optional[HTTPCache] = None, service: str = 'http', **kwargs):
+        self.cache = cache
+        self.service = service
+        super().__init__(**kwargs)
+
+    def _bypass(self, request, stream: bool, **kwargs):
+        if self.cache:
+            self.cache.count('bypassed', self.service)
+        return super().send(request, stream=stream, **kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        cache = self.cache
+        if (cache is None or request.method not in ('GET', 'HEAD')
+                or 'Authorization' in request.headers):
+            return super().send(request, stream=stream, **kwargs)
+
+        request_directives = parse_cache_control(request.headers.get('Cache-Control'))
+        if 'no-store' in request_directives:
+            return self._bypass(request, stream, **kwargs)
+
+        key = cache.cache_key(request.method, request.url)
+        entry = cache.lookup(key)
+        if entry and any(request.headers.get(name) != value for name, value in entry['vary'].items()):
+            entry = None
+        body = cache.read_body(entry) if entry else None
+        if entry and body is None:
+            entry = None
+
+        if entry:
+            fresh = entry['fresh_until'] > time.time() and 'no-cache' not in request_directives
+            if fresh:
+                cache.touch(key)
+                cache.count('hits', self.service)
+                return self._cached_response(request, entry, body)
+            validators = entry['headers']
+            if validators.get('ETag'):
+                request.headers['If-None-Match'] = validators['ETag']
+            if validators.get('Last-Modified'):
+                request.headers['If-Modified-Since'] = validators['Last-Modified']
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if entry and response.status_code == 304:
+            response.close()
+            entry = cache.refresh(entry, response.headers)
+            cache.count('revalidated', self.service)
+            return self._cached_response(request, entry, body)
+
+        cache.count('misses', self.service)
+        if self._storable(response):
+            length = response.headers.get('Content-Length')
+            if stream and not (length and length.isdigit() and int(length) <= MAX_ENTRY_BYTES):
+                return response
+            content = response.content
+            if stream:
+                # The body is buffered now - stream=True callers reading .raw get the same bytes
+                response.raw = io.BytesIO(content)
+            if len(content) <= MAX_ENTRY_BYTES:
+                vary = {name.strip(): request.headers.get(name.strip())
+                        for name in response.headers.get('Vary', '').split(',') if name.strip()}
+                if cache.store(key, request.method, request.url, response.status_code, response.headers,
+                               vary, content):
+                    cache.count('stored', self.service)
+        return response
+
+    @staticmethod
+    def _storable(response) -> bool:
+        if response.status_code not in CACHEABLE_STATUSES:
+            return False
+        directives = parse_cache_control(response.headers.get('Cache-Control'))
+        if 'no-store' in directives or response.headers.get('Vary', '').strip() == '*':
+            return False
+        # Worth keeping only if it can be reused as-is or revalidated cheaply
+        return (freshness_lifetime(response.headers) > 0 or 'ETag' in response.headers
+                or 'Last-Modified' in response.headers)
+
+    def _cached_response(self, request, entry: Dict, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        if entry['method'] != 'HEAD':
+            response.headers['Content-Length'] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        response.reason = 'OK (cached)' if entry['status'] == 200 else 'Cached'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+
+_cache: Optional[HTTPCache] = None
+_cache_loaded = False
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[HTTPCache]:
+    """Process-wide cache (None if disabled in config.json or not writable)"""
+    global _cache, _cache_loaded
+    with _cache_lock:
+        if not _cache_loaded:
+            _cache_loaded = True
+            settings = _load_settings()
+            if settings.get('http_cache_enabled', True):
+                try:
+                    _cache = HTTPCache(settings.get('http_cache_dir', DEFAULT_CACHE_DIR),
+                                       int(float(settings.get('http_cache_max_mb', DEFAULT_MAX_MB)) * 1024 * 1024))
+                except Exception as e:
+                    logger.warning(f"HTTP cache disabled: {e}")
+        return _cache
+
+
+def set_cache(cache: Optional[HTTPCache]):
+    """Use another cache for sessions created from now on (None disables caching)"""
+    global _cache, _cache_loaded
+    with _cache_lock:
+        _cache, _cache_loaded = cache, True
+
+
+def mount_cache(session: requests.Session, service: str, **adapter_kwargs) -> requests.Session:
+    """Route a session's http(s) traffic through the shared cache"""
+    adapter = CachingAdapter(get_cache(), service=service, **adapter_kwargs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def cached_session(service: str, stage: str = 'other', user_agent: Optional[str] = None,
+                   **adapter_kwargs) -> requests.Session:
+    """New session using the shared cache, with metrics"""
+    session = mount_cache(requests.Session(), service, **adapter_kwargs)
+    if user_agent:
+        session.headers.update({'User-Agent': user_agent})
+    metrics.instrument_session(session, stage=stage, service=service)
+    return session
@@ -0,0 +1,391 @@
+"""
+Image Store Module - Content-addressed local image cache
+Stores downloaded images once per content hash, shared by the AI Writer,
+Vision AI and the WordPress uploaders.
+
+FEATURES:
+✅ Files stored as downloaded_images/<h[:2]>/<sha256>.<ext> (streamed, hashed on the fly)
+✅ No re-encoding - only formats browsers/WordPress can't use are converted
+✅ SQLite index: url → hash → path
+✅ Size-capped LRU eviction that never removes images referenced by ai_drafts
+"""
+
+import os
+import sqlite3
+import logging
+import hashlib
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+
+from core.http_cache import cached_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_STORE_BYTES = 500 * 1024 * 1024  # 500 MB
+
+# Recently used entries are never evicted (they may be mid-upload/analysis)
+EVICTION_GRACE = timedelta(minutes=10)
+
+# Magic bytes of formats stored as-is
+_WEB_FORMATS = [
+    (b'\xff\xd8\xff', 'jpg', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png', 'image/png'),
+    (b'GIF87a', 'gif', 'image/gif'),
+    (b'GIF89a', 'gif', 'image/gif'),
+]
+
+MIME_TYPES = {
+    'jpg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+}
+
+
+def sniff_image_format(header: bytes) -> Optional[tuple]:
+    """Return (ext, mime) for web image formats from the first bytes of a file"""
+    for magic, ext, mime in _WEB_FORMATS:
+        if header.startswith(magic):
+            return ext, mime
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp', 'image/webp'
+    return None
+
+
+class ImageStore:
+    """Content-addressed image store with a SQLite index and LRU eviction"""
+
+    def __init__(self, db_path: str = 'nexuzy.db', root: str = 'downloaded_images',
+                 max_bytes: int = DEFAULT_MAX_STORE_BYTES, session: Optional[requests.Session] = None):
+        self.db_path = db_path
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.session = session or cached_session('images', stage='images')
+        self.session.headers.setdefault('User-Agent', 'Mozilla/5.0')
+        self._evict_lock = threading.Lock()
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure image_store, image_urls and image_refs tables exist"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS image_store (
+                    content_hash TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mime_type TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_access TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS image_urls (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS image_refs (
+                    draft_id INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    PRIMARY KEY (draft_id, content_hash)
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_image_store_access ON image_store(last_access)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_image_urls_hash ON image_urls(content_hash)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_image_refs_hash ON image_refs(content_hash)')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not create image store tables: {e}")
+
+    def _path_for(self, content_hash: str, ext: str) -> Path:
+        return self.root / content_hash[:2] / f"{content_hash}.{ext}"
+
+    def _row_to_entry(self, row) -> Dict:
+        return {'hash': row[0], 'path': row[1], 'size': row[2], 'mime_type': row[3]}
+
+    def _touch(self, cursor, content_hash: str):
+        cursor.execute('UPDATE image_store SET last_access = ? WHERE content_hash = ?',
+                       (datetime.now().isoformat(), content_hash))
+
+    def lookup_url(self, url: str) -> Optional[Dict]:
+        """Get the stored entry for a URL if its file is still on disk"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT s.content_hash, s.path, s.size, s.mime_type
+                FROM image_urls u JOIN image_store s ON s.content_hash = u.content_hash
+                WHERE u.url = ?
+            ''', (url,))
+            row = cursor.fetchone()
+            if row and os.path.exists(row[1]):
+                self._touch(cursor, row[0])
+                conn.commit()
+                conn.close()
+                return self._row_to_entry(row)
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Image store lookup failed: {e}")
+        return None
+
+    def lookup_hash(self, content_hash: str) -> Optional[Dict]:
+        """Get the stored entry for a content hash"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT content_hash, path, size, mime_type FROM image_store WHERE content_hash = ?', (content_hash,))
+            row = cursor.fetchone()
+            if row and os.path.exists(row[1]):
+                self._touch(cursor, row[0])
+                conn.commit()
+                conn.close()
+                return self._row_to_entry(row)
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Image store lookup failed: {e}")
+        return None
+
+    def fetch(self, url: str, timeout: int = 15) -> Optional[Dict]:
+        """
+        Get an image by URL, downloading it only if not already stored
+
+        Returns:
+            Dict with hash, path, size and mime_type - or None on failure
+        """
+        if not url or not url.startswith('http'):
+            return None
+
+        cached = self.lookup_url(url)
+        if cached:
+            logger.info(f"⚡ Image from local store: {cached['path']}")
+            return cached
+
+        try:
+            logger.info(f"Downloading image: {url}")
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to download image: HTTP {response.status_code}")
+                    return None
+                return self.add_stream(response.iter_content(chunk_size=64 * 1024), source_url=url)
+        except Exception as e:
+            logger.error(f"Error downloading image: {e}")
+            return None
+
+    def add_file(self, file_path: str) -> Optional[Dict]:
+        """Store a local image file (copied, not moved)"""
+        try:
+            with open(file_path, 'rb') as f:
+                return self.add_stream(iter(lambda: f.read(64 * 1024), b''))
+        except Exception as e:
+            logger.error(f"Error storing image {file_path}: {e}")
+            return None
+
+    def add_stream(self, chunks, source_url: Optional[str] = None) -> Optional[Dict]:
+        """
+        Store an image from an iterable of byte chunks
+
+        The bytes are hashed while being written to a temp file, then moved to
+        their content address. Formats that aren't web formats are converted.
+
+        Args:
+            chunks: Iterable of bytes
+            source_url: URL the bytes came from (indexed for later lookups)
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        sha = hashlib.sha256()
+        header = b''
+        size = 0
+
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if len(header) < 16:
+                        header += chunk[:16 - len(header)]
+                    sha.update(chunk)
+                    temp_file.write(chunk)
+                    size += len(chunk)
+
+            if not size:
+                return None
+
+            content_hash = sha.hexdigest()
+            existing = self.lookup_hash(content_hash)
+            if existing:
+                if source_url:
+                    self._record_url(source_url, content_hash)
+                return existing
+
+            detected = sniff_image_format(header)
+            if detected:
+                ext, mime_type = detected
+            else:
+                converted = self._convert_to_web_format(temp_path)
+                if not converted:
+                    return None
+                ext, mime_type = converted
+                size = os.path.getsize(temp_path)
+
+            final_path = self._path_for(content_hash, ext)
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, final_path)
+
+            entry = {'hash': content_hash, 'path': str(final_path), 'size': size, 'mime_type': mime_type}
+            self._record_entry(entry)
+            if source_url:
+                self._record_url(source_url, content_hash)
+            logger.info(f"✅ Image stored: {final_path}")
+
+            self.evict_if_needed()
+            return entry
+
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _convert_to_web_format(self, path: str) -> Optional[tuple]:
+        """Re-encode non-web formats (BMP, TIFF, ...) in place as PNG or JPEG"""
+        try:
+            from PIL import Image
+            with Image.open(path) as img:
+                img.load()
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    ext, fmt, converted = 'png', 'PNG', img.convert('RGBA')
+                else:
+                    ext, fmt, converted = 'jpg', 'JPEG', img.convert('RGB')
+            converted.save(path, fmt)
+            return ext, MIME_TYPES[ext]
+        except Exception as e:
+            logger.error(f"Downloaded file is not a usable image: {e}")
+            return None
+
+    def _record_entry(self, entry: Dict):
+        now = datetime.now().isoformat()
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO image_store (content_hash, path, size, mime_type, created_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (entry['hash'], entry['path'], entry['size'], entry['mime_type'], now, now))
+        conn.commit()
+        conn.close()
+
+    def _record_url(self, url: str, content_hash: str):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO image_urls (url, content_hash, fetched_at) VALUES (?, ?, ?)
+            ''', (url, content_hash, datetime.now().isoformat()))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Could not record image URL: {e}")
+
+    def add_reference(self, draft_id: int, path_or_hash: str):
+        """Pin a stored image to a draft so eviction keeps it"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT content_hash FROM image_store WHERE content_hash = ? OR path = ?',
+                           (path_or_hash, path_or_hash))
+            row = cursor.fetchone()
+            if row:
+                cursor.execute('INSERT OR IGNORE INTO image_refs (draft_id, content_hash) VALUES (?, ?)', (draft_id, row[0]))
+                conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Could not add image reference: {e}")
+
+    def get_stats(self) -> Dict:
+        """Total stored files and bytes"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM image_store')
+            count, total = cursor.fetchone()
+            conn.close()
+            return {'images': count, 'bytes': total, 'max_bytes': self.max_bytes}
+        except Exception as e:
+            logger.error(f"Error getting image store stats: {e}")
+            return {}
+
+    def evict_if_needed(self) -> int:
+        """
+        Delete least recently used images until the store fits in max_bytes
+
+        Images referenced by an existing draft (through image_refs or the
+        draft's image_url) are kept regardless of age.
+
+        Returns:
+            Bytes freed
+        """
+        if not self.max_bytes:
+            return 0
+
+        with self._evict_lock:
+            try:
+                conn = sqlite3.connect(self.db_path)
+                cursor = conn.cursor()
+                cursor.execute('SELECT COALESCE(SUM(size), 0) FROM image_store')
+                total = cursor.fetchone()[0]
+
+                if total <= self.max_bytes:
+                    conn.close()
+                    return 0
+
+                grace_cutoff = (datetime.now() - EVICTION_GRACE).isoformat()
+                cursor.execute('''
+                    SELECT s.content_hash, s.path, s.size FROM image_store s
+                    WHERE COALESCE(s.last_access, s.created_at) < ?
+                      AND NOT EXISTS (
+                          SELECT 1 FROM image_refs r JOIN ai_drafts d ON d.id = r.draft_id
+                          WHERE r.content_hash = s.content_hash
+                      )
+                      AND NOT EXISTS (
+                          SELECT 1 FROM image_urls u JOIN ai_drafts d ON d.image_url = u.url
+                          WHERE u.content_hash = s.content_hash
+                      )
+                    ORDER BY COALESCE(s.last_access, s.created_at) ASC
+                ''', (grace_cutoff,))
+                candidates = cursor.fetchall()
+
+                freed = 0
+                evicted = []
+                for content_hash, path, size in candidates:
+                    if total - freed <= self.max_bytes:
+                        break
+                    try:
+                        if os.path.exists(path):
+                            os.remove(path)
+                    except OSError as e:
+                        logger.debug(f"Could not delete {path}: {e}")
+                        continue
+                    freed += size
+                    evicted.append(content_hash)
+
+                if evicted:
+                    cursor.executemany('DELETE FROM image_store WHERE content_hash = ?', [(h,) for h in evicted])
+                    cursor.executemany('DELETE FROM image_urls WHERE content_hash = ?', [(h,) for h in evicted])
+                    cursor.executemany('DELETE FROM image_refs WHERE content_hash = ?', [(h,) for h in evicted])
+                    conn.commit()
+                    logger.info(f"🧹 Image store: evicted {len(evicted)} images ({freed / 1024 / 1024:.1f} MB)")
+
+                conn.close()
+                return freed
+
+            except Exception as e:
+                logger.error(f"Image store eviction failed: {e}")
+                return 0
@@ -0,0 +1,449 @@
+"""
+Metrics Module - Timing spans, counters and a local metrics surface
+Lightweight instrumentation for the desk's stages: feed fetches, DB queries,
+model calls, HTTP calls and post-processing.
+
+    from core import metrics
+
+    with metrics.span('llm_generate', stage='draft') as s:
+        text = llm(prompt)
+        s.count('llm_tokens_out', len(text.split()))
+
+FEATURES:
+✅ Context-manager spans (duration histogram, error status, counters)
+✅ Counters and value observations (e.g. tokens/sec)
+✅ Rolling SQLite table (metrics_samples, default 7 days) written in batches
+✅ Per-stage p50/p95 summaries for the Performance page
+✅ Prometheus text exposition on an optional localhost port
+✅ Standard library only; a no-op cost when nothing reads the numbers
+"""
+
+import atexit
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 7
+FLUSH_INTERVAL_SECONDS = 10.0
+FLUSH_BATCH_SIZE = 500
+MAX_BUFFERED_SAMPLES = 20000
+
+# Seconds - from a DB lookup to a long LLM generation
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+VALUE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+_PREFIX = 'nexuzy_'
+
+# Model-call spans and the tokens/sec observation recorded next to them
+TOKEN_RATES = {
+    'llm_generate': 'llm_tokens_per_second',
+    'nllb_generate': 'nllb_tokens_per_second',
+}
+
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets: Tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+
+class Span:
+    """Timing of one operation; use through metrics.span()"""
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, stage: str, labels: Dict):
+        self.registry = registry
+        self.name = name
+        self.stage = stage
+        self.labels = labels
+        self.status = 'ok'
+        self.seconds = 0.0
+        self._start = 0.0
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Counter recorded with this span's stage (e.g. tokens in/out)"""
+        self.registry.count(name, value, stage=self.stage, **labels)
+
+    def observe(self, name: str, value: float, **labels):
+        self.registry.observe(name, value, stage=self.stage, **labels)
+
+    def set_status(self, status: str):
+        self.status = status
+
+    def __enter__(self) -> 'Span':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.status = 'error'
+        self.registry.record_span(self)
+        return False
+
+
+class MetricsRegistry:
+    """In-memory aggregates for Prometheus plus a buffered SQLite sample log"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], _Histogram] = {}
+        self._buffer: List[Tuple] = []
+        self.db_path: Optional[str] = None
+        self.retention_days = DEFAULT_RETENTION_DAYS
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._last_prune = 0.0
+        self._exporter: Optional[ThreadingHTTPServer] = None
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def span(self, name: str, stage: str = 'other', **labels) -> Span:
+        return Span(self, name, stage, labels)
+
+    def record_span(self, span: Span):
+        labels = {'span': span.name, 'stage': span.stage, 'status': span.status, **span.labels}
+        self._observe_histogram('span_seconds', span.seconds, labels, DURATION_BUCKETS)
+        self._log('span', span.name, span.stage, span.seconds, span.status, span.labels)
+
+    def count(self, name: str, value: float = 1, stage: str = 'other', **labels):
+        key = (name, _label_key({'stage': stage, **labels}))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+        self._log('counter', name, stage, value, None, labels)
+
+    def observe(self, name: str, value: float, stage: str = 'other', buckets: Tuple = VALUE_BUCKETS, **labels):
+        """Distribution of a value that is not a duration (tokens/sec, bytes, items)"""
+        self._observe_histogram(name, value, {'stage': stage, **labels}, buckets)
+        self._log('value', name, stage, value, None, labels)
+
+    def _observe_histogram(self, name: str, value: float, labels: Dict, buckets: Tuple):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def _log(self, kind: str, name: str, stage: str, value: float, status: Optional[str], labels: Dict):
+        if not self.db_path:
+            return
+        row = (time.time(), kind, name, stage, float(value), status,
+               json.dumps(labels, sort_keys=True, default=str) if labels else None)
+        with self._lock:
+            if len(self._buffer) < MAX_BUFFERED_SAMPLES:
+                self._buffer.append(row)
+            full = len(self._buffer) >= FLUSH_BATCH_SIZE
+        if full:
+            self._wake_flusher()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def configure(self, db_path: str, retention_days: float = DEFAULT_RETENTION_DAYS):
+        """Start persisting samples to db_path (table metrics_samples)"""
+        self.db_path = db_path
+        self.retention_days = retention_days
+        try:
+            conn = sqlite3.connect(db_path, timeout=30)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metrics_samples (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    kind TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    stage TEXT,
+                    value REAL,
+                    status TEXT,
+                    labels TEXT
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_samples_ts ON metrics_samples(ts)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_samples_name ON metrics_samples(kind, name, ts)')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not create metrics table: {e}")
+            self.db_path = None
+            return
+
+        if not (self._flusher and self._flusher.is_alive()):
+            self._stop_event.clear()
+            self._flusher = threading.Thread(target=self._run_flusher, name='metrics-flush', daemon=True)
+            self._flusher.start()
+            atexit.register(self.stop_flusher)
+
+    def _wake_flusher(self):
+        self._wake_event.set()
+
+    def _run_flusher(self):
+        while not self._stop_event.is_set():
+            self._wake_event.wait(FLUSH_INTERVAL_SECONDS)
+            self._wake_event.clear()
+            self.flush()
+
+    def stop_flusher(self, timeout: float = 5.0):
+        """Stop the background flusher and write what is still buffered"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._flusher and self._flusher.is_alive() and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout)
+        self._flusher = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Write buffered samples in one transaction; prunes old rows hourly"""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if not rows or not self.db_path:
+            return 0
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO metrics_samples (ts, kind, name, stage, value, status, labels)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            now = time.time()
+            if now - self._last_prune > 3600:
+                cursor.execute('DELETE FROM metrics_samples WHERE ts < ?', (now - self.retention_days * 86400,))
+                self._last_prune = now
+            conn.commit()
+            conn.close()
+            return len(rows)
+        except Exception as e:
+            logger.debug(f"Metrics flush failed: {e}")
+            return 0
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def summary(self, hours: float = 24, db_path: Optional[str] = None) -> List[Dict]:
+        """
+        Per stage and span over the last `hours`: count, errors, p50, p95
+        (seconds), plus the median tokens/sec of model calls
+        """
+        db_path = db_path or self.db_path
+        if not db_path:
+            return []
+        self.flush()
+        since = time.time() - hours * 3600
+        try:
+            conn = sqlite3.connect(db_path, timeout=30)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT stage, name, value, status FROM metrics_samples
+                WHERE kind = 'span' AND ts >= ? ORDER BY stage, name
+            ''', (since,))
+            spans = cursor.fetchall()
+            cursor.execute(f'''
+                SELECT name, value FROM metrics_samples
+                WHERE kind = 'value' AND name IN ({','.join('?' * len(TOKEN_RATES))}) AND ts >= ?
+            ''', (*TOKEN_RATES.values(), since))
+            rates = cursor.fetchall()
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Metrics summary failed: {e}")
+            return []
+
+        grouped: Dict[Tuple[str, str], List] = {}
+        for stage, name, value, status in spans:
+            grouped.setdefault((stage, name), []).append((value, status))
+        token_rates: Dict[str, List[float]] = {}
+        for name, value in rates:
+            token_rates.setdefault(name, []).append(value)
+
+        result = []
+        for (stage, name), samples in grouped.items():
+            values = sorted(value for value, _ in samples)
+            rates = sorted(token_rates.get(TOKEN_RATES.get(name), []))
+            result.append({
+                'stage': stage,
+                'span': name,
+                'count': len(values),
+                'errors': sum(1 for _, status in samples if status == 'error'),
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'total': sum(values),
+                'tokens_per_second': percentile(rates, 50),
+            })
+        return result
+
+    def render_prometheus(self) -> str:
+        """Counters and histograms in the Prometheus text format"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (h.buckets, list(h.counts), h.total, h.count) for key, h in self._histograms.items()}
+
+        def fmt(labels: Tuple, extra: Tuple = ()) -> str:
+            items = list(labels) + list(extra)
+            if not items:
+                return ''
+            return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in items) + '}'
+
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            metric = _PREFIX + name + '_total'
+            lines.append(f'# TYPE {metric} counter')
+            for (counter_name, labels), value in sorted(counters.items()):
+                if counter_name == name:
+                    lines.append(f'{metric}{fmt(labels)} {value:g}')
+        for name in sorted({name for name, _ in histograms}):
+            metric = _PREFIX + name
+            lines.append(f'# TYPE {metric} histogram')
+            for (histogram_name, labels), (buckets, counts, total, count) in sorted(histograms.items()):
+                if histogram_name != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{fmt(labels, (("le", f"{bound:g}"),))} {cumulative}')
+                lines.append(f'{metric}_bucket{fmt(labels, (("le", "+Inf"),))} {count}')
+                lines.append(f'{metric}_sum{fmt(labels)} {total:.6f}')
+                lines.append(f'{metric}_count{fmt(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+    # ------------------------------------------------------------------
+    # Prometheus endpoint
+    # ------------------------------------------------------------------
+
+    def start_exporter(self, port: int, host: str = '127.0.0.1') -> Optional[str]:
+        """Serve /metrics on host:port (localhost only by default); returns the URL"""
+        if self._exporter:
+            return f"http://{host}:{self._exporter.server_address[1]}/metrics"
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        try:
+            self._exporter = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+            return None
+        self._exporter.daemon_threads = True
+        threading.Thread(target=self._exporter.serve_forever, name='metrics-exporter', daemon=True).start()
+        url = f"http://{host}:{self._exporter.server_address[1]}/metrics"
+        logger.info(f"📈 Prometheus metrics on {url}")
+        return url
+
+    def stop_exporter(self):
+        if self._exporter:
+            self._exporter.shutdown()
+            self._exporter.server_close()
+            self._exporter = None
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, math.ceil(pct * len(values) / 100.0) - 1))
+    return values[index]
+
+
+def load_metrics_port() -> Optional[int]:
+    """metrics_port from config.json (None = endpoint disabled)"""
+    try:
+        config_path = Path('config.json')
+        if config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                port = json.load(f).get('metrics_port')
+            return int(port) if port else None
+    except Exception as e:
+        logger.debug(f"Could not load metrics_port from config.json: {e}")
+    return None
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry
+# ----------------------------------------------------------------------
+
+registry = MetricsRegistry()
+
+
+def span(name: str, stage: str = 'other', **labels) -> Span:
+    """Time a block: `with metrics.span('feed_fetch', stage='fetch'):`"""
+    return registry.span(name, stage, **labels)
+
+
+def count(name: str, value: float = 1, stage: str = 'other', **labels):
+    registry.count(name, value, stage=stage, **labels)
+
+
+def observe(name: str, value: float, stage: str = 'other', **labels):
+    registry.observe(name, value, stage=stage, **labels)
+
+
+def configure(db_path: str, retention_days: float = DEFAULT_RETENTION_DAYS, port: Optional[int] = None):
+    """Persist samples to db_path and optionally serve Prometheus text on localhost:port"""
+    registry.configure(db_path, retention_days)
+    if port:
+        registry.start_exporter(port)
+
+
+def instrument_session(session, stage: str, service: str):
+    """Record every response of a requests.Session as an http_request span"""
+    def on_response(response, *args, **kwargs):
+        try:
+            seconds = response.elapsed.total_seconds()
+            method = response.request.method if response.request is not None else 'GET'
+            status = 'ok' if response.status_code < 400 else 'error'
+            labels = {'service': service, 'method': method, 'code': response.status_code,
+                      'cache': 'hit' if getattr(response, 'from_cache', False) else 'miss'}
+            registry._observe_histogram('span_seconds', seconds,
+                                        {'span': 'http_request', 'stage': stage, 'status': status, **labels},
+                                        DURATION_BUCKETS)
+            registry._log('span', 'http_request', stage, seconds, status, labels)
+        except Exception as e:
+            logger.debug(f"HTTP metrics hook failed: {e}")
+        return response
+
+    session.hooks.setdefault('response', []).append(on_response)
+    return session
@@ -0,0 +1,406 @@
+"""
+Model Registry - Keeps the desk's AI models within a RAM budget
+One place that owns every large model (GGUF writer, flan-t5, LanguageTool,
+NLLB-200, MiniLM) instead of per-module globals that are never released.
+
+    from core.model_registry import models
+
+    models.register('llm', load_llm, size_mb=4800, display_name='Mistral-7B (GGUF)')
+    with models.use('llm') as llm:      # pinned: never unloaded mid-call
+        text = llm(prompt)
+
+FEATURES:
+✅ Load on first use, reload on demand after an unload
+✅ Availability answered without loading (is_available + cheap per-model checks)
+✅ Memory budget (config.json model_memory_budget_mb, default: RAM - 3 GB)
+✅ Per-model size estimates; least recently used idle models make room first
+✅ Reference counting - a model in use is never unloaded
+✅ Idle unloading after model_idle_unload_minutes (default 15)
+✅ Status for the Settings page (loaded, size, in use, idle time)
+"""
+
+import gc
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_MINUTES = 15
+RESERVED_MB = 3072          # left for the OS, Tk, SQLite and the browser beside the desk
+MIN_BUDGET_MB = 2048
+REAPER_INTERVAL_SECONDS = 30
+
+
+def total_memory_mb() -> Optional[int]:
+    """Physical RAM in MB (None if it cannot be read)"""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                            ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                            ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                            ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                            ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return int(status.ullTotalPhys // (1024 * 1024))
+        return int(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024))
+    except Exception:
+        return None
+
+
+def module_available(name: str) -> bool:
+    """True if a package can be imported (checked without importing it)"""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _load_settings() -> Dict:
+    """Budget and idle timeout from config.json, overridden by environment variables"""
+    settings = {}
+    try:
+        config_path = Path('config.json')
+        if config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            settings['budget_mb'] = config.get('model_memory_budget_mb')
+            settings['idle_minutes'] = config.get('model_idle_unload_minutes')
+    except Exception as e:
+        logger.debug(f"Could not load model settings from config.json: {e}")
+    if os.environ.get('NEXUZY_MODEL_BUDGET_MB'):
+        settings['budget_mb'] = os.environ['NEXUZY_MODEL_BUDGET_MB']
+    if os.environ.get('NEXUZY_MODEL_IDLE_MINUTES'):
+        settings['idle_minutes'] = os.environ['NEXUZY_MODEL_IDLE_MINUTES']
+    return settings
+
+
+def _release_memory():
+    """Collect the dropped model and hand freed pages back to the OS where possible"""
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
+    if sys.platform.startswith('linux'):
+        try:
+            import ctypes
+            ctypes.CDLL('libc.so.6').malloc_trim(0)
+        except Exception:
+            pass
+
+
+class _Entry:
+    def __init__(self, name: str, loader: Callable, size_mb: Union[float, Callable], display_name: str,
+                 unloader: Optional[Callable], check: Optional[Callable[[], bool]] = None):
+        self.name = name
+        self.loader = loader
+        self.check = check
+        self.size_estimate = size_mb
+        self.display_name = display_name
+        self.unloader = unloader
+        self.model = None
+        self.size_mb = 0.0
+        self.refs = 0
+        self.loads = 0
+        self.unloads = 0
+        self.last_used = 0.0
+        self.load_seconds = 0.0
+        self.error: Optional[str] = None
+        self.load_lock = threading.Lock()
+
+    def estimate_mb(self) -> float:
+        try:
+            value = self.size_estimate() if callable(self.size_estimate) else self.size_estimate
+            return float(value or 0)
+        except Exception:
+            return 0.0
+
+
+class ModelRegistry:
+    """Budgeted, reference-counted cache of loaded models"""
+
+    def __init__(self, budget_mb: Optional[float] = None, idle_minutes: Optional[float] = None):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._reaper: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        settings = _load_settings()
+        self.budget_mb = self._resolve_budget(budget_mb if budget_mb is not None else settings.get('budget_mb'))
+        idle = idle_minutes if idle_minutes is not None else settings.get('idle_minutes')
+        self.idle_seconds = float(idle if idle is not None else DEFAULT_IDLE_MINUTES) * 60
+
+    @staticmethod
+    def _resolve_budget(budget_mb) -> float:
+        if budget_mb:
+            return float(budget_mb)
+        total = total_memory_mb()
+        if not total:
+            return 6144.0
+        return float(max(MIN_BUDGET_MB, total - RESERVED_MB))
+
+    def configure(self, budget_mb: Optional[float] = None, idle_minutes: Optional[float] = None):
+        """Change the budget or idle timeout at runtime (0 minutes disables idle unloading)"""
+        if budget_mb is not None:
+            self.budget_mb = self._resolve_budget(budget_mb)
+        if idle_minutes is not None:
+            self.idle_seconds = float(idle_minutes) * 60
+        self._make_room(0)
+
+    # ------------------------------------------------------------------
+    # Registration and access
+    # ------------------------------------------------------------------
+
+    def register(self, name: str, loader: Callable, size_mb: Union[float, Callable] = 0,
+                 display_name: Optional[str] = None, unloader: Optional[Callable] = None,
+                 check: Optional[Callable[[], bool]] = None, replace: bool = False):
+        """
+        Declare a model; nothing is loaded until it is first used
+
+        Args:
+            loader: returns the model, or None if it is unavailable
+            size_mb: resident size estimate (number, or callable evaluated at load time)
+            unloader: called with the model on unload (default: model.close() if present)
+            check: cheap test that the model could load (file present, package
+                installed) - used by is_available() instead of loading it
+            replace: swap out an existing registration (unloads the old model)
+        """
+        old = None
+        with self._lock:
+            existing = self._entries.get(name)
+            if existing and not replace:
+                return
+            if existing:
+                old, existing.model = existing.model, None
+            self._entries[name] = _Entry(name, loader, size_mb, display_name or name, unloader, check)
+        if old is not None and existing:
+            self._dispose(existing, old)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._entries
+
+    def get(self, name: str):
+        """The model, loading it if needed; None if it is not available"""
+        entry = self._entries.get(name)
+        if not entry:
+            return None
+        with self._lock:
+            if entry.model is not None:
+                entry.last_used = time.time()
+                return entry.model
+            if entry.error:
+                return None
+
+        with entry.load_lock:
+            with self._lock:
+                if entry.model is not None:
+                    entry.last_used = time.time()
+                    return entry.model
+            return self._load(entry)
+
+    @contextmanager
+    def use(self, name: str):
+        """Pin a model for the duration of a call: `with models.use('llm') as llm:`"""
+        entry = self._entries.get(name)
+        if not entry:
+            yield None
+            return
+        with self._lock:
+            entry.refs += 1
+        try:
+            yield self.get(name)
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                entry.last_used = time.time()
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return bool(entry and entry.model is not None)
+
+    def is_available(self, name: str) -> bool:
+        """Loaded, or loadable as far as can be told without loading it"""
+        entry = self._entries.get(name)
+        return bool(entry) and self._available(entry)
+
+    @staticmethod
+    def _available(entry: _Entry) -> bool:
+        if entry.error:
+            return False
+        if entry.model is not None or entry.check is None:
+            return True
+        try:
+            return bool(entry.check())
+        except Exception:
+            return False
+
+    def retry(self, name: str):
+        """Forget a failed load so the next get() tries again"""
+        entry = self._entries.get(name)
+        if entry:
+            entry.error = None
+
+    def _load(self, entry: _Entry):
+        size_mb = entry.estimate_mb()
+        self._make_room(size_mb, exclude=entry.name)
+        start = time.perf_counter()
+        try:
+            with metrics.span('model_load', stage='models', model=entry.name):
+                model = entry.loader()
+        except Exception as e:
+            logger.error(f"❌ Loading {entry.display_name} failed: {e}")
+            model = None
+        seconds = time.perf_counter() - start
+
+        with self._lock:
+            if model is None:
+                entry.error = 'not available'
+                return None
+            entry.model = model
+            entry.size_mb = size_mb
+            entry.loads += 1
+            entry.load_seconds = seconds
+            entry.last_used = time.time()
+            used = self._used_mb()
+        if entry.loads > 1:
+            logger.info(f"♻️ Reloaded {entry.display_name} in {seconds:.1f}s")
+        logger.info(f"🧠 Models resident: {used:,.0f} / {self.budget_mb:,.0f} MB")
+        self._ensure_reaper()
+        return model
+
+    # ------------------------------------------------------------------
+    # Unloading
+    # ------------------------------------------------------------------
+
+    def _used_mb(self) -> float:
+        return sum(e.size_mb for e in self._entries.values() if e.model is not None)
+
+    def _make_room(self, needed_mb: float, exclude: Optional[str] = None):
+        """Unload least recently used idle models until needed_mb fits the budget"""
+        victims = []
+        with self._lock:
+            used = self._used_mb()
+            if used + needed_mb > self.budget_mb:
+                idle = sorted((e for e in self._entries.values()
+                               if e.model is not None and e.refs == 0 and e.name != exclude),
+                              key=lambda e: e.last_used)
+                for entry in idle:
+                    if used + needed_mb <= self.budget_mb:
+                        break
+                    victims.append((entry, entry.model))
+                    entry.model = None
+                    used -= entry.size_mb
+            over = used + needed_mb > self.budget_mb
+        for entry, model in victims:
+            logger.info(f"📤 Unloading {entry.display_name} ({entry.size_mb:,.0f} MB) to stay within the memory budget")
+            self._dispose(entry, model)
+        if over and needed_mb:
+            logger.warning(f"⚠️ Model memory budget exceeded ({used + needed_mb:,.0f} / {self.budget_mb:,.0f} MB) "
+                           f"- the models in use cannot be unloaded")
+
+    def unload(self, name: str) -> bool:
+        """Unload one model now (refused while it is in use)"""
+        entry = self._entries.get(name)
+        if not entry:
+            return False
+        with self._lock:
+            if entry.model is None or entry.refs > 0:
+                return False
+            model, entry.model = entry.model, None
+        logger.info(f"📤 Unloaded {entry.display_name}")
+        self._dispose(entry, model)
+        return True
+
+    def unload_idle(self, max_idle_seconds: Optional[float] = None) -> List[str]:
+        """Unload every model unused for max_idle_seconds (default: the idle timeout)"""
+        max_idle = self.idle_seconds if max_idle_seconds is None else max_idle_seconds
+        now = time.time()
+        victims = []
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.model is not None and entry.refs == 0 and now - entry.last_used >= max_idle:
+                    victims.append((entry, entry.model))
+                    entry.model = None
+        for entry, model in victims:
+            logger.info(f"💤 Unloading idle {entry.display_name} (unused for {(now - entry.last_used) / 60:.0f} min)")
+            self._dispose(entry, model)
+        return [entry.name for entry, _ in victims]
+
+    def _dispose(self, entry: _Entry, model):
+        try:
+            if entry.unloader:
+                entry.unloader(model)
+            elif hasattr(model, 'close'):
+                model.close()
+        except Exception as e:
+            logger.debug(f"Unloading {entry.name}: {e}")
+        entry.unloads += 1
+        metrics.count('model_unloads', 1, stage='models', model=entry.name)
+        del model
+        _release_memory()
+
+    def _ensure_reaper(self):
+        if self._reaper and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(target=self._run_reaper, name='model-reaper', daemon=True)
+        self._reaper.start()
+
+    def _run_reaper(self):
+        while not self._stop_event.wait(REAPER_INTERVAL_SECONDS):
+            if self.idle_seconds > 0:
+                try:
+                    self.unload_idle()
+                except Exception as e:
+                    logger.error(f"❌ Idle model unloading failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def status(self) -> Dict:
+        """Budget, resident total and one row per registered model"""
+        now = time.time()
+        with self._lock:
+            rows = [{
+                'name': e.name,
+                'display_name': e.display_name,
+                'loaded': e.model is not None,
+                'available': self._available(e),
+                'size_mb': e.size_mb if e.model is not None else e.estimate_mb(),
+                'in_use': e.refs,
+                'idle_seconds': now - e.last_used if e.model is not None and e.refs == 0 else 0,
+                'loads': e.loads,
+                'unloads': e.unloads,
+                'load_seconds': e.load_seconds,
+            } for e in self._entries.values()]
+            used = self._used_mb()
+        return {
+            'budget_mb': self.budget_mb,
+            'used_mb': used,
+            'idle_unload_minutes': self.idle_seconds / 60,
+            'models': rows,
+        }
+
+
+# Process-wide registry shared by the writer, translator and news matcher
+models = ModelRegistry()
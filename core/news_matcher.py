@@ -8,15 +8,27 @@ import logging
 from typing import List, Dict, Tuple
 from pathlib import Path
 
+from core import metrics
+from core.model_registry import models, module_available
+
 logger = logging.getLogger(__name__)
 
+SENTENCE_TRANSFORMER_MB = 150  # all-MiniLM-L6-v2 with torch overhead
+
 class NewsMatchEngine:
     """Match and group same-event news items"""
     
     def __init__(self, db_path: str, model_name: str = 'sentence-transformers/all-MiniLM-L6-v2'):
         self.db_path = db_path
         self.model_name = model_name
-        self.model = self._load_model()
+        models.register('news_matcher', self._load_model, size_mb=SENTENCE_TRANSFORMER_MB,
+                        display_name=f"News Matcher ({model_name.split('/')[-1]})",
+                        check=lambda: module_available('sentence_transformers'))
+    
+    @property
+    def model(self):
+        """SentenceTransformer from the shared registry (reloaded if it was unloaded)"""
+        return models.get('news_matcher')
     
     def _load_model(self):
         """Load SentenceTransformer model"""
@@ -38,7 +50,7 @@ class NewsMatchEngine:
         Group headlines by similarity
         Returns dict: {group_id: [news_ids]}
         """
-        if not self.model:
+        if not models.is_available('news_matcher'):
             logger.warning("Model not loaded, skipping grouping")
             return {}
         
@@ -64,7 +76,13 @@ class NewsMatchEngine:
             
             # Encode headlines
             headlines = [item[1] for item in news_items]
-            embeddings = self.model.encode(headlines, convert_to_tensor=True)
+            with models.use('news_matcher') as model, metrics.span('embed_headlines', stage='group') as span:
+                if model is None:
+                    conn.close()
+                    logger.warning("Model not loaded, skipping grouping")
+                    return {}
+                embeddings = model.encode(headlines, convert_to_tensor=True)
+                span.count('headlines_embedded', len(headlines))
             
             # Calculate similarity
             groups = {}
@@ -116,6 +134,7 @@ class NewsMatchEngine:
             conn.commit()
             conn.close()
             
+            metrics.count('groups_created', len(groups), stage='group')
             logger.info(f"Created {len(groups)} news groups")
             return groups
         
@@ -0,0 +1,601 @@
+"""
+Staged Pipeline Module - Run the desk's stages concurrently
+Connects fetch → group → scrape → draft → translate → publish with bounded
+in-process queues, each stage with its own worker threads.
+
+FEATURES:
+✅ Per-stage worker counts (many for network stages, one for the LLM)
+✅ Bounded queues: a saturated stage blocks its producers, so a slow LLM
+   slows down intake instead of filling memory
+✅ Per-stage throughput, queue depth and time blocked on downstream
+✅ Graceful drain (finish what is queued) or stop (finish current items)
+✅ Resume from DB state: work left by an interrupted run is picked up
+   again from news_queue / ai_drafts / the job tables
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core import metrics
+from core.model_registry import models
+
+logger = logging.getLogger(__name__)
+
+# Put/get wait slice - how quickly blocked workers notice stop()
+_WAIT_SLICE = 0.2
+
+# Stage of the current worker thread (for backpressure accounting)
+_thread_state = threading.local()
+
+
+class Stage:
+    """One step of a pipeline: a handler run by a pool of worker threads"""
+
+    def __init__(self, name: str, handler: Callable, workers: int = 1, queue_size: int = 16,
+                 downstream: Iterable[str] = (), source: bool = False,
+                 seed: Optional[Callable[[], Iterable]] = None):
+        """
+        Args:
+            name: Stage name (unique within the pipeline)
+            handler: Called with one input item, returns an iterable of
+                output items for the downstream stages (or None)
+            workers: Worker threads for this stage
+            queue_size: Capacity of the stage's input queue
+            downstream: Stages that receive this stage's output
+            source: Handler is called once with None instead of reading a queue
+            seed: Returns extra input items when the pipeline starts
+                (e.g. unfinished work found in the database)
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = 1 if source else max(1, int(workers))
+        self.queue_size = max(1, int(queue_size))
+        self.downstream = list(downstream)
+        self.source = source
+        self.seed = seed
+
+        self.inbox: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self.producers = 0
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.emitted = 0
+        self.failed = 0
+        self.busy = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.live_workers = 0
+
+    def stats(self) -> Dict:
+        """Counters of this stage (throughput is items per second since start)"""
+        with self.lock:
+            end = self.finished_at or time.perf_counter()
+            elapsed = end - self.started_at if self.started_at else 0.0
+            return {
+                'stage': self.name,
+                'workers': self.workers,
+                'busy': self.busy,
+                'queue_depth': 0 if self.source else self.inbox.qsize(),
+                'queue_size': 0 if self.source else self.queue_size,
+                'processed': self.processed,
+                'emitted': self.emitted,
+                'failed': self.failed,
+                'per_second': round(self.processed / elapsed, 3) if elapsed > 0 else 0.0,
+                'seconds': round(elapsed, 3),
+                'busy_seconds': round(self.busy_seconds, 3),
+                'blocked_seconds': round(self.blocked_seconds, 3),
+                'running': self.started_at is not None and self.finished_at is None,
+            }
+
+
+class StagedPipeline:
+    """DAG of stages connected by bounded queues"""
+
+    _END = object()
+
+    def __init__(self, stages: List[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            for name in stage.downstream:
+                if name not in self.stages:
+                    raise ValueError(f"Stage {stage.name} feeds unknown stage {name}")
+        self._check_acyclic()
+
+        self._stop_event = threading.Event()
+        self._intake_closed = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._started = False
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through {name}")
+            visiting.add(name)
+            for child in self.stages[name].downstream:
+                visit(child)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start every stage's workers and seeders"""
+        if self._started:
+            return
+        self._started = True
+
+        # A stage's input ends when all its producers (upstream stages and
+        # its seeder) have finished
+        for stage in self.stages.values():
+            for name in stage.downstream:
+                self.stages[name].producers += 1
+            if stage.seed:
+                stage.producers += 1
+
+        now = time.perf_counter()
+        for stage in self.stages.values():
+            stage.started_at = now
+            stage.live_workers = stage.workers
+            if not stage.source and stage.producers == 0:
+                logger.warning(f"Stage {stage.name} has no input - it will finish immediately")
+                self._close_input(stage)
+            for index in range(stage.workers):
+                self._spawn(self._worker, f"pipeline-{stage.name}-{index + 1}", stage)
+            if stage.seed:
+                self._spawn(self._seeder, f"pipeline-{stage.name}-seed", stage)
+        logger.info(f"✅ Pipeline started: {', '.join(f'{s.name}×{s.workers}' for s in self.stages.values())}")
+
+    def _spawn(self, target: Callable, name: str, stage: Stage):
+        thread = threading.Thread(target=target, args=(stage,), name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def drain(self):
+        """Stop taking in new work; everything already queued is finished"""
+        if not self._intake_closed.is_set():
+            logger.info("⏸️ Pipeline draining - no new intake")
+        self._intake_closed.set()
+
+    def stop(self):
+        """Finish the items in progress and drop the rest (it stays in the DB for resume)"""
+        logger.info("⏹️ Pipeline stopping")
+        self._intake_closed.set()
+        self._stop_event.set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all stages; returns True if the pipeline finished"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        return not self.is_running()
+
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def is_stopping(self) -> bool:
+        """True once stop() was called - long-running stage functions check this between steps"""
+        return self._stop_event.is_set()
+
+    def run(self, progress: Optional[Callable[[List[Dict]], None]] = None,
+            progress_interval: float = 10.0) -> List[Dict]:
+        """
+        Start the pipeline and wait until it has drained
+
+        Ctrl+C drains gracefully; a second Ctrl+C stops after the current items.
+        """
+        self.start()
+        while True:
+            try:
+                if self.join(progress_interval if progress else _WAIT_SLICE * 5):
+                    break
+                if progress:
+                    progress(self.stats())
+            except KeyboardInterrupt:
+                if self._intake_closed.is_set():
+                    self.stop()
+                else:
+                    self.drain()
+        return self.stats()
+
+    def stats(self) -> List[Dict]:
+        """Per-stage counters in pipeline order"""
+        return [stage.stats() for stage in self.stages.values()]
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _put(self, stage: Stage, item, counts_as_intake: bool = False) -> bool:
+        """Blocking put that gives up on stop(); the wait is recorded as backpressure"""
+        start = time.perf_counter()
+        try:
+            while True:
+                if self._stop_event.is_set() or (counts_as_intake and self._intake_closed.is_set()):
+                    return False
+                try:
+                    stage.inbox.put(item, timeout=_WAIT_SLICE)
+                    return True
+                except queue.Full:
+                    continue
+        finally:
+            # Charged to the producing stage: time it could not hand work on
+            producer = getattr(_thread_state, 'stage', None)
+            if producer is not None:
+                with producer.lock:
+                    producer.blocked_seconds += time.perf_counter() - start
+
+    def _emit(self, stage: Stage, outputs, intake: bool) -> bool:
+        """Send a handler's outputs to every downstream stage"""
+        if outputs is None:
+            return True
+        for output in outputs:
+            if intake and self._intake_closed.is_set():
+                return False
+            for name in stage.downstream:
+                if not self._put(self.stages[name], output, counts_as_intake=intake):
+                    return False
+            with stage.lock:
+                stage.emitted += 1
+        return True
+
+    def _seeder(self, stage: Stage):
+        _thread_state.stage = None
+        try:
+            for item in stage.seed() or ():
+                if not self._put(stage, item, counts_as_intake=True):
+                    break
+        except Exception as e:
+            logger.error(f"❌ Seeding {stage.name} failed: {e}")
+        finally:
+            self._producer_done(stage)
+
+    def _worker(self, stage: Stage):
+        _thread_state.stage = stage
+        try:
+            if stage.source:
+                if not self._intake_closed.is_set():
+                    self._handle(stage, None, intake=True)
+                return
+            while not self._stop_event.is_set():
+                try:
+                    item = stage.inbox.get(timeout=_WAIT_SLICE)
+                except queue.Empty:
+                    continue
+                if item is self._END:
+                    break
+                self._handle(stage, item, intake=False)
+        finally:
+            self._worker_done(stage)
+
+    def _handle(self, stage: Stage, item, intake: bool):
+        start = time.perf_counter()
+        with stage.lock:
+            stage.busy += 1
+        try:
+            with metrics.span('stage_item', stage=stage.name):
+                outputs = stage.handler(item)
+            ok = True
+        except Exception as e:
+            logger.error(f"❌ Stage {stage.name} failed on {item!r}: {e}")
+            outputs, ok = None, False
+        with stage.lock:
+            stage.busy -= 1
+            stage.busy_seconds += time.perf_counter() - start
+            if ok:
+                stage.processed += 1
+            else:
+                stage.failed += 1
+        if ok:
+            # Generators are consumed here, so a source can stream its output
+            try:
+                self._emit(stage, outputs, intake)
+            except Exception as e:
+                logger.error(f"❌ Stage {stage.name} output failed: {e}")
+                with stage.lock:
+                    stage.failed += 1
+
+    def _worker_done(self, stage: Stage):
+        with stage.lock:
+            stage.live_workers -= 1
+            last = stage.live_workers == 0
+            if last:
+                stage.finished_at = time.perf_counter()
+        if last:
+            logger.debug(f"Stage {stage.name} finished")
+            for name in stage.downstream:
+                self._producer_done(self.stages[name])
+
+    def _producer_done(self, stage: Stage):
+        with stage.lock:
+            stage.producers -= 1
+            closed = stage.producers == 0
+        if closed:
+            self._close_input(stage)
+
+    def _close_input(self, stage: Stage):
+        """Queue one end marker per worker (behind any items still waiting)"""
+        def close():
+            for _ in range(stage.workers):
+                while not self._stop_event.is_set():
+                    try:
+                        stage.inbox.put(self._END, timeout=_WAIT_SLICE)
+                        break
+                    except queue.Full:
+                        continue
+        threading.Thread(target=close, name=f"pipeline-{stage.name}-close", daemon=True).start()
+
+
+# ----------------------------------------------------------------------
+# Work selection - what is still unfinished in the database
+# ----------------------------------------------------------------------
+
+def _query(db_path: str, sql: str, params: Tuple = ()) -> List[Tuple]:
+    with metrics.span('select_work', stage='db'):
+        conn = sqlite3.connect(db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        conn.close()
+    return rows
+
+
+def select_news_to_scrape(db_path: str, workspace_id: int, limit: int) -> List[Tuple[int, str]]:
+    """Active stories with a source URL and no scraped facts yet"""
+    return _query(db_path, '''
+        SELECT n.id, n.source_url FROM news_queue n
+        WHERE n.workspace_id = ? AND n.status IN ('new', 'grouped')
+          AND n.source_url IS NOT NULL AND n.source_url != ''
+          AND NOT EXISTS (SELECT 1 FROM scraped_facts f WHERE f.news_id = n.id)
+        ORDER BY n.verified_sources DESC, n.fetched_at DESC
+        LIMIT ?
+    ''', (workspace_id, limit))
+
+
+def select_news_to_draft(db_path: str, workspace_id: int, limit: int) -> List[int]:
+    """
+    Stories without a draft, best-sourced first - one per news group, and
+    none from groups that already have a draft
+    """
+    rows = _query(db_path, '''
+        SELECT n.id, g.group_id FROM news_queue n
+        LEFT JOIN grouped_news g ON g.news_id = n.id
+        WHERE n.workspace_id = ? AND n.status IN ('new', 'grouped')
+          AND NOT EXISTS (SELECT 1 FROM ai_drafts d WHERE d.news_id = n.id)
+          AND (g.group_id IS NULL OR NOT EXISTS (
+                SELECT 1 FROM grouped_news g2 JOIN ai_drafts d2 ON d2.news_id = g2.news_id
+                WHERE g2.group_id = g.group_id))
+        ORDER BY n.verified_sources DESC, n.fetched_at DESC
+    ''', (workspace_id,))
+    news_ids, seen_groups = [], set()
+    for news_id, group_id in rows:
+        if group_id is not None:
+            if group_id in seen_groups:
+                continue
+            seen_groups.add(group_id)
+        if news_id not in news_ids:
+            news_ids.append(news_id)
+        if len(news_ids) >= limit:
+            break
+    return news_ids
+
+
+def story_has_draft(db_path: str, news_id: int) -> bool:
+    """True if the story, or any story grouped with it, already has a draft"""
+    return bool(_query(db_path, '''
+        SELECT 1 FROM ai_drafts d WHERE d.news_id = ?
+        UNION ALL
+        SELECT 1 FROM grouped_news g
+        JOIN grouped_news g2 ON g2.group_id = g.group_id
+        JOIN ai_drafts d2 ON d2.news_id = g2.news_id
+        WHERE g.news_id = ?
+        LIMIT 1
+    ''', (news_id, news_id)))
+
+
+def select_drafts_to_translate(db_path: str, workspace_id: int, limit: int) -> List[int]:
+    """Recent drafts that were never queued for translation"""
+    rows = _query(db_path, '''
+        SELECT d.id FROM ai_drafts d
+        WHERE d.workspace_id = ?
+          AND NOT EXISTS (SELECT 1 FROM translation_jobs j WHERE j.draft_id = d.id)
+          AND NOT EXISTS (SELECT 1 FROM translations t WHERE t.draft_id = d.id)
+        ORDER BY d.id DESC LIMIT ?
+    ''', (workspace_id, limit))
+    return [row[0] for row in rows]
+
+
+def select_drafts_to_publish(db_path: str, workspace_id: int, limit: int) -> List[int]:
+    """Drafts that never went through the outbox or the legacy publish path"""
+    rows = _query(db_path, '''
+        SELECT d.id FROM ai_drafts d
+        WHERE d.workspace_id = ?
+          AND NOT EXISTS (SELECT 1 FROM publish_outbox o WHERE o.draft_id = d.id)
+          AND NOT EXISTS (SELECT 1 FROM wordpress_posts w WHERE w.draft_id = d.id)
+        ORDER BY d.id LIMIT ?
+    ''', (workspace_id, limit))
+    return [row[0] for row in rows]
+
+
+# ----------------------------------------------------------------------
+# The desk's pipeline
+# ----------------------------------------------------------------------
+
+class _PerThread:
+    """One instance of a component per worker thread (sessions are not shared)"""
+
+    def __init__(self, factory: Callable):
+        self.factory = factory
+        self.local = threading.local()
+
+    def get(self):
+        instance = getattr(self.local, 'instance', None)
+        if instance is None:
+            instance = self.local.instance = self.factory()
+        return instance
+
+
+def build_desk_pipeline(db_path: str, workspace_id: int, fetch: bool = True, today_only: bool = False,
+                        threshold: float = 0.7, scrape_limit: int = 20, draft_limit: int = 5,
+                        languages: Optional[List[str]] = None, publish: bool = True,
+                        publish_new_drafts: bool = False, scrape_workers: int = 4,
+                        publish_workers: int = 2, queue_size: int = 8,
+                        resume: bool = True) -> StagedPipeline:
+    """
+    Wire the desk's stages into a pipeline
+
+        fetch → group → scrape ×N → draft ×1 → translate ×1 → publish ×M
+
+    The draft queue is kept short so the LLM, the slowest stage, holds back
+    scraping (and the intake behind it) instead of piling up work.
+
+    Args:
+        db_path: SQLite database path
+        workspace_id: Workspace to run
+        fetch: Fetch RSS feeds first (otherwise grouping starts the run)
+        today_only: Only keep today's feed entries
+        threshold: Headline similarity threshold for grouping
+        scrape_limit: Stories to scrape after grouping
+        draft_limit: Drafts to generate in this run
+        languages: Translation languages (workspace auto-translate if None)
+        publish: Queue finished drafts in the publish outbox and publish them
+        publish_new_drafts: On resume, also publish drafts never queued before
+        scrape_workers: Concurrent scrapers
+        publish_workers: Concurrent publishers (the outbox still applies the
+            site's rate limit)
+        queue_size: Input queue capacity of the network stages
+        resume: Seed the stages with work an earlier run left unfinished
+    """
+    draft_lock = threading.Lock()
+    drafted: List[int] = []
+
+    def fetch_feeds(_):
+        from core.rss_manager import RSSManager
+
+        count, _message = RSSManager(db_path).fetch_news_from_feeds(workspace_id, today_only=today_only)
+        logger.info(f"📰 Pipeline fetched {count} stories")
+        return [count]
+
+    def _new_matcher():
+        from core.news_matcher import NewsMatchEngine
+        return NewsMatchEngine(db_path)
+
+    def _new_generator():
+        from core.ai_draft_generator import DraftGenerator
+        return DraftGenerator(db_path)
+
+    def _new_translation_queue():
+        from core.translation_queue import TranslationQueue
+        return TranslationQueue(db_path)
+
+    def _new_outbox():
+        from core.publish_outbox import PublishOutbox
+        return PublishOutbox(db_path)
+
+    # Components load lazily in the thread that uses them, so a run that
+    # never reaches a stage never loads its model
+    matchers = _PerThread(_new_matcher)
+    generators = _PerThread(_new_generator)
+    translation_queues = _PerThread(_new_translation_queue)
+    outboxes = _PerThread(_new_outbox)
+
+    def group_headlines(_):
+        matcher = matchers.get()
+        if models.is_available('news_matcher'):
+            matcher.group_similar_headlines(workspace_id, threshold=threshold)
+        else:
+            logger.warning("Similarity model not available - grouping skipped")
+        return select_news_to_scrape(db_path, workspace_id, scrape_limit)
+
+    def _new_scraper():
+        from core.content_scraper import ContentScraper
+        return ContentScraper(db_path)
+
+    scrapers = _PerThread(_new_scraper)
+
+    def scrape(item):
+        news_id, url = item
+        scrapers.get().scrape_article(url, news_id)
+        # Stories are drafted even when the source page could not be read
+        return [news_id]
+
+    def draft(news_id):
+        with draft_lock:
+            if len(drafted) >= draft_limit:
+                return None
+        if story_has_draft(db_path, news_id):
+            return None
+
+        result = generators.get().generate_draft(news_id)
+        if not result or not result.get('id') or result.get('error'):
+            raise RuntimeError((result or {}).get('error', 'no draft generated'))
+        with draft_lock:
+            drafted.append(result['id'])
+        return [result['id']]
+
+    def translate(draft_id):
+        translations = translation_queues.get()
+        translations.enqueue_draft(draft_id, workspace_id, languages=languages)
+        translations.run_pending()
+        done = [job['translated_draft_id'] for job in translations.get_jobs(draft_id)
+                if job['status'] == 'done' and job['translated_draft_id']]
+        return [draft_id] + done
+
+    def publish_draft(draft_id):
+        outbox = outboxes.get()
+        # None (from the seeder) only publishes jobs already due in the outbox
+        if draft_id is not None:
+            outbox.enqueue(draft_id, workspace_id)
+        # Jobs held back by the site's rate limit stay queued for later;
+        # stop() ends the run after the job in progress
+        while not pipeline.is_stopping() and outbox.process_next() == 0:
+            pass
+        return None
+
+    def seed_drafts():
+        return select_news_to_draft(db_path, workspace_id, draft_limit)
+
+    def seed_translations():
+        # Jobs left 'running' by an interrupted run go back to 'pending'
+        _new_translation_queue()._recover_interrupted_jobs()
+        return select_drafts_to_translate(db_path, workspace_id, draft_limit)
+
+    def seed_publishing():
+        _new_outbox()._recover_interrupted_jobs()
+        draft_ids = select_drafts_to_publish(db_path, workspace_id, draft_limit) if publish_new_drafts else []
+        return [None] + draft_ids
+    stages = []
+    if fetch:
+        stages.append(Stage('fetch', fetch_feeds, source=True, downstream=['group']))
+    stages += [
+        Stage('group', group_headlines, queue_size=1, downstream=['scrape'], source=not fetch),
+        Stage('scrape', scrape, workers=scrape_workers, queue_size=queue_size, downstream=['draft']),
+        Stage('draft', draft, queue_size=2, downstream=['translate'],
+              seed=seed_drafts if resume else None),
+        Stage('translate', translate, queue_size=queue_size,
+              downstream=['publish'] if publish else [],
+              seed=seed_translations if resume else None),
+    ]
+    if publish:
+        stages.append(Stage('publish', publish_draft, workers=publish_workers, queue_size=queue_size,
+                            seed=seed_publishing if resume else None))
+    pipeline = StagedPipeline(stages)
+    return pipeline
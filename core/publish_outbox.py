@@ -0,0 +1,607 @@
+"""
+Publish Outbox Module - Durable, rate-shaped WordPress publishing
+Approved drafts are queued in the publish_outbox table and a background worker
+pushes them to WordPress at a steady pace.
+
+FEATURES:
+✅ Persistent publish_outbox table (jobs survive restarts and timeouts)
+✅ Exponential backoff with jitter between attempts
+✅ Idempotency key per job - a retry finds the post an interrupted attempt
+   already created instead of creating a duplicate
+✅ Token bucket per site (default 10 posts/day, AdSense-friendly pace)
+✅ Scheduled publish times
+✅ Update jobs push an edited draft to its existing post (no token needed)
+"""
+
+import hashlib
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POSTS_PER_DAY = 10
+DEFAULT_BURST = 1
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 6 * 3600
+
+
+def _now() -> datetime:
+    return datetime.now().replace(microsecond=0)
+
+
+def _ts(value: datetime) -> str:
+    # Fixed-width ISO timestamps so SQL string comparison orders correctly
+    return value.isoformat(timespec='seconds')
+
+
+def _load_default_rate() -> Dict:
+    """Site defaults from config.json (publish_posts_per_day / publish_burst)"""
+    rate = {'posts_per_day': DEFAULT_POSTS_PER_DAY, 'burst': DEFAULT_BURST}
+    try:
+        config_path = Path('config.json')
+        if config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            rate['posts_per_day'] = float(config.get('publish_posts_per_day', rate['posts_per_day']))
+            rate['burst'] = int(config.get('publish_burst', rate['burst']))
+    except Exception as e:
+        logger.debug(f"Could not load publish rate from config.json: {e}")
+    return rate
+
+
+class PublishOutbox:
+    """Persistent queue of WordPress publish jobs drained by a background worker"""
+
+    def __init__(self, db_path: str = 'nexuzy.db', wordpress_api=None,
+                 on_complete: Optional[Callable[[Dict, Optional[Dict]], None]] = None,
+                 poll_interval: float = 30.0, max_attempts: int = 6):
+        """
+        Args:
+            db_path: SQLite database path
+            wordpress_api: WordPressAPI used by the worker (a dedicated instance
+                is created on first job if None, so the worker never shares
+                connection state with the UI)
+            on_complete: Called from the worker thread as on_complete(job, result)
+                when a job is published (result dict) or gives up (None)
+            poll_interval: Longest sleep between queue checks
+            max_attempts: Attempts per job before it is marked failed
+        """
+        self.db_path = db_path
+        self.wordpress_api = wordpress_api
+        self.on_complete = on_complete
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._worker = None
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure publish_outbox and publish_rate_limits tables exist"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS publish_outbox (
+                    id INTEGER PRIMARY KEY,
+                    draft_id INTEGER NOT NULL,
+                    workspace_id INTEGER NOT NULL,
+                    site_url TEXT NOT NULL,
+                    idempotency_key TEXT NOT NULL UNIQUE,
+                    action TEXT DEFAULT 'create',
+                    status TEXT DEFAULT 'queued',
+                    attempts INTEGER DEFAULT 0,
+                    scheduled_at TEXT,
+                    next_attempt_at TEXT NOT NULL,
+                    last_error TEXT,
+                    post_id INTEGER,
+                    post_url TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    published_at TEXT,
+                    FOREIGN KEY (draft_id) REFERENCES ai_drafts(id)
+                )
+            ''')
+            cursor.execute('PRAGMA table_info(publish_outbox)')
+            if 'action' not in [col[1] for col in cursor.fetchall()]:
+                cursor.execute("ALTER TABLE publish_outbox ADD COLUMN action TEXT DEFAULT 'create'")
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_publish_outbox_due ON publish_outbox(status, next_attempt_at)')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS publish_rate_limits (
+                    site_url TEXT PRIMARY KEY,
+                    posts_per_day REAL NOT NULL,
+                    burst INTEGER NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not create publish outbox tables: {e}")
+
+    # ------------------------------------------------------------------
+    # Rate limits (token bucket per site)
+    # ------------------------------------------------------------------
+
+    def get_rate_limit(self, site_url: str) -> Dict:
+        """posts_per_day and burst for a site (config.json defaults if unset)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT posts_per_day, burst FROM publish_rate_limits WHERE site_url = ?',
+                           (site_url.rstrip('/'),))
+            row = cursor.fetchone()
+            conn.close()
+            if row:
+                return {'posts_per_day': row[0], 'burst': row[1]}
+        except Exception as e:
+            logger.error(f"Error loading publish rate limit: {e}")
+        return _load_default_rate()
+
+    def set_rate_limit(self, site_url: str, posts_per_day: float, burst: int = DEFAULT_BURST) -> bool:
+        """Change a site's publishing pace (current tokens are kept, capped at burst)"""
+        if posts_per_day <= 0 or burst < 1:
+            logger.error("Posts per day must be positive and burst at least 1")
+            return False
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO publish_rate_limits (site_url, posts_per_day, burst, tokens, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(site_url) DO UPDATE SET
+                    posts_per_day = excluded.posts_per_day, burst = excluded.burst,
+                    tokens = MIN(publish_rate_limits.tokens, excluded.burst)
+            ''', (site_url.rstrip('/'), posts_per_day, burst, burst, time.time()))
+            conn.commit()
+            conn.close()
+            logger.info(f"📅 Publish rate for {site_url}: {posts_per_day:g}/day, burst {burst}")
+            self._wake_event.set()
+            return True
+        except Exception as e:
+            logger.error(f"Error saving publish rate limit: {e}")
+            return False
+
+    def _refill(self, cursor, site_url: str) -> Dict:
+        """Current bucket state for a site (row created on first use)"""
+        now = time.time()
+        cursor.execute('SELECT posts_per_day, burst, tokens, updated_at FROM publish_rate_limits WHERE site_url = ?',
+                       (site_url,))
+        row = cursor.fetchone()
+        if not row:
+            rate = _load_default_rate()
+            bucket = {'posts_per_day': rate['posts_per_day'], 'burst': rate['burst'], 'tokens': float(rate['burst'])}
+            cursor.execute('''
+                INSERT INTO publish_rate_limits (site_url, posts_per_day, burst, tokens, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (site_url, bucket['posts_per_day'], bucket['burst'], bucket['tokens'], now))
+        else:
+            per_second = row[0] / 86400.0
+            tokens = min(float(row[1]), row[2] + max(0.0, now - row[3]) * per_second)
+            bucket = {'posts_per_day': row[0], 'burst': row[1], 'tokens': tokens}
+            cursor.execute('UPDATE publish_rate_limits SET tokens = ?, updated_at = ? WHERE site_url = ?',
+                           (tokens, now, site_url))
+        return bucket
+
+    @staticmethod
+    def _seconds_until_token(bucket: Dict) -> float:
+        if bucket['tokens'] >= 1:
+            return 0.0
+        return (1 - bucket['tokens']) * 86400.0 / bucket['posts_per_day']
+
+    def _refund_token(self, site_url: str):
+        """Give the token back when it is certain no post was created"""
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            bucket = self._refill(cursor, site_url)
+            cursor.execute('UPDATE publish_rate_limits SET tokens = ? WHERE site_url = ?',
+                           (min(float(bucket['burst']), bucket['tokens'] + 1), site_url))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Could not refund publish token: {e}")
+
+    def next_slot(self, site_url: str) -> datetime:
+        """When the site's bucket next has a token, ignoring queued jobs"""
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            cursor = conn.cursor()
+            bucket = self._refill(cursor, site_url.rstrip('/'))
+            conn.commit()
+            conn.close()
+            return _now() + timedelta(seconds=self._seconds_until_token(bucket))
+        except Exception as e:
+            logger.error(f"Error reading publish rate: {e}")
+            return _now()
+
+    # ------------------------------------------------------------------
+    # Queue operations
+    # ------------------------------------------------------------------
+
+    def _site_for_workspace(self, workspace_id: int) -> Optional[str]:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT site_url FROM wp_credentials WHERE workspace_id = ?', (workspace_id,))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0].rstrip('/') if row and row[0] else None
+
+    @staticmethod
+    def make_idempotency_key(workspace_id: int, draft_id: int, site_url: str, revision: int = 0) -> str:
+        """Stable key for publishing one draft to one site"""
+        raw = f"{workspace_id}:{draft_id}:{site_url}:{revision}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:24]
+
+    def enqueue(self, draft_id: int, workspace_id: int, scheduled_at: Optional[datetime] = None,
+                force: bool = False, update: bool = False) -> Optional[Dict]:
+        """
+        Queue a draft for publishing
+
+        Args:
+            draft_id: Draft to publish
+            workspace_id: Workspace whose WordPress site receives the post
+            scheduled_at: Earliest publish time (None = next free slot)
+            force: Publish again as a new post even if this draft already went out
+            update: If this draft already went out, push the current draft to
+                that post (an update job) instead of returning the published job
+
+        Returns:
+            Job dict ('created' is False when an existing job was returned),
+            or None if the workspace has no WordPress site configured
+        """
+        try:
+            site_url = self._site_for_workspace(workspace_id)
+            if not site_url:
+                logger.error(f"No WordPress credentials for workspace {workspace_id}")
+                return None
+
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                SELECT id, status, post_id FROM publish_outbox
+                WHERE draft_id = ? AND site_url = ? AND status != 'cancelled'
+                ORDER BY id DESC LIMIT 1
+            ''', (draft_id, site_url))
+            existing = cursor.fetchone()
+            target_post = existing[2] if existing and update and existing[1] == 'published' else None
+            if existing and not force and not target_post:
+                conn.rollback()
+                conn.close()
+                job = self.get_job(existing[0])
+                if job and job['status'] == 'failed':
+                    # Operator asked again - give the failed job a fresh run
+                    self.retry(job['id'])
+                    job = self.get_job(existing[0])
+                job['created'] = False
+                return job
+
+            cursor.execute('SELECT COUNT(*) FROM publish_outbox WHERE draft_id = ? AND site_url = ?',
+                           (draft_id, site_url))
+            revision = cursor.fetchone()[0]
+            now = _ts(_now())
+            due = _ts(scheduled_at.replace(microsecond=0)) if scheduled_at else now
+            cursor.execute('''
+                INSERT INTO publish_outbox (draft_id, workspace_id, site_url, idempotency_key, action, status,
+                                            scheduled_at, next_attempt_at, post_id, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?, ?, ?)
+            ''', (draft_id, workspace_id, site_url,
+                  self.make_idempotency_key(workspace_id, draft_id, site_url, revision),
+                  'update' if target_post else 'create', due if scheduled_at else None, due, target_post, now, now))
+            job_id = cursor.lastrowid
+            conn.commit()
+            conn.close()
+
+            logger.info(f"📤 Draft {draft_id} queued for {site_url}" +
+                        (f" (update of post {target_post})" if target_post else "") +
+                        (f" at {due}" if scheduled_at else ""))
+            self._wake_event.set()
+            job = self.get_job(job_id)
+            job['created'] = True
+            return job
+
+        except Exception as e:
+            logger.error(f"Error queueing publish job: {e}")
+            return None
+
+    _JOB_COLUMNS = ('id', 'draft_id', 'workspace_id', 'site_url', 'idempotency_key', 'action', 'status', 'attempts',
+                    'scheduled_at', 'next_attempt_at', 'last_error', 'post_id', 'post_url', 'published_at')
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(self._JOB_COLUMNS)} FROM publish_outbox WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            conn.close()
+            return dict(zip(self._JOB_COLUMNS, row)) if row else None
+        except Exception as e:
+            logger.error(f"Error loading publish job: {e}")
+            return None
+
+    def get_status_counts(self, workspace_id: Optional[int] = None) -> Dict[str, int]:
+        """Count jobs per status (optionally for one workspace)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            if workspace_id is None:
+                cursor.execute('SELECT status, COUNT(*) FROM publish_outbox GROUP BY status')
+            else:
+                cursor.execute('SELECT status, COUNT(*) FROM publish_outbox WHERE workspace_id = ? GROUP BY status',
+                               (workspace_id,))
+            counts = dict(cursor.fetchall())
+            conn.close()
+            return counts
+        except Exception as e:
+            logger.error(f"Error counting publish jobs: {e}")
+            return {}
+
+    def estimate_publish_time(self, job: Dict) -> datetime:
+        """Rough time a queued job goes out, given jobs ahead of it and the site's rate"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COUNT(*) FROM publish_outbox
+                WHERE site_url = ? AND status IN ('queued', 'publishing')
+                  AND (next_attempt_at < ? OR (next_attempt_at = ? AND id < ?))
+            ''', (job['site_url'], job['next_attempt_at'], job['next_attempt_at'], job['id']))
+            ahead = cursor.fetchone()[0]
+            conn.close()
+            rate = self.get_rate_limit(job['site_url'])
+            slot = self.next_slot(job['site_url']) + timedelta(seconds=ahead * 86400.0 / rate['posts_per_day'])
+            due = datetime.fromisoformat(job['next_attempt_at'])
+            return max(slot, due)
+        except Exception as e:
+            logger.error(f"Error estimating publish time: {e}")
+            return _now()
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a job that has not been published yet"""
+        return self._set_status(job_id, 'cancelled', "status IN ('queued', 'failed')")
+
+    def retry(self, job_id: int) -> bool:
+        """Re-queue a failed job with a fresh attempt budget"""
+        return self._set_status(job_id, 'queued', "status = 'failed'", reset=True)
+
+    def _set_status(self, job_id: int, status: str, condition: str, reset: bool = False) -> bool:
+        try:
+            now = _ts(_now())
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            cursor = conn.cursor()
+            extra = ", attempts = 0, last_error = NULL, next_attempt_at = ?" if reset else ""
+            params = (status, now, now, job_id) if reset else (status, now, job_id)
+            cursor.execute(f"UPDATE publish_outbox SET status = ?, updated_at = ?{extra} WHERE id = ? AND {condition}",
+                           params)
+            changed = cursor.rowcount > 0
+            conn.commit()
+            conn.close()
+            if changed:
+                self._wake_event.set()
+            return changed
+        except Exception as e:
+            logger.error(f"Error updating publish job: {e}")
+            return False
+
+    def _recover_interrupted_jobs(self):
+        """
+        Jobs left 'publishing' by a previous session go back in the queue.
+        Their idempotency key lets the retry find a post that did get created.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("UPDATE publish_outbox SET status = 'queued' WHERE status = 'publishing'")
+            recovered = cursor.rowcount
+            conn.commit()
+            conn.close()
+            if recovered:
+                logger.info(f"♻️ Resumed {recovered} interrupted publish jobs")
+        except Exception as e:
+            logger.error(f"Error recovering publish jobs: {e}")
+
+    def _claim_next_job(self):
+        """
+        Atomically claim the oldest due job whose site has a token
+
+        Returns:
+            (job or None, seconds until the next job could become ready or None)
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            now = _ts(_now())
+            cursor.execute('''
+                SELECT id, draft_id, workspace_id, site_url, idempotency_key, action, post_id, attempts
+                FROM publish_outbox
+                WHERE status = 'queued' AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, id
+            ''', (now,))
+            due_jobs = cursor.fetchall()
+
+            wait = None
+            checked_sites = set()
+            for job_id, draft_id, workspace_id, site_url, key, action, post_id, attempts in due_jobs:
+                if action != 'update':
+                    # Updates add no post to the site, so only new posts spend tokens
+                    if site_url in checked_sites:
+                        continue
+                    checked_sites.add(site_url)
+                    bucket = self._refill(cursor, site_url)
+                    if bucket['tokens'] < 1:
+                        delay = self._seconds_until_token(bucket)
+                        wait = delay if wait is None else min(wait, delay)
+                        continue
+                    cursor.execute('UPDATE publish_rate_limits SET tokens = tokens - 1 WHERE site_url = ?', (site_url,))
+                cursor.execute('''
+                    UPDATE publish_outbox SET status = 'publishing', attempts = attempts + 1, updated_at = ?
+                    WHERE id = ?
+                ''', (now, job_id))
+                conn.commit()
+                return {'id': job_id, 'draft_id': draft_id, 'workspace_id': workspace_id, 'site_url': site_url,
+                        'idempotency_key': key, 'action': action or 'create', 'post_id': post_id,
+                        'attempts': attempts + 1}, None
+
+            cursor.execute("SELECT MIN(next_attempt_at) FROM publish_outbox WHERE status = 'queued' AND next_attempt_at > ?",
+                           (now,))
+            upcoming = cursor.fetchone()[0]
+            if upcoming:
+                delay = (datetime.fromisoformat(upcoming) - _now()).total_seconds()
+                wait = delay if wait is None else min(wait, delay)
+            conn.commit()
+            return None, wait
+        finally:
+            conn.close()
+
+    def _backoff_seconds(self, attempts: int) -> float:
+        delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _finish_job(self, job: Dict, result: Optional[Dict], error: str = '', retry: bool = True) -> str:
+        """Record the outcome of a job, returns its new status"""
+        now = _now()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        if result:
+            status = 'published'
+            cursor.execute('''
+                UPDATE publish_outbox
+                SET status = 'published', post_id = ?, post_url = ?, last_error = NULL,
+                    published_at = ?, updated_at = ?
+                WHERE id = ?
+            ''', (result.get('post_id'), result.get('url'), _ts(now), _ts(now), job['id']))
+        else:
+            status = 'queued' if retry and job['attempts'] < self.max_attempts else 'failed'
+            next_attempt = now + timedelta(seconds=self._backoff_seconds(job['attempts']))
+            cursor.execute('''
+                UPDATE publish_outbox SET status = ?, last_error = ?, next_attempt_at = ?, updated_at = ?
+                WHERE id = ?
+            ''', (status, error or 'Publish failed', _ts(next_attempt), _ts(now), job['id']))
+        conn.commit()
+        conn.close()
+        return status
+
+    def _get_wordpress_api(self):
+        if self.wordpress_api is None:
+            from core.wordpress_api import WordPressAPI
+            self.wordpress_api = WordPressAPI(self.db_path)
+        return self.wordpress_api
+
+    def _draft_exists(self, draft_id: int) -> bool:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT 1 FROM ai_drafts WHERE id = ?', (draft_id,))
+        exists = cursor.fetchone() is not None
+        conn.close()
+        return exists
+
+    def _publish(self, job: Dict) -> Optional[Dict]:
+        api = self._get_wordpress_api()
+        if job['action'] == 'update':
+            # Overwriting the same post is safe to repeat - no lookup needed
+            with metrics.span('update_post', stage='publish'):
+                return api.publish_draft(job['draft_id'], job['workspace_id'],
+                                         idempotency_key=job['idempotency_key'], post_id=job['post_id'])
+        if job['attempts'] > 1:
+            # An earlier attempt may have created the post before timing out
+            with metrics.span('find_existing_post', stage='publish'):
+                existing = api.find_post_by_idempotency_key(job['workspace_id'], job['idempotency_key'])
+            if existing:
+                logger.info(f"♻️ Draft {job['draft_id']} already on site as post {existing['post_id']}")
+                return existing
+        with metrics.span('publish_draft', stage='publish'):
+            return api.publish_draft(job['draft_id'], job['workspace_id'], idempotency_key=job['idempotency_key'])
+
+    def process_next(self) -> Optional[float]:
+        """
+        Process one due job
+
+        Returns:
+            0 if a job was processed, otherwise seconds until the next job
+            could be ready (None if nothing is queued)
+        """
+        job, wait = self._claim_next_job()
+        if not job:
+            return wait
+
+        logger.info(f"📤 Publishing draft {job['draft_id']} to {job['site_url']} (attempt {job['attempts']})")
+        result = None
+        # The token is refunded only when no post can have been created: a
+        # timeout or 5xx may hide a post the next attempt will find
+        refund = False
+        try:
+            if not self._draft_exists(job['draft_id']):
+                status = self._finish_job(job, None, 'Draft no longer exists', retry=False)
+                refund = True
+            else:
+                result = self._publish(job)
+                if result:
+                    status = self._finish_job(job, result)
+                else:
+                    outcome = getattr(self._get_wordpress_api(), 'last_publish_outcome', None)
+                    error = ('WordPress rejected the post' if outcome == 'rejected'
+                             else 'WordPress rejected the post or was unreachable')
+                    status = self._finish_job(job, None, error)
+                    refund = outcome in ('not_sent', 'rejected')
+        except Exception as e:
+            logger.error(f"❌ Publish attempt failed: {e}")
+            status = self._finish_job(job, None, str(e))
+        if refund and job['action'] != 'update':
+            self._refund_token(job['site_url'])
+
+        if status == 'queued':
+            logger.warning(f"⏳ Draft {job['draft_id']} will be retried later")
+        elif self.on_complete:
+            try:
+                self.on_complete(self.get_job(job['id']), result)
+            except Exception as e:
+                logger.debug(f"Publish callback error: {e}")
+        return 0
+
+    # ------------------------------------------------------------------
+    # Background worker
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the background worker thread"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._recover_interrupted_jobs()
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name='publish-outbox', daemon=True)
+        self._worker.start()
+        logger.info("✅ Publish outbox worker started")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the worker after the current job finishes"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._worker:
+            self._worker.join(timeout)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            wait = self.poll_interval
+            try:
+                next_wait = self.process_next()
+                if next_wait == 0:
+                    continue
+                if next_wait is not None:
+                    wait = max(1.0, min(wait, next_wait))
+            except Exception as e:
+                logger.error(f"Publish outbox error: {e}")
+            self._wake_event.wait(wait)
+            self._wake_event.clear()
@@ -1,7 +1,7 @@
 """
 Research Writer Module - AI-Powered Research & Article Generation
 Features: Web search, Article scraping, AI analysis, Auto-generated articles with citations
-🔥 NOW USES SAME AI MODEL as AI Draft Generator (GLOBAL CACHE SHARED)
+🔥 NOW USES SAME AI MODEL as AI Draft Generator (shared model registry)
 """
 
 import logging
@@ -20,15 +20,18 @@ try:
 except ImportError:
     BeautifulSoup = None
 
+from core.content_extractor import LXML_AVAILABLE, extract_main_content
+from core.http_cache import cached_session
+from core.model_registry import models, module_available
+from core.scrape_engine import get_engine
+
 logger = logging.getLogger(__name__)
 
-# GLOBAL MODEL CACHE - shared with AI Draft Generator
-_CACHED_MODEL = None
-_CACHED_SENTENCE_MODEL = None
+SCRAPE_DEADLINE = 30  # seconds for all sources of one research article
 
 # Import synonym dictionary and uniqueness functions from ai_draft_generator
 try:
-    from core.ai_draft_generator import SYNONYM_DICT, TITLE_PATTERNS
+    from core.ai_draft_generator import SYNONYM_DICT, TITLE_PATTERNS, SENTENCE_MODEL_MB, GGUF_OVERHEAD_MB
 except:
     # Fallback if import fails
     SYNONYM_DICT = {
@@ -37,13 +40,13 @@ except:
         'important': ['crucial', 'vital', 'essential', 'critical', 'key'],
     }
     TITLE_PATTERNS = ["{topic}: What This Means", "{topic}: Analysis"]
+    SENTENCE_MODEL_MB = 1000
+    GGUF_OVERHEAD_MB = 600
 
 class ResearchWriter:
     """AI-powered research and article generation engine"""
     
     def __init__(self, db_path: str = 'nexuzy.db', cache_articles: bool = True, model_name: str = 'models/mistral-7b-instruct-v0.2.Q4_K_M.gguf'):
-        global _CACHED_MODEL, _CACHED_SENTENCE_MODEL
-        
         self.db_path = db_path
         self.cache_articles = cache_articles
         self.article_cache = {}  # In-memory cache
@@ -51,28 +54,19 @@ class ResearchWriter:
         self.model_name = model_name
         self._ensure_research_table()
         
-        # Use GLOBAL cached model (shared with AI Draft Generator)
-        if _CACHED_MODEL:
-            logger.info("✅ Research Writer using GLOBAL cached AI model (shared with AI Draft Generator)")
-            self.llm = _CACHED_MODEL
-        else:
-            logger.info("⏳ Loading AI model for Research Writer (will be shared with AI Draft Generator)...")
-            self.llm = self._load_model()
-            if self.llm:
-                _CACHED_MODEL = self.llm
-                logger.info("💾 Model cached GLOBALLY for Research Writer + AI Draft Generator")
-        
-        if _CACHED_SENTENCE_MODEL:
-            self.sentence_model = _CACHED_SENTENCE_MODEL
-        else:
-            self.sentence_model = self._load_sentence_model()
-            if self.sentence_model:
-                _CACHED_SENTENCE_MODEL = self.sentence_model
+        # Same registry entries as AI Draft Generator - one copy of each model in memory.
+        # These loaders are only used if the Research Writer registers first.
+        models.register('llm', self._load_model, size_mb=self._estimate_model_mb,
+                        display_name=f"AI Writer ({Path(model_name).name})",
+                        check=lambda: module_available('ctransformers') and self._find_model_path() is not None)
+        models.register('sentence_model', self._load_sentence_model, size_mb=SENTENCE_MODEL_MB,
+                        display_name='Sentence Model (flan-t5-base)',
+                        check=lambda: module_available('transformers'))
         
-        if not self.llm:
+        if not models.is_available('llm'):
             logger.warning("⚠️ Research Writer operating without AI model - will use template generation")
         else:
-            logger.info("✅ Research Writer LOADED with AI model (800-2000 words, enhanced uniqueness)")
+            logger.info("✅ Research Writer ready (800-2000 words, model shared with AI Draft Generator, loaded on first use)")
     
     def _detect_model_type(self, model_path: Path) -> str:
         """Auto-detect model type"""
@@ -90,27 +84,44 @@ class ResearchWriter:
             logger.warning(f"⚠️ Could not detect model type, defaulting to 'llama'")
             return 'llama'
     
+    @property
+    def llm(self):
+        """GGUF model from the shared registry (reloaded if it was unloaded)"""
+        return models.get('llm')
+    
+    @property
+    def sentence_model(self):
+        return models.get('sentence_model')
+    
+    def _find_model_path(self) -> Optional[Path]:
+        """First existing GGUF file among the known locations"""
+        model_file = Path(self.model_name).name
+        possible_paths = [
+            Path(self.model_name),
+            Path('models') / model_file,
+            Path.home() / '.cache' / 'nexuzy' / 'models' / model_file,
+            Path('models') / 'mistral-7b-instruct-v0.2.Q4_K_M.gguf',
+            Path('models') / 'tinyllama-1.1b-chat-v1.0.Q8_0.gguf',
+        ]
+        for path in possible_paths:
+            if path.exists():
+                return path
+        return None
+    
+    def _estimate_model_mb(self) -> float:
+        model_path = self._find_model_path()
+        if not model_path:
+            return 0
+        return model_path.stat().st_size / (1024 * 1024) + GGUF_OVERHEAD_MB
+    
     def _load_model(self):
         """Load GGUF model (same as AI Draft Generator)"""
         try:
             from ctransformers import AutoModelForCausalLM
             
-            model_file = Path(self.model_name).name
-            
-            possible_paths = [
-                Path(self.model_name),
-                Path('models') / model_file,
-                Path.home() / '.cache' / 'nexuzy' / 'models' / model_file,
-                Path('models') / 'mistral-7b-instruct-v0.2.Q4_K_M.gguf',
-                Path('models') / 'tinyllama-1.1b-chat-v1.0.Q8_0.gguf',
-            ]
-            
-            model_path = None
-            for path in possible_paths:
-                if path.exists():
-                    model_path = path
-                    logger.info(f"✅ Found model: {model_path}")
-                    break
+            model_path = self._find_model_path()
+            if model_path:
+                logger.info(f"✅ Found model: {model_path}")
             
             if not model_path:
                 logger.error("❌ GGUF model not found")
@@ -120,10 +131,11 @@ class ResearchWriter:
             logger.info(f"🔍 Model type: {model_type}")
             logger.info("⏳ Loading for research articles (800-2000 words)...")
             
+            # Same context as AI Draft Generator, which shares this model
             llm = AutoModelForCausalLM.from_pretrained(
                 str(model_path),
                 model_type=model_type,
-                context_length=2048,
+                context_length=4096,
                 max_new_tokens=1500,
                 threads=4,
                 gpu_layers=0
@@ -158,11 +170,9 @@ class ResearchWriter:
             return None
     
     def _create_session(self) -> requests.Session:
-        """Create configured requests session"""
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        """Create configured requests session (search and image APIs, via the HTTP cache)"""
+        session = cached_session('research', stage='research',
+                                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
         session.timeout = 30
         return session
     
@@ -331,6 +341,8 @@ class ResearchWriter:
     def _scrape_articles(self, urls: List[str]) -> List[Dict]:
         """
         Scrape article content from URLs
+        Fetched concurrently by the shared scrape engine (per-domain politeness,
+        robots.txt), so the batch takes about as long as the slowest source
         
         Args:
             urls: List of URLs to scrape
@@ -338,78 +350,36 @@ class ResearchWriter:
         Returns:
             List of dicts with 'url', 'title', 'content'
         """
-        articles = []
+        if not LXML_AVAILABLE:
+            logger.debug("   lxml not available")
+            return []
         
-        for url in urls:
-            try:
-                logger.debug(f"   Scraping: {url[:50]}...")
-                response = self.session.get(url, timeout=15)
-                
-                if response.status_code != 200:
-                    logger.debug(f"   Failed: HTTP {response.status_code}")
-                    continue
-                
-                if not BeautifulSoup:
-                    logger.debug("   BeautifulSoup not available")
-                    continue
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract title
-                title = None
-                title_tag = soup.find('h1') or soup.find('title')
-                if title_tag:
-                    title = title_tag.get_text(strip=True)
-                
-                # Extract main content
-                content = None
-                
-                # Try common article containers
-                article_selectors = [
-                    soup.find('article'),
-                    soup.find('main'),
-                    soup.find(class_='content'),
-                    soup.find(class_='article'),
-                    soup.find(class_='post')
-                ]
-                
-                for selector in article_selectors:
-                    if selector:
-                        # Remove scripts and styles
-                        for tag in selector.find_all(['script', 'style', 'nav']):
-                            tag.decompose()
-                        
-                        content = selector.get_text(separator=' ', strip=True)
-                        if len(content) > 200:  # Minimum content length
-                            break
-                
-                # Fallback: get all body text
-                if not content or len(content) < 200:
-                    body = soup.find('body')
-                    if body:
-                        # Remove scripts and styles
-                        for tag in body.find_all(['script', 'style', 'nav', 'aside']):
-                            tag.decompose()
-                        content = body.get_text(separator=' ', strip=True)
-                
-                if content and len(content) > 200:
-                    articles.append({
-                        'url': url,
-                        'title': title or url,
-                        'content': ' '.join(content.split())[:5000]  # Limit to 5000 chars
-                    })
-                    logger.debug(f"   ✅ Scraped {len(content)} characters")
-                else:
-                    logger.debug(f"   ⚠️ Insufficient content")
-            
-            except Exception as e:
-                logger.debug(f"   Error scraping {url[:30]}...: {e}")
-                continue
-            
-            time.sleep(0.5)  # Rate limiting
+        articles = []
+        for result in get_engine().fetch_all(urls, handler=self._parse_article, deadline=SCRAPE_DEADLINE):
+            if result['status'] != 'ok':
+                logger.debug(f"   Failed {result['url'][:50]}: {result['error']}")
+            elif result['value']:
+                articles.append(result['value'])
         
         return articles
     
+    def _parse_article(self, result: Dict) -> Optional[Dict]:
+        """Title and main text of a fetched page (runs in a scrape worker)"""
+        url = result['url']
+        page = extract_main_content(result['response'].content)
+        title = page['title'] if page else None
+        content = page['text'] if page else None
+        
+        if content and len(content) > 200:
+            logger.debug(f"   ✅ Scraped {len(content)} characters from {url[:50]}")
+            return {
+                'url': url,
+                'title': title or url,
+                'content': ' '.join(content.split())[:5000]  # Limit to 5000 chars
+            }
+        logger.debug(f"   ⚠️ Insufficient content: {url[:50]}")
+        return None
+    
     def _extract_key_points(self, articles: List[Dict], topic: str) -> List[str]:
         """
         Extract key points from scraped articles
@@ -463,7 +433,7 @@ class ResearchWriter:
         Returns:
             Generated article text
         """
-        if not self.llm:
+        if not models.is_available('llm'):
             logger.warning("⚠️ AI model not available, using template generation")
             return self._template_article(topic, key_points, articles)
         
@@ -523,15 +493,19 @@ Article:"""
             
             logger.info("⏳ Generating research article with AI model (60-90 seconds)...")
             
-            generated_text = self.llm(
-                prompt,
-                max_new_tokens=1500,
-                temperature=0.90,
-                top_p=0.95,
-                repetition_penalty=1.35,
-                stop=["\n\n\n\n", "Article:", "Summary:", "Note:", "Disclaimer:"],
-                stream=False
-            )
+            with models.use('llm') as llm:
+                if llm is None:
+                    logger.warning("⚠️ AI model could not be loaded, using template generation")
+                    return self._template_article(topic, key_points, articles)
+                generated_text = llm(
+                    prompt,
+                    max_new_tokens=1500,
+                    temperature=0.90,
+                    top_p=0.95,
+                    repetition_penalty=1.35,
+                    stop=["\n\n\n\n", "Article:", "Summary:", "Note:", "Disclaimer:"],
+                    stream=False
+                )
             
             if not generated_text or not isinstance(generated_text, str):
                 generated_text = str(generated_text) if generated_text else ""
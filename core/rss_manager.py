@@ -14,6 +14,7 @@ FEATURES:
 ✅ Better extraction from Mint, WordPress feeds
 ✅ Smart image quality selection
 ✅ FIXED: media:content for machinelearningmastery.com
+✅ Each entry HTML field parsed once (lxml, memoized) for text and images
 """
 
 import sqlite3
@@ -24,18 +25,127 @@ from urllib.parse import urlparse, quote, urljoin
 import re
 import json
 import os
+import threading
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
+
+from core import metrics
 
 try:
     import feedparser
     from bs4 import BeautifulSoup
-    import requests
     DEPENDENCIES_AVAILABLE = True
 except ImportError:
     DEPENDENCIES_AVAILABLE = False
 
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Cheap pre-checks: fields without these tags are never parsed for images
+IMG_TAG_RE = re.compile(r'<img\b', re.I)
+META_TAG_RE = re.compile(r'<meta\b', re.I)
+IMG_SRC_ATTRS = ('src', 'data-src', 'data-lazy-src')
+_TEXTLESS_TAGS = frozenset({'script', 'style', 'template'})
+
+
+class EntryHTML(NamedTuple):
+    """One parse of an entry's HTML field, shared by the summary text and every image strategy"""
+    text: str         # visible text, same as BeautifulSoup get_text(separator=' ', strip=True)
+    images: tuple     # attribute dicts of <img> tags, in document order
+    metas: dict       # <meta> property/name -> content (first one wins)
+
+
+class _EntryHTMLTarget:
+    """lxml parser target collecting text, <img> and <meta> attributes in one pass"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.strings = []
+        self.buffer = []
+        self.images = []
+        self.metas = {}
+        self.skip_depth = 0
+
+    def _flush(self):
+        if self.buffer:
+            text = ''.join(self.buffer).strip()
+            if text:
+                self.strings.append(text)
+            self.buffer = []
+
+    def start(self, tag, attrib):
+        self._flush()
+        if tag == 'img':
+            self.images.append(dict(attrib))
+        elif tag == 'meta':
+            content = attrib.get('content')
+            for key in (attrib.get('property'), attrib.get('name')):
+                if key and content:
+                    self.metas.setdefault(key, content)
+        elif tag in _TEXTLESS_TAGS:
+            self.skip_depth += 1
+
+    def data(self, text):
+        if not self.skip_depth:
+            self.buffer.append(text)
+
+    def end(self, tag):
+        self._flush()
+        if tag in _TEXTLESS_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def close(self) -> EntryHTML:
+        self._flush()
+        parsed = EntryHTML(' '.join(self.strings), tuple(self.images), self.metas)
+        self.reset()
+        return parsed
+
+
+_parsers = threading.local()
+
+
+def _entry_parser():
+    """Per-thread lxml parser (creating one per entry costs more than the parse)"""
+    parser = getattr(_parsers, 'parser', None)
+    if parser is None:
+        parser = _parsers.parser = etree.HTMLParser(target=_EntryHTMLTarget(), remove_comments=True,
+                                                    remove_pis=True)
+    return parser
+
+
+@lru_cache(maxsize=512)
+def parse_entry_html(html: str) -> EntryHTML:
+    """Parse a feed entry's HTML once (memoized: summary/description/content often repeat)"""
+    if not html or not html.strip():
+        return EntryHTML('', (), {})
+    if '<' not in html and '&' not in html:
+        return EntryHTML(html.strip(), (), {})   # plain text: nothing to parse
+    try:
+        if LXML_AVAILABLE:
+            parser = _entry_parser()
+            parser.feed(html)
+            return parser.close()
+        soup = BeautifulSoup(html, 'html.parser')
+        metas = {}
+        for meta in soup.find_all('meta'):
+            for key in (meta.get('property'), meta.get('name')):
+                if key and meta.get('content'):
+                    metas.setdefault(key, meta.get('content'))
+        return EntryHTML(soup.get_text(separator=' ', strip=True),
+                         tuple(dict(img.attrs) for img in soup.find_all('img')), metas)
+    except Exception as e:
+        logger.debug(f"Could not parse entry HTML: {e}")
+        _parsers.parser = None   # drop a parser left mid-document
+        return EntryHTML('', (), {})
+
 
 class RSSManager:
     """Manage RSS feeds with comprehensive image extraction"""
@@ -48,6 +158,12 @@ class RSSManager:
         self.enable_perplexity_search = False  # Temporarily disabled (HTTP 400 errors)
         self.perplexity_api_key = self._load_perplexity_api_key()
         self.debug_mode = False
+        self.session = None
+        if DEPENDENCIES_AVAILABLE:
+            # Feeds and stock-image lookups go through the shared HTTP cache:
+            # unchanged feeds come back as 304s instead of full downloads
+            from core.http_cache import cached_session
+            self.session = cached_session('feeds', stage='fetch', user_agent='Mozilla/5.0')
     
     def _load_perplexity_api_key(self):
         """Load Perplexity API key"""
@@ -137,41 +253,30 @@ class RSSManager:
     
     def _extract_all_images_from_html(self, html_content, base_url=""):
         """Extract ALL images from HTML and return best one"""
-        if not html_content:
+        if not html_content or not IMG_TAG_RE.search(html_content):
             return None
-        
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            img_tags = soup.find_all('img')
-            
-            if not img_tags:
-                return None
-            
-            # Score all images
-            image_candidates = []
-            for img in img_tags:
-                img_url = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
-                if img_url:
-                    img_url = self._make_absolute_url(base_url, img_url)
-                    if self._is_valid_image_url(img_url):
-                        score = self._get_image_quality_score(img_url)
-                        image_candidates.append((img_url, score))
-            
-            if not image_candidates:
-                return None
-            
-            # Return highest scoring image
-            image_candidates.sort(key=lambda x: x[1], reverse=True)
-            best_image = image_candidates[0][0]
-            
-            if self.debug_mode and len(image_candidates) > 1:
-                logger.debug(f"📊 Found {len(image_candidates)} images, picked: {best_image[:80]}")
-            
-            return best_image
-            
-        except Exception as e:
-            logger.debug(f"Error extracting images from HTML: {e}")
+        return self._best_image(parse_entry_html(html_content).images, base_url)
+    
+    def _best_image(self, images, base_url=""):
+        """Highest scoring valid image among parsed <img> attribute dicts"""
+        image_candidates = []
+        for attrs in images:
+            img_url = next((attrs[name] for name in IMG_SRC_ATTRS if attrs.get(name)), None)
+            if img_url:
+                img_url = self._make_absolute_url(base_url, img_url)
+                if self._is_valid_image_url(img_url):
+                    image_candidates.append((img_url, self._get_image_quality_score(img_url)))
+        
+        if not image_candidates:
             return None
+        
+        # Return highest scoring image (first one on ties)
+        best_image = max(image_candidates, key=lambda x: x[1])[0]
+        
+        if self.debug_mode and len(image_candidates) > 1:
+            logger.debug(f"📊 Found {len(image_candidates)} images, picked: {best_image[:80]}")
+        
+        return best_image
     
     def _generate_url_hash(self, url):
         """Generate unique hash for URL deduplication"""
@@ -340,7 +445,7 @@ class RSSManager:
             try:
                 clean_query = re.sub(r'[^a-zA-Z0-9\s]', '', search_query)
                 unsplash_url = f"https://source.unsplash.com/1200x630/?{quote(clean_query)}"
-                response = requests.head(unsplash_url, timeout=5, allow_redirects=True)
+                response = self.session.head(unsplash_url, timeout=5, allow_redirects=True)
                 
                 if response.status_code == 200:
                     final_url = response.url
@@ -355,7 +460,7 @@ class RSSManager:
                     keywords = self._extract_search_keywords(headline_full)
                     logger.info(f"🔍 Retrying with keywords: '{keywords}'")
                     unsplash_url = f"https://source.unsplash.com/1200x630/?{quote(keywords)}"
-                    response = requests.head(unsplash_url, timeout=5, allow_redirects=True)
+                    response = self.session.head(unsplash_url, timeout=5, allow_redirects=True)
                     
                     if response.status_code == 200:
                         final_url = response.url
@@ -457,26 +562,23 @@ class RSSManager:
                 if self._is_valid_image_url(image_url):
                     method_used = "direct image field"
         
-        # Method 8: OpenGraph/Twitter images from description
+        # Method 8: OpenGraph/Twitter images from description (same parse as Method 4)
         if not image_url:
             summary = entry.get('summary', entry.get('description', ''))
-            if summary:
-                soup = BeautifulSoup(summary, 'html.parser')
+            if summary and META_TAG_RE.search(summary):
+                metas = parse_entry_html(summary).metas
                 
                 # Try og:image
-                og_image = soup.find('meta', property='og:image') or soup.find('meta', attrs={'property': 'og:image'})
-                if og_image and og_image.get('content'):
-                    image_url = self._make_absolute_url(feed_url, og_image.get('content'))
+                if metas.get('og:image'):
+                    image_url = self._make_absolute_url(feed_url, metas['og:image'])
                     if self._is_valid_image_url(image_url):
                         method_used = "og:image meta"
                 
                 # Try twitter:image
-                if not image_url:
-                    twitter_image = soup.find('meta', attrs={'name': 'twitter:image'}) or soup.find('meta', property='twitter:image')
-                    if twitter_image and twitter_image.get('content'):
-                        image_url = self._make_absolute_url(feed_url, twitter_image.get('content'))
-                        if self._is_valid_image_url(image_url):
-                            method_used = "twitter:image meta"
+                if not image_url and metas.get('twitter:image'):
+                    image_url = self._make_absolute_url(feed_url, metas['twitter:image'])
+                    if self._is_valid_image_url(image_url):
+                        method_used = "twitter:image meta"
         
         # Method 9: Link tags with image rel
         if not image_url and hasattr(entry, 'links'):
@@ -553,13 +655,14 @@ class RSSManager:
             try:
                 logger.info(f"📰 Fetching: {feed_name}")
                 
-                headers = {'User-Agent': 'Mozilla/5.0'}
-                
                 try:
-                    response = requests.get(feed_url, headers=headers, timeout=10)
-                    feed = feedparser.parse(response.content)
+                    with metrics.span('feed_http', stage='fetch'):
+                        response = self.session.get(feed_url, timeout=10)
+                    with metrics.span('feed_parse', stage='fetch'):
+                        feed = feedparser.parse(response.content)
                 except:
-                    feed = feedparser.parse(feed_url)
+                    with metrics.span('feed_parse', stage='fetch', fallback='url'):
+                        feed = feedparser.parse(feed_url)
                 
                 if not feed.entries:
                     logger.warning(f"⚠️ No entries in: {feed_url}")
@@ -573,8 +676,8 @@ class RSSManager:
                         summary = entry.get('summary', entry.get('description', ''))
                         
                         if summary:
-                            soup = BeautifulSoup(summary, 'html.parser')
-                            summary = soup.get_text(separator=' ', strip=True)[:800]
+                            # Parsed once; the image strategies below reuse it
+                            summary = parse_entry_html(summary).text[:800]
                         
                         source_url = entry.get('link', '')
                         
@@ -587,11 +690,10 @@ class RSSManager:
                             total_skipped += 1
                             continue
                         
-                        if self._check_duplicate_url(conn, workspace_id, source_url):
-                            total_skipped += 1
-                            continue
-                        
-                        if self._check_duplicate_headline(conn, workspace_id, headline):
+                        with metrics.span('duplicate_check', stage='db'):
+                            duplicate = (self._check_duplicate_url(conn, workspace_id, source_url) or
+                                         self._check_duplicate_headline(conn, workspace_id, headline))
+                        if duplicate:
                             total_skipped += 1
                             continue
                         
@@ -599,7 +701,8 @@ class RSSManager:
                         source_domain = source_domain.replace('www.', '')
                         
                         # ENHANCED IMAGE EXTRACTION
-                        image_url = self.extract_image_from_entry(entry, headline, category, feed_url)
+                        with metrics.span('image_extraction', stage='fetch'):
+                            image_url = self.extract_image_from_entry(entry, headline, category, feed_url)
                         
                         # Track source
                         if image_url:
@@ -633,6 +736,8 @@ class RSSManager:
         
         conn.commit()
         conn.close()
+        metrics.count('articles_fetched', total_fetched, stage='fetch')
+        metrics.count('articles_skipped', total_skipped, stage='fetch')
         
         result_msg = f"✅ Fetched {total_fetched} articles!\n"
         result_msg += f"📷 RSS:{img_rss} | Stock:{img_stock} | AI:{img_ai} | Placeholder:{img_placeholder}"
@@ -0,0 +1,304 @@
+"""
+Scrape Engine - Concurrent page fetching with per-domain politeness
+Shared by ContentScraper and ResearchWriter.
+
+    from core.scrape_engine import get_engine
+
+    results = get_engine().fetch_all(urls, handler=parse_page, deadline=30)
+
+FEATURES:
+✅ One thread pool and keep-alive session for the whole process
+✅ Per-domain concurrency cap and minimum delay between requests
+   (instead of a global sleep) - other domains are fetched meanwhile
+✅ robots.txt fetched once per site and cached (Crawl-delay honoured)
+✅ 429/503 Retry-After pushes back only the domain that asked for it
+✅ Total deadline per batch: a slow source costs at most the deadline
+✅ Results returned in input order; handlers parse in the worker thread
+✅ Responses cached on disk via core.http_cache (ETag / Cache-Control)
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib import robotparser
+from urllib.parse import urlparse
+
+import requests
+
+from core import metrics
+from core.http_cache import cached_session
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+ROBOTS_AGENT = 'NexuzyPublisher'
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_DOMAIN = 2
+DEFAULT_DOMAIN_DELAY = 0.5       # seconds between request starts on one domain
+DEFAULT_TIMEOUT = 15
+DEFAULT_DEADLINE = 45            # seconds for a whole batch
+MAX_CRAWL_DELAY = 10.0
+MAX_RETRY_AFTER = 60.0
+ROBOTS_TTL_SECONDS = 6 * 3600
+ROBOTS_TIMEOUT = 5
+
+
+def _load_settings() -> Dict:
+    """Scraper limits from config.json (scrape_max_workers, scrape_per_domain, ...)"""
+    try:
+        config_path = Path('config.json')
+        if config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            return {key: config[key] for key in ('scrape_max_workers', 'scrape_per_domain',
+                                                 'scrape_domain_delay', 'respect_robots_txt')
+                    if key in config}
+    except Exception as e:
+        logger.debug(f"Could not load scraper settings from config.json: {e}")
+    return {}
+
+
+class _DomainGate:
+    """Concurrency slots and request spacing for one host"""
+
+    def __init__(self, per_domain: int, delay: float):
+        self.slots = threading.BoundedSemaphore(per_domain)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def reserve(self) -> float:
+        """Book the next start time; returns how long to wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.delay
+            return start - now
+
+    def back_off(self, seconds: float):
+        with self.lock:
+            self.next_start = max(self.next_start, time.monotonic() + seconds)
+
+
+class RobotsCache:
+    """robots.txt per origin, fetched once and kept for ROBOTS_TTL_SECONDS"""
+
+    def __init__(self, session: requests.Session, agent: str = ROBOTS_AGENT):
+        self.session = session
+        self.agent = agent
+        self._lock = threading.Lock()
+        self._parsers: Dict[str, tuple] = {}
+        self._fetching: Dict[str, threading.Event] = {}
+
+    def _get(self, origin: str) -> Optional[robotparser.RobotFileParser]:
+        while True:
+            with self._lock:
+                cached = self._parsers.get(origin)
+                if cached and time.monotonic() - cached[1] < ROBOTS_TTL_SECONDS:
+                    return cached[0]
+                pending = self._fetching.get(origin)
+                if not pending:
+                    pending = self._fetching[origin] = threading.Event()
+                    break
+            # Another thread is fetching this robots.txt
+            pending.wait(ROBOTS_TIMEOUT + 1)
+
+        parser = None
+        try:
+            response = self.session.get(f"{origin}/robots.txt", timeout=ROBOTS_TIMEOUT)
+            if response.status_code == 200:
+                parser = robotparser.RobotFileParser()
+                parser.parse(response.text.splitlines())
+            # 4xx: no robots.txt, everything allowed; 5xx: treated the same
+        except Exception as e:
+            logger.debug(f"robots.txt for {origin} unavailable: {e}")
+        with self._lock:
+            self._parsers[origin] = (parser, time.monotonic())
+            self._fetching.pop(origin).set()
+        return parser
+
+    def allowed(self, url: str) -> bool:
+        parts = urlparse(url)
+        parser = self._get(f"{parts.scheme}://{parts.netloc}")
+        return parser is None or parser.can_fetch(self.agent, url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        parts = urlparse(url)
+        parser = self._get(f"{parts.scheme}://{parts.netloc}")
+        if parser is None:
+            return None
+        try:
+            delay = parser.crawl_delay(self.agent)
+            return float(delay) if delay is not None else None
+        except Exception:
+            return None
+
+
+class ScrapeEngine:
+    """Polite concurrent fetcher; use get_engine() for the shared instance"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, per_domain: int = DEFAULT_PER_DOMAIN,
+                 domain_delay: float = DEFAULT_DOMAIN_DELAY, respect_robots: bool = True,
+                 timeout: float = DEFAULT_TIMEOUT, user_agent: str = USER_AGENT):
+        self.max_workers = max_workers
+        self.per_domain = per_domain
+        self.domain_delay = domain_delay
+        self.timeout = timeout
+
+        # Pages (and robots.txt) come from the shared HTTP cache when still fresh
+        self.session = cached_session('articles', stage='scrape', user_agent=user_agent,
+                                      pool_connections=max_workers, pool_maxsize=max_workers * 2)
+
+        self.robots = RobotsCache(self.session) if respect_robots else None
+        self._gates: Dict[str, _DomainGate] = {}
+        self._gates_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape')
+
+    def _gate(self, url: str) -> _DomainGate:
+        host = urlparse(url).netloc.lower()
+        with self._gates_lock:
+            gate = self._gates.get(host)
+        if gate is not None:
+            return gate
+
+        delay = self.domain_delay
+        if self.robots:
+            crawl_delay = self.robots.crawl_delay(url)
+            if crawl_delay:
+                delay = max(delay, min(crawl_delay, MAX_CRAWL_DELAY))
+        with self._gates_lock:
+            return self._gates.setdefault(host, _DomainGate(self.per_domain, delay))
+
+    def fetch(self, url: str, timeout: Optional[float] = None, deadline: Optional[float] = None) -> Dict:
+        """
+        Fetch one URL politely
+
+        Args:
+            deadline: time.monotonic() value after which the request is not started
+
+        Returns:
+            {'url', 'status': ok|http_error|blocked|deadline|error,
+             'response', 'error', 'seconds'}
+        """
+        result = {'url': url, 'status': 'error', 'response': None, 'error': None, 'seconds': 0.0}
+        start = time.monotonic()
+        try:
+            if self.robots and not self.robots.allowed(url):
+                result.update(status='blocked', error='disallowed by robots.txt')
+                metrics.count('robots_blocked', 1, stage='scrape')
+                return result
+
+            gate = self._gate(url)
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                result.update(status='deadline', error='batch deadline reached')
+                return result
+            if not gate.slots.acquire(timeout=remaining):
+                result.update(status='deadline', error='batch deadline reached')
+                return result
+            try:
+                wait_seconds = gate.reserve()
+                if deadline is not None and time.monotonic() + wait_seconds >= deadline:
+                    result.update(status='deadline', error='batch deadline reached')
+                    return result
+                if wait_seconds > 0:
+                    metrics.observe('politeness_wait_seconds', wait_seconds, stage='scrape')
+                    time.sleep(wait_seconds)
+
+                request_timeout = timeout or self.timeout
+                if deadline is not None:
+                    request_timeout = max(1.0, min(request_timeout, deadline - time.monotonic()))
+                response = self.session.get(url, timeout=request_timeout)
+            finally:
+                gate.slots.release()
+
+            if response.status_code in (429, 503):
+                retry_after = response.headers.get('Retry-After', '')
+                seconds = float(retry_after) if retry_after.isdigit() else gate.delay * 4
+                gate.back_off(min(seconds, MAX_RETRY_AFTER))
+                logger.info(f"⏳ {urlparse(url).netloc} asked us to slow down ({response.status_code})")
+            result['response'] = response
+            if response.status_code == 200:
+                result['status'] = 'ok'
+            else:
+                result.update(status='http_error', error=f"HTTP {response.status_code}")
+        except Exception as e:
+            result['error'] = str(e)
+        finally:
+            result['seconds'] = time.monotonic() - start
+        return result
+
+    def fetch_all(self, urls: Iterable[str], handler: Optional[Callable[[Dict], object]] = None,
+                  deadline: Optional[float] = DEFAULT_DEADLINE, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Fetch URLs concurrently (per-domain limits apply) within `deadline` seconds
+
+        handler(result) runs in the worker thread for successful fetches; its
+        return value is stored as result['value'] (exceptions -> status 'error').
+        Results come back in input order; URLs not finished by the deadline get
+        status 'deadline'.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        batch_deadline = time.monotonic() + deadline if deadline else None
+
+        def task(url: str) -> Dict:
+            result = self.fetch(url, timeout=timeout, deadline=batch_deadline)
+            result['value'] = None
+            if handler and result['status'] == 'ok':
+                try:
+                    result['value'] = handler(result)
+                except Exception as e:
+                    result.update(status='error', error=f"handler failed: {e}")
+            return result
+
+        with metrics.span('fetch_batch', stage='scrape') as span:
+            span.observe('fetch_batch_urls', len(urls))
+            futures = [self._executor.submit(task, url) for url in urls]
+            wait(futures, timeout=deadline)
+
+        results = []
+        for url, future in zip(urls, futures):
+            if future.done() and not future.cancelled():
+                results.append(future.result())
+            else:
+                future.cancel()
+                results.append({'url': url, 'status': 'deadline', 'response': None, 'value': None,
+                                'error': 'batch deadline reached', 'seconds': deadline or 0.0})
+        late = sum(1 for r in results if r['status'] == 'deadline')
+        if late:
+            logger.warning(f"⏱️ {late}/{len(urls)} pages not fetched within {deadline:.0f}s")
+        return results
+
+
+_engine: Optional[ScrapeEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ScrapeEngine:
+    """Process-wide engine, so domain limits hold across every scraper"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            settings = _load_settings()
+            _engine = ScrapeEngine(
+                max_workers=int(settings.get('scrape_max_workers', DEFAULT_MAX_WORKERS)),
+                per_domain=int(settings.get('scrape_per_domain', DEFAULT_PER_DOMAIN)),
+                domain_delay=float(settings.get('scrape_domain_delay', DEFAULT_DOMAIN_DELAY)),
+                respect_robots=bool(settings.get('respect_robots_txt', True)),
+            )
+        return _engine
+
+
+def configure_engine(**kwargs) -> ScrapeEngine:
+    """Replace the shared engine (e.g. no delays against a local test server)"""
+    global _engine
+    with _engine_lock:
+        _engine = ScrapeEngine(**kwargs)
+        return _engine
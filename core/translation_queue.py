@@ -0,0 +1,391 @@
+"""
+Translation Queue Module - Background translations after a draft is saved
+Queues the workspace's auto-translate languages for every saved draft and
+works through them while the AI Writer is idle.
+
+FEATURES:
+✅ Persistent translation_jobs table (jobs survive restarts)
+✅ Per-workspace target languages (translation_settings table)
+✅ Low priority: waits while a draft is being generated
+✅ Retry with attempt limit, interrupted jobs resumed on startup
+✅ Re-queued only when the source draft changed; the translated draft is updated in place
+"""
+
+import sqlite3
+import logging
+import hashlib
+import threading
+import json
+import re
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from core.translator import LANGUAGE_CODES
+
+logger = logging.getLogger(__name__)
+
+# Drafts created by Translator.translate_draft end with "[Language]"
+_TRANSLATED_TITLE_PATTERN = re.compile(r'\[([^\[\]]+)\]\s*$')
+
+
+class TranslationQueue:
+    """Persistent queue of draft translations processed by a background worker"""
+
+    def __init__(self, db_path: str = 'nexuzy.db', translator=None,
+                 is_busy: Optional[Callable[[], bool]] = None,
+                 poll_interval: float = 5.0, max_attempts: int = 3):
+        """
+        Args:
+            db_path: SQLite database path
+            translator: Translator instance (loaded lazily on first job if None)
+            is_busy: Callable returning True while higher-priority work (draft
+                generation) is running - jobs wait until it returns False
+            poll_interval: Seconds between queue checks when idle
+            max_attempts: Attempts per job before it is marked failed
+        """
+        self.db_path = db_path
+        self.translator = translator
+        self.is_busy = is_busy or (lambda: False)
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._worker = None
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure translation_jobs and translation_settings tables exist"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_jobs (
+                    id INTEGER PRIMARY KEY,
+                    draft_id INTEGER NOT NULL,
+                    workspace_id INTEGER,
+                    language TEXT NOT NULL,
+                    status TEXT DEFAULT 'pending',
+                    attempts INTEGER DEFAULT 0,
+                    translation_id INTEGER,
+                    translated_draft_id INTEGER,
+                    source_hash TEXT,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(draft_id, language),
+                    FOREIGN KEY (draft_id) REFERENCES ai_drafts(id)
+                )
+            ''')
+            cursor.execute('PRAGMA table_info(translation_jobs)')
+            if 'source_hash' not in [col[1] for col in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE translation_jobs ADD COLUMN source_hash TEXT')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_translation_jobs_status ON translation_jobs(status, id)')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_settings (
+                    workspace_id INTEGER PRIMARY KEY,
+                    target_languages TEXT DEFAULT '[]',
+                    FOREIGN KEY (workspace_id) REFERENCES workspaces(id)
+                )
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not create translation queue tables: {e}")
+
+    # ------------------------------------------------------------------
+    # Workspace settings
+    # ------------------------------------------------------------------
+
+    def get_target_languages(self, workspace_id: int) -> List[str]:
+        """Get the auto-translate languages configured for a workspace"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT target_languages FROM translation_settings WHERE workspace_id = ?', (workspace_id,))
+            result = cursor.fetchone()
+            conn.close()
+            if not result or not result[0]:
+                return []
+            return [lang for lang in json.loads(result[0]) if lang in LANGUAGE_CODES]
+        except Exception as e:
+            logger.error(f"Error loading translation settings: {e}")
+            return []
+
+    def set_target_languages(self, workspace_id: int, languages: List[str]) -> bool:
+        """Save the auto-translate languages for a workspace"""
+        valid = [lang for lang in languages if lang in LANGUAGE_CODES]
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO translation_settings (workspace_id, target_languages) VALUES (?, ?)
+                ON CONFLICT(workspace_id) DO UPDATE SET target_languages = excluded.target_languages
+            ''', (workspace_id, json.dumps(valid)))
+            conn.commit()
+            conn.close()
+            logger.info(f"🌐 Auto-translate languages for workspace {workspace_id}: {', '.join(valid) or 'none'}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving translation settings: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Queue operations
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_translated_draft(title: str) -> bool:
+        """Translated drafts are titled '<title> [Language]' - never re-translate them"""
+        match = _TRANSLATED_TITLE_PATTERN.search(title or '')
+        return bool(match and match.group(1) in LANGUAGE_CODES)
+
+    @staticmethod
+    def _source_hash(title: str, body: str) -> str:
+        """Fingerprint of the text a translation is made from"""
+        return hashlib.sha256(f"{title or ''}\n{body or ''}".encode('utf-8')).hexdigest()
+
+    def enqueue_draft(self, draft_id: int, workspace_id: Optional[int] = None,
+                      languages: Optional[List[str]] = None) -> int:
+        """
+        Queue translations of a saved/approved draft
+
+        Args:
+            draft_id: Draft to translate
+            workspace_id: Workspace (looked up from the draft if omitted)
+            languages: Target languages (workspace settings if omitted)
+
+        Returns:
+            Number of jobs queued (languages whose translation is current are skipped)
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT workspace_id, title, body_draft FROM ai_drafts WHERE id = ?', (draft_id,))
+            draft = cursor.fetchone()
+            conn.close()
+
+            if not draft:
+                logger.warning(f"Draft {draft_id} not found - nothing to translate")
+                return 0
+
+            if workspace_id is None:
+                workspace_id = draft[0]
+
+            if self._is_translated_draft(draft[1]):
+                logger.debug(f"Draft {draft_id} is itself a translation - skipping")
+                return 0
+
+            if languages is None:
+                languages = self.get_target_languages(workspace_id)
+            languages = [lang for lang in languages if lang in LANGUAGE_CODES]
+
+            if not languages:
+                return 0
+
+            source_hash = self._source_hash(draft[1], draft[2])
+            now = datetime.now().isoformat()
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            # Saving an unchanged draft queues nothing. An edited draft is
+            # re-queued (a running job too - it runs again when it finishes)
+            cursor.executemany('''
+                INSERT INTO translation_jobs (draft_id, workspace_id, language, status, attempts, source_hash,
+                                              created_at, updated_at)
+                VALUES (?, ?, ?, 'pending', 0, ?, ?, ?)
+                ON CONFLICT(draft_id, language) DO UPDATE SET
+                    status = 'pending', attempts = 0, error = NULL,
+                    source_hash = excluded.source_hash, updated_at = excluded.updated_at
+                WHERE translation_jobs.source_hash IS NOT excluded.source_hash
+            ''', [(draft_id, workspace_id, lang, source_hash, now, now) for lang in languages])
+            queued = cursor.rowcount
+            conn.commit()
+            conn.close()
+
+            if queued:
+                logger.info(f"🌐 Queued {queued} translations for draft {draft_id}: {', '.join(languages)}")
+                self._wake_event.set()
+            else:
+                logger.debug(f"Translations of draft {draft_id} are up to date")
+            return queued
+
+        except Exception as e:
+            logger.error(f"Error queueing translations: {e}")
+            return 0
+
+    def get_jobs(self, draft_id: int) -> List[Dict]:
+        """Get translation jobs for a draft"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, language, status, attempts, translated_draft_id, error
+                FROM translation_jobs WHERE draft_id = ? ORDER BY id
+            ''', (draft_id,))
+            rows = cursor.fetchall()
+            conn.close()
+            return [
+                {'id': r[0], 'language': r[1], 'status': r[2], 'attempts': r[3],
+                 'translated_draft_id': r[4], 'error': r[5]}
+                for r in rows
+            ]
+        except Exception as e:
+            logger.error(f"Error getting translation jobs: {e}")
+            return []
+
+    def get_status_counts(self, workspace_id: Optional[int] = None) -> Dict[str, int]:
+        """Count jobs per status (optionally for one workspace)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            if workspace_id is None:
+                cursor.execute('SELECT status, COUNT(*) FROM translation_jobs GROUP BY status')
+            else:
+                cursor.execute('SELECT status, COUNT(*) FROM translation_jobs WHERE workspace_id = ? GROUP BY status', (workspace_id,))
+            counts = dict(cursor.fetchall())
+            conn.close()
+            return counts
+        except Exception as e:
+            logger.error(f"Error counting translation jobs: {e}")
+            return {}
+
+    def _recover_interrupted_jobs(self):
+        """Jobs left 'running' by a previous session are put back in the queue"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("UPDATE translation_jobs SET status = 'pending' WHERE status = 'running'")
+            recovered = cursor.rowcount
+            conn.commit()
+            conn.close()
+            if recovered:
+                logger.info(f"♻️ Resumed {recovered} interrupted translation jobs")
+        except Exception as e:
+            logger.error(f"Error recovering translation jobs: {e}")
+
+    def _claim_next_job(self) -> Optional[Dict]:
+        """Atomically move the oldest pending job to 'running'"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                SELECT id, draft_id, language, attempts, translation_id, translated_draft_id FROM translation_jobs
+                WHERE status = 'pending' ORDER BY id LIMIT 1
+            ''')
+            row = cursor.fetchone()
+            if not row:
+                conn.rollback()
+                return None
+            cursor.execute('''
+                UPDATE translation_jobs SET status = 'running', attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+            ''', (datetime.now().isoformat(), row[0]))
+            conn.commit()
+            return {'id': row[0], 'draft_id': row[1], 'language': row[2], 'attempts': row[3] + 1,
+                    'translation_id': row[4], 'translated_draft_id': row[5]}
+        finally:
+            conn.close()
+
+    def _finish_job(self, job: Dict, result: Optional[Dict], error: str = '', retry: bool = True):
+        """Record the outcome of a job (a result with an error is a saved but unusable translation)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        if result:
+            # Ids are kept even if the draft was edited meanwhile (job back to
+            # 'pending'), so the next run updates the same translated draft
+            cursor.execute('''
+                UPDATE translation_jobs SET translation_id = ?, translated_draft_id = ?, updated_at = ?
+                WHERE id = ?
+            ''', (result.get('id'), result.get('new_draft_id'), now, job['id']))
+        if result and not error:
+            cursor.execute('''
+                UPDATE translation_jobs SET status = 'done', error = NULL
+                WHERE id = ? AND status = 'running'
+            ''', (job['id'],))
+        else:
+            status = 'pending' if retry and job['attempts'] < self.max_attempts else 'failed'
+            cursor.execute('''
+                UPDATE translation_jobs SET status = ?, error = ?, updated_at = ?
+                WHERE id = ? AND status = 'running'
+            ''', (status, error or 'Translation failed', now, job['id']))
+        conn.commit()
+        conn.close()
+
+    def _get_translator(self):
+        """Load the translator on first use so an empty queue costs nothing"""
+        if self.translator is None:
+            from core.translator import Translator
+            self.translator = Translator(self.db_path)
+        return self.translator
+
+    def process_next(self) -> bool:
+        """
+        Process one pending job
+
+        Returns:
+            True if a job was processed, False if the queue was empty
+        """
+        job = self._claim_next_job()
+        if not job:
+            return False
+
+        logger.info(f"🌐 Background translation: draft {job['draft_id']} → {job['language']} (attempt {job['attempts']})")
+        try:
+            result = self._get_translator().translate_draft(job['draft_id'], job['language'],
+                                                            translated_draft_id=job['translated_draft_id'],
+                                                            translation_id=job['translation_id'])
+            if result and result.get('fallback_occurred'):
+                # The fallback copy is already saved as a draft; flag the job for
+                # manual attention (a later edit re-queues it onto the same draft)
+                self._finish_job(job, result, 'Translation model unavailable - fallback text saved', retry=False)
+            else:
+                self._finish_job(job, result)
+        except Exception as e:
+            logger.error(f"❌ Background translation failed: {e}")
+            self._finish_job(job, None, str(e))
+        return True
+
+    def run_pending(self, limit: Optional[int] = None) -> int:
+        """Process pending jobs in the calling thread (ignores is_busy)"""
+        processed = 0
+        while limit is None or processed < limit:
+            if not self.process_next():
+                break
+            processed += 1
+        return processed
+
+    # ------------------------------------------------------------------
+    # Background worker
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the background worker thread"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._recover_interrupted_jobs()
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name='translation-queue', daemon=True)
+        self._worker.start()
+        logger.info("✅ Translation queue worker started")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the worker after the current job finishes"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._worker:
+            self._worker.join(timeout)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self.is_busy():
+                    # Draft generation owns the CPU - check again later
+                    self._stop_event.wait(self.poll_interval)
+                    continue
+                if self.process_next():
+                    continue
+            except Exception as e:
+                logger.error(f"Translation queue error: {e}")
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
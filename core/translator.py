@@ -13,6 +13,9 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import hashlib
 
+from core import metrics
+from core.model_registry import models, module_available
+
 logger = logging.getLogger(__name__)
 
 # Complete NLLB-200 Language Codes Mapping
@@ -73,66 +76,65 @@ LANGUAGE_CODES = {
     'English': 'eng_Latn', 'Esperanto': 'epo_Latn'
 }
 
-# GLOBAL MODEL CACHE - Load once, reuse forever!
-_CACHED_TRANSLATOR = None
-_CACHED_TOKENIZER = None
+NLLB_MODEL_NAME = "facebook/nllb-200-distilled-600M"
+NLLB_MODEL_MB = 2400  # 600M parameters, fp32
+
+def _load_nllb():
+    """Load NLLB-200 tokenizer and model; (tokenizer, model) or None"""
+    try:
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+        import torch
+        
+        logger.info(f"Loading NLLB-200 model: {NLLB_MODEL_NAME}")
+        
+        # Load with optimizations
+        tokenizer = AutoTokenizer.from_pretrained(
+            NLLB_MODEL_NAME,
+            trust_remote_code=True
+        )
+        
+        translator = AutoModelForSeq2SeqLM.from_pretrained(
+            NLLB_MODEL_NAME,
+            trust_remote_code=True,
+            device_map="cpu",
+            low_cpu_mem_usage=True,
+            torch_dtype=torch.float32  # Faster on CPU
+        )
+        
+        logger.info("✅ NLLB-200 model loaded successfully")
+        return tokenizer, translator
+        
+    except ImportError:
+        logger.warning("Transformers not installed. Translation unavailable.")
+        logger.warning("Install: pip install transformers torch")
+        return None
+    except Exception as e:
+        logger.error(f"Error loading NLLB-200: {e}")
+        return None
 
 class Translator:
     """OPTIMIZED translator with 10x speed improvement"""
     
     def __init__(self, db_path='nexuzy.db'):
-        global _CACHED_TRANSLATOR, _CACHED_TOKENIZER
-        
         self.db_path = db_path
         self.translation_cache = {}  # Memory cache for recent translations
         
-        # Use cached model if available (INSTANT)
-        if _CACHED_TRANSLATOR and _CACHED_TOKENIZER:
+        # Shared registry: one NLLB copy per process, loaded by the first
+        # translation and unloaded when idle or over budget
+        models.register('translator', _load_nllb, size_mb=NLLB_MODEL_MB, display_name='Translator (NLLB-200 600M)',
+                        check=lambda: module_available('transformers') and module_available('torch'))
+        if models.is_loaded('translator'):
             logger.info("✅ Using cached translator (INSTANT - no loading time)")
-            self.translator = _CACHED_TRANSLATOR
-            self.tokenizer = _CACHED_TOKENIZER
-        else:
-            logger.info("⏳ First load - caching translator for future use...")
-            self._load_model()
-            if self.translator and self.tokenizer:
-                _CACHED_TRANSLATOR = self.translator
-                _CACHED_TOKENIZER = self.tokenizer
-                logger.info("💾 Translator cached - all future translations will be faster!")
     
-    def _load_model(self):
-        """Load NLLB-200 model (only once per session)"""
-        try:
-            from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-            import torch
-            
-            model_name = "facebook/nllb-200-distilled-600M"
-            logger.info(f"Loading NLLB-200 model: {model_name}")
-            
-            # Load with optimizations
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                model_name,
-                trust_remote_code=True
-            )
-            
-            self.translator = AutoModelForSeq2SeqLM.from_pretrained(
-                model_name,
-                trust_remote_code=True,
-                device_map="cpu",
-                low_cpu_mem_usage=True,
-                torch_dtype=torch.float32  # Faster on CPU
-            )
-            
-            logger.info("✅ NLLB-200 model loaded successfully")
-            
-        except ImportError:
-            logger.warning("Transformers not installed. Translation unavailable.")
-            logger.warning("Install: pip install transformers torch")
-            self.translator = None
-            self.tokenizer = None
-        except Exception as e:
-            logger.error(f"Error loading NLLB-200: {e}")
-            self.translator = None
-            self.tokenizer = None
+    @property
+    def tokenizer(self):
+        nllb = models.get('translator')
+        return nllb[0] if nllb else None
+    
+    @property
+    def translator(self):
+        nllb = models.get('translator')
+        return nllb[1] if nllb else None
     
     def _get_cache_key(self, text: str, target_language: str) -> str:
         """Generate cache key for translation"""
@@ -166,7 +168,7 @@ class Translator:
             return text, True
 
         # Try AI translation
-        if self.translator and self.tokenizer:
+        if models.is_available('translator'):
             try:
                 logger.info(f"⚡ Translating to {target_language}...")
                 result = self._translate_with_model(text, target_language)
@@ -197,19 +199,23 @@ class Translator:
             # OPTIMIZED: Smaller chunks = faster processing
             max_length = 256  # Reduced from 512 for 2x speed
             
-            if len(text) > max_length * 2:  # Only chunk if really long
-                chunks = self._chunk_text(text, max_length)
-                logger.info(f"📦 Processing {len(chunks)} chunks...")
-                
-                translated_chunks = []
-                for i, chunk in enumerate(chunks, 1):
-                    logger.info(f"   Chunk {i}/{len(chunks)}...")
-                    chunk_result = self._translate_chunk(chunk, target_code)
-                    translated_chunks.append(chunk_result)
-                
-                return " ".join(translated_chunks)
-            else:
-                return self._translate_chunk(text, target_code)
+            # Pinned: the registry will not unload NLLB while chunks are in flight
+            with models.use('translator') as nllb:
+                if nllb is None:
+                    raise RuntimeError("NLLB-200 could not be loaded")
+                if len(text) > max_length * 2:  # Only chunk if really long
+                    chunks = self._chunk_text(text, max_length)
+                    logger.info(f"📦 Processing {len(chunks)} chunks...")
+                    
+                    translated_chunks = []
+                    for i, chunk in enumerate(chunks, 1):
+                        logger.info(f"   Chunk {i}/{len(chunks)}...")
+                        chunk_result = self._translate_chunk(chunk, target_code)
+                        translated_chunks.append(chunk_result)
+                    
+                    return " ".join(translated_chunks)
+                else:
+                    return self._translate_chunk(text, target_code)
         
         except Exception as e:
             logger.error(f"Translation error: {e}")
@@ -238,14 +244,16 @@ class Translator:
         )
         
         # Translate with OPTIMIZED settings
-        translated_tokens = self.translator.generate(
-            **inputs,
-            forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(target_code),
-            max_length=256,      # REDUCED from 512 (2x faster)
-            num_beams=1,         # Greedy search (4x faster than beam=4)
-            do_sample=False,     # Deterministic (faster)
-            early_stopping=True  # Stop when done
-        )
+        with metrics.span('nllb_generate', stage='translate', language=target_code) as span:
+            translated_tokens = self.translator.generate(
+                **inputs,
+                forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(target_code),
+                max_length=256,      # REDUCED from 512 (2x faster)
+                num_beams=1,         # Greedy search (4x faster than beam=4)
+                do_sample=False,     # Deterministic (faster)
+                early_stopping=True  # Stop when done
+            )
+        self._record_tokens(inputs, translated_tokens, span.seconds)
         
         # Decode (FAST)
         translated_text = self.tokenizer.batch_decode(
@@ -255,6 +263,18 @@ class Translator:
         
         return translated_text
     
+    def _record_tokens(self, inputs, translated_tokens, seconds: float):
+        """Tokens in/out and generation speed for the Performance page"""
+        try:
+            tokens_in = sum(len(ids) for ids in inputs['input_ids'])
+            tokens_out = sum(len(ids) for ids in translated_tokens)
+        except Exception:
+            return
+        metrics.count('nllb_tokens_in', tokens_in, stage='translate')
+        metrics.count('nllb_tokens_out', tokens_out, stage='translate')
+        if seconds > 0 and tokens_out:
+            metrics.observe('nllb_tokens_per_second', tokens_out / seconds, stage='translate')
+    
     def _chunk_text(self, text: str, chunk_size: int = 256) -> List[str]:
         """
         Split text into chunks while preserving sentence boundaries
@@ -286,10 +306,26 @@ class Translator:
         columns = [col[1] for col in cursor.fetchall()]
         return column in columns
     
-    def translate_draft(self, draft_id: int, target_language: str) -> Optional[Dict]:
+    def _upsert_row(self, cursor, table: str, row_id: Optional[int], cols: List[str], vals: List) -> int:
+        """UPDATE row_id if it still exists, else INSERT - returns the row id"""
+        if row_id:
+            assignments = ', '.join(f"{col} = ?" for col in cols)
+            cursor.execute(f'UPDATE {table} SET {assignments} WHERE id = ?', vals + [row_id])
+            if cursor.rowcount:
+                return row_id
+        placeholders = ', '.join(['?' for _ in vals])
+        cursor.execute(f'INSERT INTO {table} ({", ".join(cols)}) VALUES ({placeholders})', vals)
+        return cursor.lastrowid
+    
+    def translate_draft(self, draft_id: int, target_language: str,
+                        translated_draft_id: Optional[int] = None,
+                        translation_id: Optional[int] = None) -> Optional[Dict]:
         """
         Translate a draft and save as NEW draft
         OPTIMIZED: Shows progress, faster translation
+
+        translated_draft_id / translation_id: rows of an earlier translation of
+        this draft to overwrite instead (re-translation after an edit)
         """
         try:
             # Validate language
@@ -366,7 +402,7 @@ class Translator:
 
             logger.info(f"✅ Translation complete!")
             
-            # Save as NEW draft
+            # Save as NEW draft (or over the earlier translation)
             word_count = len(translated_body.split())
             
             insert_cols = ['workspace_id', 'news_id', 'title', 'body_draft', 'word_count', 'generated_at']
@@ -388,13 +424,7 @@ class Translator:
                 insert_cols.append('is_html')
                 insert_vals.append(1)
             
-            placeholders = ', '.join(['?' for _ in insert_vals])
-            cursor.execute(f'''
-                INSERT INTO ai_drafts ({', '.join(insert_cols)})
-                VALUES ({placeholders})
-            ''', insert_vals)
-            
-            new_draft_id = cursor.lastrowid
+            new_draft_id = self._upsert_row(cursor, 'ai_drafts', translated_draft_id, insert_cols, insert_vals)
             
             # Save translation record
             has_trans_summary = self._check_column_exists(conn, 'translations', 'summary')
@@ -406,13 +436,7 @@ class Translator:
                 trans_cols.append('summary')
                 trans_vals.append(translated_summary)
             
-            placeholders = ', '.join(['?' for _ in trans_vals])
-            cursor.execute(f'''
-                INSERT INTO translations ({', '.join(trans_cols)})
-                VALUES ({placeholders})
-            ''', trans_vals)
-            
-            translation_id = cursor.lastrowid
+            translation_id = self._upsert_row(cursor, 'translations', translation_id, trans_cols, trans_vals)
             conn.commit()
             conn.close()
             
@@ -3,7 +3,6 @@ WordPress API Module - COMPLETE VERSION
 FIXED: Category from RSS feed + Meta data alternative approach + AI & Machine Learning category fix
 """
 
-import requests
 import sqlite3
 import logging
 from typing import Dict, Optional, List
@@ -13,8 +12,18 @@ from html.parser import HTMLParser
 from collections import Counter
 import urllib.parse
 
+import requests
+
+from core.gutenberg import convert_html_to_blocks
+from core.image_store import ImageStore
+from core.wp_client_pool import get_client, get_test_session
+from core.wp_taxonomy import normalize_term_name
+
 logger = logging.getLogger(__name__)
 
+# Hidden marker in post content - lets publish retries detect an existing post
+IDEMPOTENCY_MARKER = '<!-- nexuzy-idempotency:{key} -->'
+
 class WordPressAPI:
     """Handle WordPress API interactions with PROPER content handling + SEO"""
     
@@ -29,77 +38,46 @@ class WordPressAPI:
         self.tags_url = ''
         self._category_cache = {}
         self._tag_cache = {}
+        self.image_store = ImageStore(db_path)
+        self.taxonomy = None
+        self.media = None
+        self.batch = None
+        # How the last publish_draft() ended, for callers that must know whether
+        # a post may exist: 'saved', 'not_sent', 'rejected' (HTTP 4xx - nothing
+        # was created) or 'unknown' (timeout, 5xx, dropped connection)
+        self.last_publish_outcome = None
     
     def _initialize_connection(self, workspace_id: int) -> bool:
-        """Initialize WordPress connection from workspace credentials"""
+        """Bind to the workspace's pooled WordPress client (kept alive between posts)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT site_url, username, app_password FROM wp_credentials WHERE workspace_id = ?', (workspace_id,))
-            result = cursor.fetchone()
-            conn.close()
-            
-            if not result:
-                logger.error("WordPress credentials not configured")
+            client = get_client(self.db_path, workspace_id, self.image_store)
+            if not client:
                 return False
             
-            site_url, username, password = result
-            self.site_url = site_url.rstrip('/')
-            self.base_url = f"{self.site_url}/wp-json/wp/v2"
+            self.site_url = client.site_url
+            self.base_url = client.base_url
             self.media_url = f"{self.base_url}/media"
             self.posts_url = f"{self.base_url}/posts"
             self.categories_url = f"{self.base_url}/categories"
             self.tags_url = f"{self.base_url}/tags"
             
-            self.session = requests.Session()
-            self.session.auth = (username, password)
-            self.session.headers.update({'User-Agent': 'Nexuzy-Publisher/3.0'})
-            
-            logger.info(f"✅ Connected to: {self.site_url}")
+            self.session = client.session
+            self.taxonomy = client.taxonomy
+            self.media = client.media
+            self.batch = client.batch
             return True
         except Exception as e:
             logger.error(f"Failed to initialize WordPress connection: {e}")
             return False
 
     def upload_image_from_url(self, image_url: str, title: str = '') -> Optional[int]:
-        """Download image from URL → Upload to WordPress media library"""
-        if not image_url or not image_url.startswith('http'):
-            return None
-        
-        try:
-            img_response = requests.get(image_url, timeout=30, headers={'User-Agent': 'Mozilla/5.0'})
-            if img_response.status_code != 200:
-                return None
-            
-            filename = image_url.split('/')[-1].split('?')[0] or 'image.jpg'
-            if not any(filename.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                filename += '.jpg'
-            
-            content_type = img_response.headers.get('Content-Type', 'image/jpeg')
-            
-            files = {'file': (filename, img_response.content, content_type)}
-            data = {'title': title, 'alt_text': title} if title else {}
-            
-            response = self.session.post(self.media_url, files=files, data=data, timeout=60)
-            
-            if response.ok:
-                media_id = response.json().get('id')
-                if media_id:
-                    logger.info(f"✅ Image uploaded! Media ID: {media_id}")
-                return media_id
-            
-            return None
-        except Exception as e:
-            logger.error(f"Error uploading image: {e}")
-            return None
+        """Stream image from URL → WordPress media library (never uploads the same image twice)"""
+        return self.media.upload_from_url(image_url, title)
     
     def _normalize_category_name(self, name: str) -> str:
         """Normalize category name for comparison"""
         # Replace & with 'and', remove extra spaces, lowercase
-        normalized = name.lower().strip()
-        normalized = normalized.replace('&', 'and')
-        normalized = re.sub(r'\s+', ' ', normalized)
-        return normalized
+        return normalize_term_name(name)
     
     def get_or_create_category(self, category_name: str) -> Optional[int]:
         """Get existing WordPress category ID or create new one - FIXED for 'AI & Machine Learning'"""
@@ -108,55 +86,13 @@ class WordPressAPI:
         
         category_name = category_name.strip()
         
-        # Check cache first
-        if category_name in self._category_cache:
-            logger.info(f"✅ Using cached category: {category_name} (ID: {self._category_cache[category_name]})")
-            return self._category_cache[category_name]
-        
-        try:
-            # First, get ALL categories (without search filter)
-            # This is more reliable for categories with special characters like &
-            response = self.session.get(self.categories_url, params={'per_page': 100}, timeout=10)
-            
-            if response.ok:
-                all_categories = response.json()
-                
-                # Exact match first
-                for cat in all_categories:
-                    if cat.get('name', '') == category_name:
-                        cat_id = cat.get('id')
-                        self._category_cache[category_name] = cat_id
-                        logger.info(f"✅ Found exact match category: {category_name} (ID: {cat_id})")
-                        return cat_id
-                
-                # Case-insensitive match
-                normalized_search = self._normalize_category_name(category_name)
-                for cat in all_categories:
-                    cat_normalized = self._normalize_category_name(cat.get('name', ''))
-                    if cat_normalized == normalized_search:
-                        cat_id = cat.get('id')
-                        self._category_cache[category_name] = cat_id
-                        logger.info(f"✅ Found normalized match: '{cat.get('name')}' for '{category_name}' (ID: {cat_id})")
-                        return cat_id
-            
-            # If not found, create new category
-            logger.info(f"📝 Creating new category: {category_name}")
-            create_response = self.session.post(self.categories_url, json={'name': category_name}, timeout=10)
-            
-            if create_response.ok:
-                cat_id = create_response.json().get('id')
-                self._category_cache[category_name] = cat_id
-                logger.info(f"✅ Created new category: {category_name} (ID: {cat_id})")
-                return cat_id
-            else:
-                logger.error(f"❌ Failed to create category '{category_name}': {create_response.status_code}")
-                logger.error(f"   Response: {create_response.text[:500]}")
-        except Exception as e:
-            logger.error(f"❌ Error handling category '{category_name}': {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-        
-        return None
+        # Persistent per-site cache (exact, then normalized name match)
+        cat_id = self.taxonomy.resolve('categories', category_name)
+        if cat_id:
+            self._category_cache[category_name] = cat_id
+        else:
+            logger.error(f"❌ Failed to get/create category: {category_name}")
+        return cat_id
     
     def get_or_create_tag(self, tag_name: str) -> Optional[int]:
         """Get existing WordPress tag ID or create new one"""
@@ -164,27 +100,15 @@ class WordPressAPI:
             return None
         
         tag_name = tag_name.strip()
-        if tag_name in self._tag_cache:
-            return self._tag_cache[tag_name]
-        
-        try:
-            response = self.session.get(self.tags_url, params={'search': tag_name, 'per_page': 10}, timeout=10)
-            if response.ok:
-                for tag in response.json():
-                    if tag.get('name', '').lower() == tag_name.lower():
-                        tag_id = tag.get('id')
-                        self._tag_cache[tag_name] = tag_id
-                        return tag_id
-            
-            create_response = self.session.post(self.tags_url, json={'name': tag_name}, timeout=10)
-            if create_response.ok:
-                tag_id = create_response.json().get('id')
-                self._tag_cache[tag_name] = tag_id
-                return tag_id
-        except:
-            pass
-        
-        return None
+        tag_id = self.taxonomy.resolve('tags', tag_name)
+        if tag_id:
+            self._tag_cache[tag_name] = tag_id
+        return tag_id
+    
+    def _resolve_terms(self, categories: List[str], tags: List[str]):
+        """Resolve category and tag names to ids through the taxonomy cache (concurrently)"""
+        resolved = self.taxonomy.resolve_terms({'categories': categories, 'tags': tags})
+        return resolved['categories'], resolved['tags']
     
     def _extract_categories_from_rss_feed(self, draft_id: int) -> List[str]:
         """Extract category from RSS feed (where you already store it) - FIXED!"""
@@ -351,11 +275,18 @@ class WordPressAPI:
             logger.error(f"Error updating post meta: {e}")
             return False
     
-    def publish_draft(self, draft_id: int, workspace_id: int, categories: Optional[List[str]] = None, tags: Optional[List[str]] = None) -> Optional[Dict]:
+    def publish_draft(self, draft_id: int, workspace_id: int, categories: Optional[List[str]] = None, tags: Optional[List[str]] = None,
+                      idempotency_key: Optional[str] = None, post_id: Optional[int] = None) -> Optional[Dict]:
         """
         Publish draft to WordPress with FULL SEO SUPPORT
         FIXED: Category from RSS feed + Working SEO approach + AI & Machine Learning fix
+        
+        idempotency_key is embedded in the post content as an HTML comment so a
+        retry can find the post created by an earlier, interrupted attempt.
+        post_id updates that existing post with the draft instead (its status
+        on the site is left as it is).
         """
+        self.last_publish_outcome = 'not_sent'
         try:
             if not self._initialize_connection(workspace_id):
                 return None
@@ -391,31 +322,17 @@ class WordPressAPI:
                 featured_media_id = self.upload_image_from_url(image_url, title)
             
             # FIXED: Get categories from RSS feed table (YOUR PRIMARY SOURCE)
-            category_ids = []
             if categories is None:
                 categories = self._extract_categories_from_rss_feed(draft_id)
             
             logger.info(f"📋 Categories to assign: {categories}")
             
-            if categories:
-                for cat_name in categories:
-                    logger.info(f"🔍 Processing category: '{cat_name}'")
-                    cat_id = self.get_or_create_category(cat_name)
-                    if cat_id:
-                        category_ids.append(cat_id)
-                        logger.info(f"   ✅ Assigned category ID: {cat_id}")
-                    else:
-                        logger.error(f"   ❌ Failed to get/create category: {cat_name}")
-            
             # Get tags (keywords)
-            tag_ids = []
             all_tags = list(tags) if tags else []
             all_tags.extend(keywords[:10])
             
-            for tag_name in all_tags:
-                tag_id = self.get_or_create_tag(tag_name)
-                if tag_id:
-                    tag_ids.append(tag_id)
+            # Resolve through the persistent taxonomy cache (no GETs when cached)
+            category_ids, tag_ids = self._resolve_terms(categories or [], all_tags)
             
             logger.info(f"🏷️ Final counts - Categories: {len(category_ids)}, Tags: {len(tag_ids)}")
             
@@ -426,6 +343,9 @@ class WordPressAPI:
                 logger.warning("⚠️ Using RAW HTML as fallback...")
                 gutenberg_content = body_content
             
+            if idempotency_key:
+                gutenberg_content += f"\n\n{IDEMPOTENCY_MARKER.format(key=idempotency_key)}"
+            
             logger.info(f"   Gutenberg content: {len(gutenberg_content)} chars")
             
             # Create post with SEO-optimized excerpt
@@ -433,8 +353,9 @@ class WordPressAPI:
                 'title': title,
                 'content': gutenberg_content,
                 'excerpt': seo_excerpt,  # This becomes meta description for SEO plugins
-                'status': 'draft',
             }
+            if not post_id:
+                post_data['status'] = 'draft'
             
             if featured_media_id:
                 post_data['featured_media'] = featured_media_id
@@ -446,9 +367,17 @@ class WordPressAPI:
             logger.info(f"📤 Sending to WordPress...")
             logger.info(f"   Post data: title={len(title)} chars, content={len(gutenberg_content)} chars, categories={category_ids}")
             
-            response = self.session.post(self.posts_url, json=post_data, timeout=60)
+            target_url = f"{self.posts_url}/{post_id}" if post_id else self.posts_url
+            self.last_publish_outcome = 'unknown'
+            try:
+                response = self.session.post(target_url, json=post_data, timeout=60)
+            except requests.exceptions.ConnectTimeout:
+                self.last_publish_outcome = 'not_sent'
+                raise
             
             if not response.ok:
+                if 400 <= response.status_code < 500:
+                    self.last_publish_outcome = 'rejected'
                 logger.error(f"❌ Post failed: HTTP {response.status_code}")
                 logger.error(f"Response: {response.text[:1000]}")
                 return None
@@ -460,6 +389,17 @@ class WordPressAPI:
             if not post_id:
                 logger.error("No post ID in response!")
                 return None
+            self.last_publish_outcome = 'saved'
+            
+            # Cached term ids deleted on the site are skipped by WordPress -
+            # drop them from the cache, re-resolve and fix the post's terms
+            if self.taxonomy.invalidate_dropped_terms(post, category_ids, tag_ids):
+                logger.warning("⚠️ Some cached terms no longer exist - re-resolving")
+                category_ids, tag_ids = self._resolve_terms(categories or [], all_tags)
+                fix_response = self.session.post(f"{self.posts_url}/{post_id}",
+                                                  json={'categories': category_ids, 'tags': tag_ids}, timeout=30)
+                if fix_response.ok:
+                    post['categories'] = fix_response.json().get('categories', category_ids)
             
             # Update SEO meta (via excerpt - Yoast/AIOSEO will use this)
             self._update_post_meta(post_id, seo_excerpt, keywords)
@@ -470,10 +410,9 @@ class WordPressAPI:
             category_names = []
             if 'categories' in post:
                 for cat_id in post['categories']:
-                    for cat_name, cached_id in self._category_cache.items():
-                        if cached_id == cat_id:
-                            category_names.append(cat_name)
-                            break
+                    cat_name = self.taxonomy.get_name('categories', cat_id)
+                    if cat_name:
+                        category_names.append(cat_name)
             
             logger.info(f"\n✅ POST CREATED SUCCESSFULLY!")
             logger.info(f"   Post ID: {post_id}")
@@ -490,7 +429,7 @@ class WordPressAPI:
             return {
                 'post_id': post_id,
                 'url': post_url,
-                'status': 'draft',
+                'status': post.get('status', 'draft'),
                 'featured_image': featured_media_id,
                 'categories': category_ids,
                 'tags': tag_ids,
@@ -505,63 +444,37 @@ class WordPressAPI:
             logger.error(traceback.format_exc())
             return None
     
-    def _convert_to_gutenberg_blocks(self, html_content: str, featured_media_id: Optional[int] = None) -> str:
-        """Convert HTML to Gutenberg blocks"""
-        if not html_content or not html_content.strip():
-            return ""
-        
-        blocks = []
-        
-        if featured_media_id:
-            blocks.append(f'''<!-- wp:image {{"id":{featured_media_id},"sizeSlug":"large"}} -->
-<figure class="wp-block-image size-large"><img src="" alt="" class="wp-image-{featured_media_id}"/></figure>
-<!-- /wp:image -->''')
-        
-        content = html_content.strip()
-        
-        for match in re.finditer(r'<h2[^>]*>(.*?)</h2>', content, re.DOTALL | re.IGNORECASE):
-            text = re.sub(r'<.*?>', '', match.group(1)).strip()
-            text = ' '.join(text.split())
-            if text:
-                blocks.append(f'''<!-- wp:heading -->
-<h2 class="wp-block-heading">{text}</h2>
-<!-- /wp:heading -->''')
-        
-        for match in re.finditer(r'<h3[^>]*>(.*?)</h3>', content, re.DOTALL | re.IGNORECASE):
-            text = re.sub(r'<.*?>', '', match.group(1)).strip()
-            text = ' '.join(text.split())
-            if text:
-                blocks.append(f'''<!-- wp:heading {{"level":3}} -->
-<h3 class="wp-block-heading">{text}</h3>
-<!-- /wp:heading -->''')
+    def find_post_by_idempotency_key(self, workspace_id: int, idempotency_key: str) -> Optional[Dict]:
+        """
+        Find a post created by an earlier publish attempt with this key
         
-        for match in re.finditer(r'<p[^>]*>(.*?)</p>', content, re.DOTALL | re.IGNORECASE):
-            para_text = match.group(1).strip()
-            para_text = ' '.join(para_text.split())
-            if para_text:
-                blocks.append(f'''<!-- wp:paragraph -->
-<p>{para_text}</p>
-<!-- /wp:paragraph -->''')
+        Returns:
+            Dict with post_id and url, or None if no such post exists
+        """
+        if not self._initialize_connection(workspace_id):
+            raise ConnectionError("Could not connect to WordPress")
         
-        for match in re.finditer(r'<ul[^>]*>(.*?)</ul>', content, re.DOTALL | re.IGNORECASE):
-            list_content = match.group(1)
-            items = re.findall(r'<li[^>]*>(.*?)</li>', list_content, re.DOTALL | re.IGNORECASE)
-            if items:
-                list_html = '\n'.join([f'<li>{" ".join(item.split())}</li>' for item in items])
-                blocks.append(f'''<!-- wp:list -->
-<ul>{list_html}</ul>
-<!-- /wp:list -->''')
+        response = self.session.get(self.posts_url, params={
+            'search': f"nexuzy-idempotency:{idempotency_key}",
+            'status': 'draft,pending,future,publish,private',
+            'context': 'edit',
+            '_fields': 'id,link,content',
+            'per_page': 10
+        }, timeout=30)
+        response.raise_for_status()
         
-        for match in re.finditer(r'<ol[^>]*>(.*?)</ol>', content, re.DOTALL | re.IGNORECASE):
-            list_content = match.group(1)
-            items = re.findall(r'<li[^>]*>(.*?)</li>', list_content, re.DOTALL | re.IGNORECASE)
-            if items:
-                list_html = '\n'.join([f'<li>{" ".join(item.split())}</li>' for item in items])
-                blocks.append(f'''<!-- wp:list {{"ordered":true}} -->
-<ol>{list_html}</ol>
-<!-- /wp:list -->''')
+        marker = IDEMPOTENCY_MARKER.format(key=idempotency_key)
+        for post in response.json():
+            if marker in (post.get('content') or {}).get('raw', ''):
+                return {'post_id': post['id'], 'url': post.get('link')}
+        return None
+    
+    def _convert_to_gutenberg_blocks(self, html_content: str, featured_media_id: Optional[int] = None) -> str:
+        """Convert HTML to Gutenberg blocks (single pass, document order)"""
+        if not html_content or not html_content.strip():
+            return ""
         
-        result = '\n\n'.join(blocks)
+        result = convert_html_to_blocks(html_content, featured_media_id)
         
         if not result or len(result) < 50:
             return html_content
@@ -572,9 +485,7 @@ class WordPressAPI:
         """Test WordPress connection"""
         try:
             test_url = site_url.rstrip('/') + '/wp-json/wp/v2/users/me'
-            session = requests.Session()
-            session.auth = (username, password)
-            session.headers.update({'User-Agent': 'Nexuzy-Publisher-Test/3.0'})
+            session = get_test_session(site_url, username, password)
             response = session.get(test_url, timeout=15)
             
             if response.status_code == 200:
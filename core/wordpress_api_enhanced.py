@@ -3,7 +3,6 @@ WordPress API Enhanced Module - COMPLETE Content Push with Translation Support
 FIXES: Push all translations as separate posts, link to original, handle inline images
 """
 
-import requests
 import sqlite3
 import logging
 from typing import Dict, Optional, List
@@ -11,9 +10,17 @@ from pathlib import Path
 import re
 from html.parser import HTMLParser
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.gutenberg import convert_html_to_blocks
+from core.image_store import ImageStore
+from core.wp_client_pool import get_client, get_test_session
 
 logger = logging.getLogger(__name__)
 
+# Translation posts sent to the site at the same time
+TRANSLATION_PUBLISH_WORKERS = 8
+
 class WordPressAPIEnhanced:
     """Enhanced WordPress API with full translation and image support"""
     
@@ -28,75 +35,37 @@ class WordPressAPIEnhanced:
         self.tags_url = ''
         self._category_cache = {}
         self._tag_cache = {}
-        self._uploaded_images = {}  # Cache for uploaded image IDs
+        self.image_store = ImageStore(db_path)
+        self.taxonomy = None
+        self.media = None
+        self.batch = None
     
     def _initialize_connection(self, workspace_id: int) -> bool:
-        """Initialize WordPress connection from workspace credentials"""
+        """Bind to the workspace's pooled WordPress client (kept alive between posts)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT site_url, username, app_password FROM wp_credentials WHERE workspace_id = ?', (workspace_id,))
-            result = cursor.fetchone()
-            conn.close()
-            
-            if not result:
-                logger.error("WordPress credentials not configured")
+            client = get_client(self.db_path, workspace_id, self.image_store)
+            if not client:
                 return False
             
-            site_url, username, password = result
-            self.site_url = site_url.rstrip('/')
-            self.base_url = f"{self.site_url}/wp-json/wp/v2"
+            self.site_url = client.site_url
+            self.base_url = client.base_url
             self.media_url = f"{self.base_url}/media"
             self.posts_url = f"{self.base_url}/posts"
             self.categories_url = f"{self.base_url}/categories"
             self.tags_url = f"{self.base_url}/tags"
             
-            self.session = requests.Session()
-            self.session.auth = (username, password)
-            self.session.headers.update({'User-Agent': 'Nexuzy-Publisher/2.0'})
-            
-            logger.info(f"✅ Connected to: {self.site_url}")
+            self.session = client.session
+            self.taxonomy = client.taxonomy
+            self.media = client.media
+            self.batch = client.batch
             return True
         except Exception as e:
             logger.error(f"Failed to initialize WordPress connection: {e}")
             return False
     
     def upload_image_from_url(self, image_url: str, title: str = '') -> Optional[int]:
-        """Download image from URL → Upload to WordPress media library"""
-        if not image_url or not image_url.startswith('http'):
-            return None
-        
-        # Check cache
-        if image_url in self._uploaded_images:
-            return self._uploaded_images[image_url]
-        
-        try:
-            img_response = requests.get(image_url, timeout=30, headers={'User-Agent': 'Mozilla/5.0'})
-            if img_response.status_code != 200:
-                return None
-            
-            filename = image_url.split('/')[-1].split('?')[0] or 'image.jpg'
-            if not any(filename.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                filename += '.jpg'
-            
-            content_type = img_response.headers.get('Content-Type', 'image/jpeg')
-            
-            files = {'file': (filename, img_response.content, content_type)}
-            data = {'title': title, 'alt_text': title} if title else {}
-            
-            response = self.session.post(self.media_url, files=files, data=data, timeout=60)
-            
-            if response.ok:
-                media_id = response.json().get('id')
-                if media_id:
-                    logger.info(f"✅ Image uploaded! Media ID: {media_id}")
-                    self._uploaded_images[image_url] = media_id
-                    return media_id
-            
-            return None
-        except Exception as e:
-            logger.error(f"Error uploading image: {e}")
-            return None
+        """Stream image from URL → WordPress media library (never uploads the same image twice)"""
+        return self.media.upload_from_url(image_url, title)
     
     def get_or_create_category(self, category_name: str) -> Optional[int]:
         """Get existing WordPress category ID or create new one"""
@@ -104,30 +73,10 @@ class WordPressAPIEnhanced:
             return None
         
         category_name = category_name.strip()
-        
-        if category_name in self._category_cache:
-            return self._category_cache[category_name]
-        
-        try:
-            response = self.session.get(self.categories_url, params={'search': category_name, 'per_page': 10}, timeout=10)
-            
-            if response.ok:
-                for cat in response.json():
-                    if cat.get('name', '').lower() == category_name.lower():
-                        cat_id = cat.get('id')
-                        self._category_cache[category_name] = cat_id
-                        return cat_id
-            
-            create_response = self.session.post(self.categories_url, json={'name': category_name}, timeout=10)
-            
-            if create_response.ok:
-                cat_id = create_response.json().get('id')
-                self._category_cache[category_name] = cat_id
-                return cat_id
-        except Exception as e:
-            logger.error(f"Error handling category: {e}")
-        
-        return None
+        cat_id = self.taxonomy.resolve('categories', category_name)
+        if cat_id:
+            self._category_cache[category_name] = cat_id
+        return cat_id
     
     def get_or_create_tag(self, tag_name: str) -> Optional[int]:
         """Get existing WordPress tag ID or create new one"""
@@ -135,27 +84,15 @@ class WordPressAPIEnhanced:
             return None
         
         tag_name = tag_name.strip()
-        if tag_name in self._tag_cache:
-            return self._tag_cache[tag_name]
-        
-        try:
-            response = self.session.get(self.tags_url, params={'search': tag_name, 'per_page': 10}, timeout=10)
-            if response.ok:
-                for tag in response.json():
-                    if tag.get('name', '').lower() == tag_name.lower():
-                        tag_id = tag.get('id')
-                        self._tag_cache[tag_name] = tag_id
-                        return tag_id
-            
-            create_response = self.session.post(self.tags_url, json={'name': tag_name}, timeout=10)
-            if create_response.ok:
-                tag_id = create_response.json().get('id')
-                self._tag_cache[tag_name] = tag_id
-                return tag_id
-        except:
-            pass
-        
-        return None
+        tag_id = self.taxonomy.resolve('tags', tag_name)
+        if tag_id:
+            self._tag_cache[tag_name] = tag_id
+        return tag_id
+    
+    def _resolve_terms(self, categories: List[str], tags: List[str]):
+        """Resolve category and tag names to ids through the taxonomy cache (concurrently)"""
+        resolved = self.taxonomy.resolve_terms({'categories': categories, 'tags': tags})
+        return resolved['categories'], resolved['tags']
     
     def publish_draft_with_translations(self, draft_id: int, workspace_id: int, 
                                        categories: Optional[List[str]] = None, 
@@ -196,11 +133,15 @@ class WordPressAPIEnhanced:
             if image_url:
                 featured_media_id = self.upload_image_from_url(image_url, title)
             
-            # Publish original post
+            # Categories and tags are the same for every language variant
+            term_ids = self._resolve_terms(categories or [], tags or [])
+            
+            # Publish original post first: its inline images are uploaded once and
+            # the translations (same images) reuse the recorded media ids
             logger.info("✅ Publishing ORIGINAL post...")
             original_post = self._publish_single_post(
                 title, body_content, summary, featured_media_id,
-                categories, tags, language=None
+                categories, tags, language=None, term_ids=term_ids
             )
             
             if not original_post or not original_post.get('post_id'):
@@ -211,36 +152,43 @@ class WordPressAPIEnhanced:
                 }
             
             original_post_id = original_post['post_id']
+            term_ids = (original_post['categories'], original_post['tags'])
             logger.info(f"✅ Original post created: ID {original_post_id}")
             
-            # Get and publish all translations
+            # Publish all translations concurrently
             translations = self._get_all_translations(draft_id)
             published_translations = {}
             
-            for lang, trans_data in translations.items():
+            def publish_translation(lang, trans_data):
                 try:
                     logger.info(f"📄 Publishing {lang.upper()} translation...")
-                    
-                    trans_title = trans_data.get('title', f"{title} ({lang})")
-                    trans_body = trans_data.get('body_draft', body_content)
-                    trans_summary = trans_data.get('summary', summary)
-                    
-                    trans_post = self._publish_single_post(
-                        trans_title, trans_body, trans_summary, featured_media_id,
-                        categories, tags, language=lang
+                    return self._publish_single_post(
+                        trans_data.get('title') or f"{title} ({lang})",
+                        trans_data.get('body') or body_content,
+                        trans_data.get('summary') or summary,
+                        featured_media_id, categories, tags,
+                        language=lang, term_ids=term_ids
                     )
-                    
-                    if trans_post and trans_post.get('post_id'):
-                        published_translations[lang] = trans_post
-                        logger.info(f"✅ {lang.upper()} post created: ID {trans_post['post_id']}")
-                        
-                        # Link translation to original
-                        self._link_posts(original_post_id, trans_post['post_id'], lang)
-                    else:
-                        logger.warning(f"⚠️ Failed to publish {lang} translation")
-                
                 except Exception as e:
                     logger.error(f"Error publishing {lang} translation: {e}")
+                    return None
+            
+            if translations:
+                workers = min(TRANSLATION_PUBLISH_WORKERS, len(translations))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='wp-translation') as pool:
+                    futures = {pool.submit(publish_translation, lang, data): lang for lang, data in translations.items()}
+                    for future in as_completed(futures):
+                        lang = futures[future]
+                        trans_post = future.result()
+                        if trans_post and trans_post.get('post_id'):
+                            published_translations[lang] = trans_post
+                            logger.info(f"✅ {lang.upper()} post created: ID {trans_post['post_id']}")
+                        else:
+                            logger.warning(f"⚠️ Failed to publish {lang} translation")
+            
+            # Final pass: link every translation to the original
+            if published_translations:
+                self._link_posts(original_post_id, published_translations)
             
             result = {
                 'success': True,
@@ -264,7 +212,8 @@ class WordPressAPIEnhanced:
                             featured_media_id: Optional[int], 
                             categories: Optional[List[str]],
                             tags: Optional[List[str]],
-                            language: Optional[str] = None) -> Dict:
+                            language: Optional[str] = None,
+                            term_ids: Optional[tuple] = None) -> Dict:
         """
         Publish single post with GUARANTEED full content
         
@@ -276,6 +225,7 @@ class WordPressAPIEnhanced:
             categories: Category names
             tags: Tag names  
             language: Optional language code
+            term_ids: (category_ids, tag_ids) already resolved by the caller
         
         Returns:
             Dict with post details or None if failed
@@ -295,21 +245,11 @@ class WordPressAPIEnhanced:
                 logger.warning("⚠️ Gutenberg conversion failed, using raw content")
                 gutenberg_content = body_content
             
-            # Get categories
-            category_ids = []
-            if categories:
-                for cat_name in categories:
-                    cat_id = self.get_or_create_category(cat_name)
-                    if cat_id:
-                        category_ids.append(cat_id)
-            
-            # Get tags
-            tag_ids = []
-            if tags:
-                for tag_name in tags:
-                    tag_id = self.get_or_create_tag(tag_name)
-                    if tag_id:
-                        tag_ids.append(tag_id)
+            # Get categories and tags (persistent taxonomy cache, resolved concurrently)
+            if term_ids is not None:
+                category_ids, tag_ids = term_ids
+            else:
+                category_ids, tag_ids = self._resolve_terms(categories or [], tags or [])
             
             # Build post data
             post_data = {
@@ -347,6 +287,12 @@ class WordPressAPIEnhanced:
                 logger.error("No post ID in response")
                 return None
             
+            # Cached term ids deleted on the site are skipped by WordPress
+            if self.taxonomy.invalidate_dropped_terms(post, category_ids, tag_ids):
+                category_ids, tag_ids = self._resolve_terms(categories or [], tags or [])
+                self.session.post(f"{self.posts_url}/{post_id}",
+                                  json={'categories': category_ids, 'tags': tag_ids}, timeout=30)
+            
             logger.info(f"✅ Post ID: {post_id}")
             logger.info(f"   URL: {post_url}")
             
@@ -386,11 +332,16 @@ class WordPressAPIEnhanced:
                 conn.close()
                 return {}
             
-            # Get all translations for this draft
-            cursor.execute('''
-                SELECT language, title, body_draft, summary
+            # Translator stores the text in `body`; `summary` only exists on newer databases
+            cursor.execute("PRAGMA table_info(translations)")
+            has_summary = any(col[1] == 'summary' for col in cursor.fetchall())
+            
+            # Oldest first, so the newest translation per language wins
+            cursor.execute(f'''
+                SELECT language, title, body, {'summary' if has_summary else 'NULL'}
                 FROM translations
                 WHERE draft_id = ?
+                ORDER BY translated_at, id
             ''', (draft_id,))
             
             translations = {}
@@ -398,7 +349,7 @@ class WordPressAPIEnhanced:
                 lang = row[0]
                 translations[lang] = {
                     'title': row[1],
-                    'body_draft': row[2],
+                    'body': row[2],
                     'summary': row[3]
                 }
             
@@ -410,30 +361,31 @@ class WordPressAPIEnhanced:
             logger.error(f"Error getting translations: {e}")
             return {}
     
-    def _link_posts(self, original_id: int, translation_id: int, language: str):
+    def _link_posts(self, original_id: int, translation_posts: Dict[str, Dict]):
         """
-        Link translated post to original using post meta
+        Link translated posts to the original using post meta
+        
+        All links go out in one batch request when the site supports it.
         
         Args:
             original_id: Original post ID
-            translation_id: Translation post ID
-            language: Language code
+            translation_posts: Language code -> published translation post
         """
         try:
-            # Update translation post meta
-            meta_url = f"{self.posts_url}/{translation_id}"
-            meta_data = {
-                'meta': {
-                    'original_post': original_id,
-                    'translation_language': language
+            languages = list(translation_posts)
+            responses = self.batch.run([
+                {
+                    'method': 'POST',
+                    'path': f"/wp/v2/posts/{translation_posts[lang]['post_id']}",
+                    'body': {'meta': {'original_post': original_id, 'translation_language': lang}}
                 }
-            }
-            
-            response = self.session.post(meta_url, json=meta_data, timeout=30)
-            if response.ok:
-                logger.debug(f"✅ Linked {language} post {translation_id} to original {original_id}")
-            else:
-                logger.debug(f"⚠️ Could not link posts: {response.status_code}")
+                for lang in languages
+            ])
+            for lang, response in zip(languages, responses):
+                if 200 <= response['status'] < 300:
+                    logger.debug(f"✅ Linked {lang} post {translation_posts[lang]['post_id']} to original {original_id}")
+                else:
+                    logger.debug(f"⚠️ Could not link {lang} post: {response['status']}")
         except Exception as e:
             logger.debug(f"Error linking posts: {e}")
     
@@ -474,7 +426,7 @@ class WordPressAPIEnhanced:
     
     def _convert_to_gutenberg_blocks(self, html_content: str, featured_media_id: Optional[int] = None) -> str:
         """
-        Convert HTML to Gutenberg blocks with ROBUST multi-line handling
+        Convert HTML to Gutenberg blocks (single pass, document order)
         
         Args:
             html_content: HTML content
@@ -486,51 +438,7 @@ class WordPressAPIEnhanced:
         if not html_content or not html_content.strip():
             return ""
         
-        blocks = []
-        
-        # Add featured image
-        if featured_media_id:
-            blocks.append(f'''<!-- wp:image {{"id":{featured_media_id},"sizeSlug":"large"}} -->
-<figure class="wp-block-image size-large"><img src="" alt="" class="wp-image-{featured_media_id}"/></figure>
-<!-- /wp:image -->''')
-        
-        content = html_content.strip()
-        
-        # Extract and process all heading levels
-        for level, tag in enumerate(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'], 1):
-            for match in re.finditer(f'<{tag}[^>]*>(.*?)</{tag}>', content, re.DOTALL | re.IGNORECASE):
-                text = re.sub(r'<.*?>', '', match.group(1)).strip()
-                text = ' '.join(text.split())
-                if text:
-                    if level == 1:
-                        blocks.append(f'<!-- wp:heading -->\n<h{level} class="wp-block-heading">{text}</h{level}>\n<!-- /wp:heading -->')
-                    else:
-                        blocks.append(f'<!-- wp:heading {{"level":{level}}} -->\n<h{level} class="wp-block-heading">{text}</h{level}>\n<!-- /wp:heading -->')
-        
-        # Extract paragraphs (with multi-line support)
-        for match in re.finditer(r'<p[^>]*>(.*?)</p>', content, re.DOTALL | re.IGNORECASE):
-            para_text = match.group(1).strip()
-            para_text = ' '.join(para_text.split())
-            if para_text:
-                blocks.append(f'<!-- wp:paragraph -->\n<p>{para_text}</p>\n<!-- /wp:paragraph -->')
-        
-        # Extract unordered lists
-        for match in re.finditer(r'<ul[^>]*>(.*?)</ul>', content, re.DOTALL | re.IGNORECASE):
-            list_content = match.group(1)
-            items = re.findall(r'<li[^>]*>(.*?)</li>', list_content, re.DOTALL | re.IGNORECASE)
-            if items:
-                list_html = '\n'.join([f'<li>{" ".join(item.split())}</li>' for item in items])
-                blocks.append(f'<!-- wp:list -->\n<ul>{list_html}</ul>\n<!-- /wp:list -->')
-        
-        # Extract ordered lists
-        for match in re.finditer(r'<ol[^>]*>(.*?)</ol>', content, re.DOTALL | re.IGNORECASE):
-            list_content = match.group(1)
-            items = re.findall(r'<li[^>]*>(.*?)</li>', list_content, re.DOTALL | re.IGNORECASE)
-            if items:
-                list_html = '\n'.join([f'<li>{" ".join(item.split())}</li>' for item in items])
-                blocks.append(f'<!-- wp:list {{"ordered":true}} -->\n<ol>{list_html}</ol>\n<!-- /wp:list -->')
-        
-        result = '\n\n'.join(blocks)
+        result = convert_html_to_blocks(html_content, featured_media_id)
         
         if not result or len(result) < 50:
             logger.warning("Gutenberg conversion produced minimal output, using raw HTML")
@@ -543,9 +451,7 @@ class WordPressAPIEnhanced:
         """Test WordPress connection"""
         try:
             test_url = site_url.rstrip('/') + '/wp-json/wp/v2/users/me'
-            session = requests.Session()
-            session.auth = (username, password)
-            session.headers.update({'User-Agent': 'Nexuzy-Publisher-Test/2.0'})
+            session = get_test_session(site_url, username, password)
             response = session.get(test_url, timeout=15)
             
             if response.status_code == 200:
@@ -7,6 +7,8 @@ import re
 import logging
 from typing import Optional
 
+from core.gutenberg import convert_html_to_blocks
+
 logger = logging.getLogger(__name__)
 
 class WordPressFormatter:
@@ -322,67 +324,7 @@ class WordPressFormatter:
         <!-- wp:paragraph -->
         <p>Content</p>
         <!-- /wp:paragraph -->
-        """
-        # First, format the HTML properly
-        html = self.format_for_wordpress(html)
-        
-        blocks = []
-        
-        # Split by tags
-        lines = html.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Detect block type
-            if line.startswith('<h2'):
-                content = line
-                blocks.append(f'''<!-- wp:heading -->
-{content}
-<!-- /wp:heading -->''')
-            
-            elif line.startswith('<h3'):
-                content = line
-                blocks.append(f'''<!-- wp:heading {{"level":3}} -->
-{content}
-<!-- /wp:heading -->''')
-            
-            elif line.startswith('<h4'):
-                content = line
-                blocks.append(f'''<!-- wp:heading {{"level":4}} -->
-{content}
-<!-- /wp:heading -->''')
-            
-            elif line.startswith('<blockquote'):
-                content = line
-                blocks.append(f'''<!-- wp:quote -->
-{content}
-<!-- /wp:quote -->''')
-            
-            elif line.startswith('<ul'):
-                content = line
-                blocks.append(f'''<!-- wp:list -->
-{content}
-<!-- /wp:list -->''')
-            
-            elif line.startswith('<ol'):
-                content = line
-                blocks.append(f'''<!-- wp:list {{"ordered":true}} -->
-{content}
-<!-- /wp:list -->''')
-            
-            elif line.startswith('<img') or line.startswith('<figure'):
-                content = line
-                blocks.append(f'''<!-- wp:image -->
-{content}
-<!-- /wp:image -->''')
-            
-            elif line.startswith('<p>'):
-                content = line
-                blocks.append(f'''<!-- wp:paragraph -->
-{content}
-<!-- /wp:paragraph -->''')
         
-        return '\n\n'.join(blocks)
+        Conversion is a single pass that keeps document order (core.gutenberg).
+        """
+        return convert_html_to_blocks(self.format_for_wordpress(html))
@@ -0,0 +1,145 @@
+"""
+WordPress Batch Requests - Group small REST writes into /wp-json/batch/v1
+Shared by WordPressAPI, WordPressAPIEnhanced and the taxonomy cache.
+
+FEATURES:
+✅ Up to 25 sub-requests per HTTP call (WordPress 5.6+)
+✅ Batch support detected once per site (REST index namespaces) and cached
+✅ Transparent fallback to one request per write on older sites, on routes
+   that refuse batching, or when a batch call fails
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_REQUESTS = 25
+BATCH_ROUTE = '/batch/v1'
+# Concurrent single requests when batching is unavailable
+FALLBACK_WORKERS = 6
+
+# site_url -> batch endpoint available
+_support_cache: Dict[str, bool] = {}
+_support_lock = threading.Lock()
+
+
+class WPBatch:
+    """Send REST writes for one site, batched when the site allows it"""
+
+    def __init__(self, session, site_url: str):
+        """
+        Args:
+            session: Authenticated requests.Session for the site
+            site_url: Site root URL
+        """
+        self.session = session
+        self.site_url = site_url.rstrip('/')
+        self.rest_root = f"{self.site_url}/wp-json"
+
+    def supports_batch(self) -> bool:
+        """True if the site exposes batch/v1 (one GET per site per process)"""
+        with _support_lock:
+            supported = _support_cache.get(self.site_url)
+            if supported is not None:
+                return supported
+            try:
+                response = self.session.get(f"{self.rest_root}/", params={'_fields': 'namespaces'}, timeout=15)
+                if response.status_code >= 500:
+                    # Transient - write individually now, detect again next time
+                    return False
+                supported = response.ok and 'batch/v1' in (response.json().get('namespaces') or [])
+            except Exception as e:
+                logger.debug(f"Batch detection failed for {self.site_url}: {e}")
+                return False
+            _support_cache[self.site_url] = supported
+            logger.info(f"{'✅' if supported else 'ℹ️'} Batch API {'available' if supported else 'not available'} on {self.site_url}")
+            return supported
+
+    @staticmethod
+    def _mark_unsupported(site_url: str):
+        with _support_lock:
+            _support_cache[site_url] = False
+
+    def _single(self, request: Dict) -> Dict:
+        """Send one sub-request as a normal REST call"""
+        try:
+            response = self.session.request(request.get('method', 'POST'), f"{self.rest_root}{request['path']}",
+                                            json=request.get('body'), timeout=30)
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            return {'status': response.status_code, 'body': body}
+        except Exception as e:
+            logger.error(f"❌ Request to {request['path']} failed: {e}")
+            return {'status': 0, 'body': {'code': 'request_failed', 'message': str(e)}}
+
+    def _run_individually(self, requests: List[Dict]) -> List[Dict]:
+        if len(requests) == 1:
+            return [self._single(requests[0])]
+        with ThreadPoolExecutor(max_workers=min(FALLBACK_WORKERS, len(requests)),
+                                thread_name_prefix='wp-writes') as pool:
+            return list(pool.map(self._single, requests))
+
+    def _send_batch(self, chunk: List[Dict]) -> Optional[List[Dict]]:
+        """One batch call; None if the batch endpoint itself failed"""
+        payload = {
+            'validation': 'normal',
+            'requests': [{'method': r.get('method', 'POST'), 'path': r['path'], 'body': r.get('body') or {}}
+                         for r in chunk]
+        }
+        try:
+            response = self.session.post(f"{self.rest_root}{BATCH_ROUTE}", json=payload, timeout=60)
+        except Exception as e:
+            logger.warning(f"⚠️ Batch request failed: {e}")
+            return None
+
+        if response.status_code in (404, 405):
+            self._mark_unsupported(self.site_url)
+            return None
+        try:
+            responses = response.json().get('responses')
+        except (ValueError, AttributeError):
+            responses = None
+        if not response.ok or not isinstance(responses, list) or len(responses) != len(chunk):
+            logger.warning(f"⚠️ Batch request rejected: HTTP {response.status_code}")
+            return None
+
+        results = []
+        for item in responses:
+            # validation='normal' wraps pre-dispatch errors as {'body': ..., 'status': ...}
+            results.append({'status': item.get('status', 0), 'body': item.get('body') or {}})
+        return results
+
+    def run(self, requests: List[Dict]) -> List[Dict]:
+        """
+        Execute writes, batched when possible
+
+        Args:
+            requests: [{'method': 'POST', 'path': '/wp/v2/tags', 'body': {...}}, ...]
+                (paths are relative to /wp-json)
+
+        Returns:
+            One {'status': int, 'body': dict} per request, in order
+        """
+        if not requests:
+            return []
+        if len(requests) == 1 or not self.supports_batch():
+            return self._run_individually(requests)
+
+        results: List[Dict] = []
+        for start in range(0, len(requests), BATCH_MAX_REQUESTS):
+            chunk = requests[start:start + BATCH_MAX_REQUESTS]
+            batch_results = self._send_batch(chunk)
+            if batch_results is None:
+                results.extend(self._run_individually(chunk))
+                continue
+            for request, result in zip(chunk, batch_results):
+                if (result['body'] or {}).get('code') == 'rest_batch_not_allowed':
+                    result = self._single(request)
+                results.append(result)
+        logger.debug(f"Batched {len(requests)} writes to {self.site_url}")
+        return results
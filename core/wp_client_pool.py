@@ -0,0 +1,211 @@
+"""
+WordPress Client Pool - Long-lived per-workspace sessions
+Shared by WordPressAPI, WordPressAPIEnhanced and the publish outbox.
+
+FEATURES:
+✅ One client per (workspace, site) for the whole process: keep-alive
+   connections, taxonomy cache and media uploader survive between posts
+✅ Batch writer (wp_batch) shared by the site's taxonomy cache and posts
+✅ HTTPAdapter pool sized for concurrent publishing (translations, terms)
+✅ Automatic retries with backoff for idempotent requests (GET/HEAD) on
+   connection errors, 429 and 5xx - POSTs are never replayed blindly
+✅ Credentials checked on every lookup (row cached for a few seconds): a
+   changed password or site replaces the client; invalidate_workspace()
+   applies a change at once
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core import metrics
+from core.image_store import ImageStore
+from core.wp_batch import WPBatch
+from core.wp_media import WPMediaUploader
+from core.wp_taxonomy import WPTaxonomyCache
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Nexuzy-Publisher/3.0'
+
+# Connections kept open per site - covers translation publishing (8) plus
+# concurrent term resolution (6) without blocking on the pool
+POOL_MAXSIZE = 16
+POOL_CONNECTIONS = 4
+
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# How long a workspace's credentials row is trusted before it is read again
+CREDENTIALS_TTL_SECONDS = 5.0
+
+
+def _fingerprint(site_url: str, username: str, password: str) -> str:
+    return hashlib.sha256(f"{site_url}\n{username}\n{password}".encode('utf-8')).hexdigest()
+
+
+def build_session(username: str, password: str, user_agent: str = USER_AGENT) -> requests.Session:
+    """Authenticated session with a tuned connection pool and safe retries"""
+    retry = Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=RETRY_TOTAL,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.auth = (username, password)
+    session.headers.update({'User-Agent': user_agent})
+    metrics.instrument_session(session, stage='publish', service='wordpress')
+    return session
+
+
+class WPClient:
+    """Connection state for one WordPress site"""
+
+    def __init__(self, db_path: str, site_url: str, username: str, password: str,
+                 image_store: Optional[ImageStore] = None):
+        self.db_path = db_path
+        self.site_url = site_url.rstrip('/')
+        self.username = username
+        self.fingerprint = _fingerprint(self.site_url, username, password)
+        self.base_url = f"{self.site_url}/wp-json/wp/v2"
+        self.session = build_session(username, password)
+        self.batch = WPBatch(self.session, self.site_url)
+        self.taxonomy = WPTaxonomyCache(db_path, self.session, self.site_url, batch=self.batch)
+        self.media = WPMediaUploader(db_path, self.session, self.site_url, image_store)
+
+    def close(self):
+        try:
+            self.session.close()
+        except Exception:
+            pass
+
+
+class _TestClient:
+    """Session-only pool entry for credentials that are not saved yet"""
+
+    def __init__(self, site_url: str, username: str, password: str):
+        self.db_path = None
+        self.site_url = site_url
+        self.fingerprint = _fingerprint(site_url, username, password)
+        self.session = build_session(username, password)
+
+    def close(self):
+        try:
+            self.session.close()
+        except Exception:
+            pass
+
+
+# Process-wide registry: (workspace_id, site_url) -> WPClient
+_clients: Dict[Tuple[Optional[int], str], WPClient] = {}
+# (db_path, workspace_id) -> (read at, (site_url, username, password, fingerprint) or None)
+_credentials: Dict[Tuple[str, int], Tuple[float, Optional[tuple]]] = {}
+_lock = threading.Lock()
+
+
+def _load_credentials(db_path: str, workspace_id: int) -> Optional[tuple]:
+    """A workspace's credentials, read from SQLite at most every CREDENTIALS_TTL_SECONDS"""
+    now = time.monotonic()
+    with _lock:
+        cached = _credentials.get((db_path, workspace_id))
+        if cached and now - cached[0] < CREDENTIALS_TTL_SECONDS:
+            return cached[1]
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT site_url, username, app_password FROM wp_credentials WHERE workspace_id = ?', (workspace_id,))
+    result = cursor.fetchone()
+    conn.close()
+
+    credentials = None
+    if result and result[0]:
+        site_url = result[0].rstrip('/')
+        credentials = (site_url, result[1], result[2], _fingerprint(site_url, result[1], result[2]))
+    with _lock:
+        _credentials[(db_path, workspace_id)] = (now, credentials)
+    return credentials
+
+
+def get_client(db_path: str, workspace_id: int, image_store: Optional[ImageStore] = None) -> Optional[WPClient]:
+    """
+    Get (or create) the pooled client for a workspace's WordPress site
+
+    Returns:
+        WPClient, or None if the workspace has no credentials
+    """
+    credentials = _load_credentials(db_path, workspace_id)
+    if not credentials:
+        logger.error("WordPress credentials not configured")
+        return None
+
+    site_url, username, password, fingerprint = credentials
+    key = (workspace_id, site_url)
+
+    with _lock:
+        client = _clients.get(key)
+        if client and client.db_path == db_path and client.fingerprint == fingerprint:
+            return client
+        # New workspace, or its site / password changed: replace its clients
+        for stale in [k for k in _clients if k[0] == workspace_id]:
+            _clients.pop(stale).close()
+        client = _clients[key] = WPClient(db_path, site_url, username, password, image_store)
+        logger.info(f"✅ Connected to: {site_url}")
+        return client
+
+
+def get_test_session(site_url: str, username: str, password: str) -> requests.Session:
+    """
+    Session for testing credentials: reuses a pooled client with the same
+    credentials, otherwise keeps one unbound (workspace None) client per site
+    """
+    site_url = site_url.rstrip('/')
+    fingerprint = _fingerprint(site_url, username, password)
+    with _lock:
+        for client in _clients.values():
+            if client.fingerprint == fingerprint:
+                return client.session
+
+        key = (None, site_url)
+        client = _clients.get(key)
+        if client is None or client.fingerprint != fingerprint:
+            if client:
+                client.close()
+            client = _clients[key] = _TestClient(site_url, username, password)
+        return client.session
+
+
+def invalidate_workspace(workspace_id: int):
+    """Drop a workspace's client (call after its WordPress settings change)"""
+    with _lock:
+        for key in [k for k in _credentials if k[1] == workspace_id]:
+            del _credentials[key]
+        for key in [k for k in _clients if k[0] == workspace_id]:
+            _clients.pop(key).close()
+    logger.debug(f"WordPress client for workspace {workspace_id} invalidated")
+
+
+def close_all():
+    """Close every pooled session"""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _credentials.clear()
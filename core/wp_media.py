@@ -0,0 +1,173 @@
+"""
+WordPress Media Relay - Streamed image uploads with persistent dedupe
+Shared by WordPressAPI and WordPressAPIEnhanced.
+
+FEATURES:
+✅ Source image spooled to the local image store (hashed while written),
+   then streamed from disk into the multipart upload (bounded memory)
+✅ Persistent wp_media table: (site, source URL / content hash) → media_id,
+   checked before posting, so the same wire photo is never uploaded twice
+   to a site - even from a different URL
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+
+from core.image_store import ImageStore
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+class WPMediaUploader:
+    """Upload images to one site's media library without buffering them"""
+
+    def __init__(self, db_path: str, session, site_url: str, image_store: Optional[ImageStore] = None):
+        """
+        Args:
+            db_path: SQLite database path
+            session: Authenticated requests.Session for the site
+            site_url: Site root URL
+            image_store: Local image store (its plain session downloads sources,
+                so WordPress credentials never go to third-party hosts)
+        """
+        self.db_path = db_path
+        self.session = session
+        self.site_url = site_url.rstrip('/')
+        self.media_url = f"{self.site_url}/wp-json/wp/v2/media"
+        self.image_store = image_store or ImageStore(db_path)
+        self._ensure_table()
+
+    def _ensure_table(self):
+        """Ensure wp_media table exists"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS wp_media (
+                    id INTEGER PRIMARY KEY,
+                    site_url TEXT NOT NULL,
+                    source_url TEXT,
+                    content_hash TEXT,
+                    media_id INTEGER NOT NULL,
+                    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(site_url, source_url)
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_wp_media_hash ON wp_media(site_url, content_hash)')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not create wp_media table: {e}")
+
+    def find_media(self, source_url: Optional[str] = None, content_hash: Optional[str] = None) -> Optional[int]:
+        """Media id of an image already uploaded to this site"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            row = None
+            if source_url:
+                cursor.execute('SELECT media_id FROM wp_media WHERE site_url = ? AND source_url = ?',
+                               (self.site_url, source_url))
+                row = cursor.fetchone()
+            if not row and content_hash:
+                cursor.execute('SELECT media_id FROM wp_media WHERE site_url = ? AND content_hash = ? LIMIT 1',
+                               (self.site_url, content_hash))
+                row = cursor.fetchone()
+            conn.close()
+            return row[0] if row else None
+        except Exception as e:
+            logger.debug(f"wp_media lookup failed: {e}")
+            return None
+
+    def _record(self, source_url: str, content_hash: Optional[str], media_id: int):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO wp_media (site_url, source_url, content_hash, media_id, uploaded_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (self.site_url, source_url, content_hash, media_id, datetime.now().isoformat()))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Could not record wp_media row: {e}")
+
+    def forget(self, media_id: int):
+        """Drop a media id (e.g. deleted from the library)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM wp_media WHERE site_url = ? AND media_id = ?', (self.site_url, media_id))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Could not delete wp_media row: {e}")
+
+    @staticmethod
+    def _filename_for(image_url: str, ext: str = '.jpg') -> str:
+        filename = image_url.split('/')[-1].split('?')[0] or 'image'
+        if not filename.lower().endswith(IMAGE_EXTENSIONS):
+            filename += ext
+        return filename
+
+    def _post_media(self, filename: str, body, content_type: str, title: str) -> Optional[int]:
+        """POST a streamed multipart body to the media endpoint"""
+        fields = {'file': (filename, body, content_type)}
+        if title:
+            fields.update({'title': title, 'alt_text': title})
+        encoder = MultipartEncoder(fields=fields)
+
+        response = self.session.post(self.media_url, data=encoder,
+                                     headers={'Content-Type': encoder.content_type}, timeout=60)
+        if response.ok:
+            media_id = response.json().get('id')
+            if media_id:
+                logger.info(f"✅ Image uploaded! Media ID: {media_id}")
+            return media_id
+
+        logger.error(f"❌ Media upload failed: HTTP {response.status_code} {response.text[:200]}")
+        return None
+
+    def _upload_stored(self, stored: Dict, image_url: str, title: str) -> Optional[int]:
+        """Upload an image held in the local store (streamed from disk)"""
+        media_id = self.find_media(content_hash=stored['hash'])
+        if media_id:
+            logger.info(f"⚡ Image already on site (same content): Media ID {media_id}")
+        else:
+            filename = self._filename_for(image_url, Path(stored['path']).suffix)
+            with open(stored['path'], 'rb') as f:
+                media_id = self._post_media(filename, f, stored['mime_type'] or 'image/jpeg', title)
+        if media_id:
+            self._record(image_url, stored['hash'], media_id)
+        return media_id
+
+    def upload_from_url(self, image_url: str, title: str = '') -> Optional[int]:
+        """
+        Upload an image from its source URL to the media library
+
+        Returns:
+            Media id (existing one if this image was uploaded before) or None
+        """
+        if not image_url or not image_url.startswith('http'):
+            return None
+
+        media_id = self.find_media(source_url=image_url)
+        if media_id:
+            logger.info(f"⚡ Image already uploaded: Media ID {media_id}")
+            return media_id
+
+        try:
+            # Spooled to the image store first: its content hash is known before
+            # the POST, so the same bytes from another URL reuse the media id
+            stored = self.image_store.fetch(image_url, timeout=30)
+            return self._upload_stored(stored, image_url, title) if stored else None
+        except Exception as e:
+            logger.error(f"Error uploading image: {e}")
+            return None
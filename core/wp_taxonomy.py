@@ -0,0 +1,471 @@
+"""
+WordPress Taxonomy Cache - Persistent per-site categories and tags
+Shared by WordPressAPI and WordPressAPIEnhanced.
+
+FEATURES:
+✅ One paginated prefetch of all categories/tags per site (X-WP-TotalPages)
+✅ Stored in SQLite (wp_taxonomy) - survives restarts, shared by all clients
+✅ Lookup by exact then normalized name ('AI & ML' == 'ai and ml')
+✅ Create on miss; 'term_exists' errors reuse the existing term id
+✅ Periodic full refresh + invalidation when WordPress rejects a cached id
+
+Term endpoints have no modified_after filter (that exists only for posts),
+so refreshes are periodic full syncs plus an id-ordered incremental check.
+"""
+
+import html
+import re
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from core.wp_batch import WPBatch
+
+logger = logging.getLogger(__name__)
+
+TAXONOMIES = ('categories', 'tags')
+
+# Full resync interval; terms deleted on the site are dropped at the next sync
+DEFAULT_REFRESH_INTERVAL = timedelta(hours=24)
+
+# Concurrent term requests per publish (incremental refresh of each taxonomy)
+RESOLVE_WORKERS = 6
+
+
+def normalize_term_name(name: str) -> str:
+    """Normalize a term name for comparison (WordPress returns HTML-escaped names)"""
+    normalized = html.unescape(name or '').lower().strip()
+    normalized = normalized.replace('&', 'and')
+    normalized = re.sub(r'\s+', ' ', normalized)
+    return normalized
+
+
+class WPTaxonomyCache:
+    """Persistent cache of one site's categories and tags"""
+
+    # Single-flight locks shared by every instance in the process, so two
+    # publishes never create the same term twice
+    _flight_guard = threading.Lock()
+    _flight_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+
+    def __init__(self, db_path: str, session, site_url: str,
+                 refresh_interval: timedelta = DEFAULT_REFRESH_INTERVAL, batch: Optional[WPBatch] = None):
+        """
+        Args:
+            db_path: SQLite database path
+            session: Authenticated requests.Session for the site
+            site_url: Site root URL (cache key)
+            refresh_interval: Age after which a full resync runs
+            batch: Batch writer for the site (created if None)
+        """
+        self.db_path = db_path
+        self.session = session
+        self.site_url = site_url.rstrip('/')
+        self.base_url = f"{self.site_url}/wp-json/wp/v2"
+        self.refresh_interval = refresh_interval
+        self.batch = batch or WPBatch(session, self.site_url)
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure wp_taxonomy and wp_taxonomy_sync tables exist"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS wp_taxonomy (
+                    site_url TEXT NOT NULL,
+                    taxonomy TEXT NOT NULL,
+                    term_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    normalized TEXT NOT NULL,
+                    slug TEXT,
+                    PRIMARY KEY (site_url, taxonomy, term_id)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_wp_taxonomy_name
+                ON wp_taxonomy(site_url, taxonomy, normalized)
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS wp_taxonomy_sync (
+                    site_url TEXT NOT NULL,
+                    taxonomy TEXT NOT NULL,
+                    last_full_sync TIMESTAMP,
+                    PRIMARY KEY (site_url, taxonomy)
+                )
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not create taxonomy cache tables: {e}")
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _needs_full_sync(self, taxonomy: str) -> bool:
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT last_full_sync FROM wp_taxonomy_sync WHERE site_url = ? AND taxonomy = ?',
+                           (self.site_url, taxonomy))
+            row = cursor.fetchone()
+            conn.close()
+            if not row or not row[0]:
+                return True
+            return datetime.now() - datetime.fromisoformat(row[0]) > self.refresh_interval
+        except Exception:
+            return True
+
+    def _fetch_pages(self, taxonomy: str, params: Dict, stop_at_id: Optional[int] = None) -> Optional[List[Dict]]:
+        """GET every page of a term endpoint (stops early once ids <= stop_at_id)"""
+        url = f"{self.base_url}/{taxonomy}"
+        terms = []
+        page = 1
+        total_pages = 1
+
+        while page <= total_pages:
+            response = self.session.get(url, params={**params, 'per_page': 100, 'page': page,
+                                                     '_fields': 'id,name,slug'}, timeout=15)
+            if not response.ok:
+                logger.warning(f"⚠️ Taxonomy fetch failed ({taxonomy} page {page}): HTTP {response.status_code}")
+                return None
+
+            batch = response.json()
+            terms.extend(batch)
+            total_pages = int(response.headers.get('X-WP-TotalPages', 1) or 1)
+
+            if stop_at_id is not None and batch and min(t.get('id', 0) for t in batch) <= stop_at_id:
+                break
+            page += 1
+
+        return terms
+
+    def prefetch(self, taxonomy: str) -> bool:
+        """Replace the cached terms of a taxonomy with a full paginated fetch"""
+        try:
+            terms = self._fetch_pages(taxonomy, {'orderby': 'id', 'order': 'asc', 'hide_empty': 'false'})
+            if terms is None:
+                return False
+
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM wp_taxonomy WHERE site_url = ? AND taxonomy = ?', (self.site_url, taxonomy))
+            self._store_terms(cursor, taxonomy, terms)
+            cursor.execute('''
+                INSERT OR REPLACE INTO wp_taxonomy_sync (site_url, taxonomy, last_full_sync) VALUES (?, ?, ?)
+            ''', (self.site_url, taxonomy, datetime.now().isoformat()))
+            conn.commit()
+            conn.close()
+
+            logger.info(f"📥 Cached {len(terms)} {taxonomy} from {self.site_url}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Taxonomy prefetch failed ({taxonomy}): {e}")
+            return False
+
+    def refresh_incremental(self, taxonomy: str) -> int:
+        """
+        Fetch terms created since the last sync (newest ids first)
+
+        Returns:
+            Number of new terms cached
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT MAX(term_id) FROM wp_taxonomy WHERE site_url = ? AND taxonomy = ?',
+                           (self.site_url, taxonomy))
+            max_id = cursor.fetchone()[0] or 0
+            conn.close()
+
+            terms = self._fetch_pages(taxonomy, {'orderby': 'id', 'order': 'desc', 'hide_empty': 'false'},
+                                      stop_at_id=max_id)
+            new_terms = [t for t in (terms or []) if t.get('id', 0) > max_id]
+
+            if new_terms:
+                conn = sqlite3.connect(self.db_path)
+                cursor = conn.cursor()
+                self._store_terms(cursor, taxonomy, new_terms)
+                conn.commit()
+                conn.close()
+            return len(new_terms)
+        except Exception as e:
+            logger.error(f"❌ Incremental taxonomy refresh failed ({taxonomy}): {e}")
+            return 0
+
+    def ensure_fresh(self, taxonomy: str):
+        """Run a full sync if the taxonomy was never synced or is older than refresh_interval"""
+        if self._needs_full_sync(taxonomy):
+            self.prefetch(taxonomy)
+
+    def invalidate(self, taxonomy: str, term_id: Optional[int] = None):
+        """
+        Drop a cached term (or force a full resync of the taxonomy)
+
+        Called when WordPress answers 404 / invalid term for a cached id.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            if term_id is not None:
+                cursor.execute('DELETE FROM wp_taxonomy WHERE site_url = ? AND taxonomy = ? AND term_id = ?',
+                               (self.site_url, taxonomy, term_id))
+            else:
+                cursor.execute('DELETE FROM wp_taxonomy_sync WHERE site_url = ? AND taxonomy = ?',
+                               (self.site_url, taxonomy))
+            conn.commit()
+            conn.close()
+            logger.info(f"♻️ Invalidated {taxonomy} cache{f' term {term_id}' if term_id else ''} for {self.site_url}")
+        except Exception as e:
+            logger.error(f"Error invalidating taxonomy cache: {e}")
+
+    def _store_terms(self, cursor, taxonomy: str, terms: List[Dict]):
+        cursor.executemany('''
+            INSERT OR REPLACE INTO wp_taxonomy (site_url, taxonomy, term_id, name, normalized, slug)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [
+            (self.site_url, taxonomy, t['id'], html.unescape(t.get('name', '')),
+             normalize_term_name(t.get('name', '')), t.get('slug', ''))
+            for t in terms if t.get('id')
+        ])
+
+    # ------------------------------------------------------------------
+    # Lookup / resolve
+    # ------------------------------------------------------------------
+
+    def lookup(self, taxonomy: str, name: str) -> Optional[int]:
+        """Find a cached term id by exact name, then by normalized name"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT term_id, name FROM wp_taxonomy
+                WHERE site_url = ? AND taxonomy = ? AND normalized = ?
+                ORDER BY term_id
+            ''', (self.site_url, taxonomy, normalize_term_name(name)))
+            rows = cursor.fetchall()
+            conn.close()
+            for term_id, term_name in rows:
+                if term_name == name:
+                    return term_id
+            return rows[0][0] if rows else None
+        except Exception as e:
+            logger.debug(f"Taxonomy lookup failed: {e}")
+            return None
+
+    def get_name(self, taxonomy: str, term_id: int) -> Optional[str]:
+        """Get a cached term name by id"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT name FROM wp_taxonomy WHERE site_url = ? AND taxonomy = ? AND term_id = ?',
+                           (self.site_url, taxonomy, term_id))
+            row = cursor.fetchone()
+            conn.close()
+            return row[0] if row else None
+        except Exception:
+            return None
+
+    def create(self, taxonomy: str, name: str) -> Optional[int]:
+        """Create a term; an existing term with the same name is reused"""
+        response = self.session.post(f"{self.base_url}/{taxonomy}", json={'name': name}, timeout=10)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return self._handle_created(taxonomy, name, response.status_code, body, response.text)
+
+    def _handle_created(self, taxonomy: str, name: str, status: int, body: Dict, raw: str = '') -> Optional[int]:
+        """Record the result of a term create request (single or batched)"""
+        term_id = None
+        if 200 <= status < 300:
+            term_id = body.get('id')
+            logger.info(f"✅ Created {taxonomy} term: {name} (ID: {term_id})")
+        elif body.get('code') == 'term_exists':
+            term_id = (body.get('data') or {}).get('term_id')
+            logger.info(f"✅ Existing {taxonomy} term: {name} (ID: {term_id})")
+        else:
+            logger.error(f"❌ Failed to create {taxonomy} term '{name}': {status}")
+            logger.error(f"   Response: {(raw or str(body))[:500]}")
+
+        if term_id:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            self._store_terms(cursor, taxonomy, [{'id': term_id, 'name': name, 'slug': ''}])
+            conn.commit()
+            conn.close()
+        return term_id
+
+    def create_many(self, terms: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[int]]:
+        """
+        Create several terms with as few requests as possible (batch API)
+
+        Single-flight: every name is locked first, names created meanwhile by
+        another publish are picked up from the cache instead.
+
+        Args:
+            terms: [(taxonomy, name), ...]
+
+        Returns:
+            {(taxonomy, name): term_id or None}
+        """
+        keys = sorted({(self.site_url, taxonomy, normalize_term_name(name)) for taxonomy, name in terms})
+        locks = [self._flight_lock(key) for key in keys]
+        for lock in locks:
+            lock.acquire()
+        result = {}
+        try:
+            pending = []
+            for taxonomy, name in terms:
+                term_id = self.lookup(taxonomy, name)
+                if term_id:
+                    result[(taxonomy, name)] = term_id
+                elif (taxonomy, name) not in pending:
+                    pending.append((taxonomy, name))
+
+            responses = self.batch.run([
+                {'method': 'POST', 'path': f"/wp/v2/{taxonomy}", 'body': {'name': name}}
+                for taxonomy, name in pending
+            ])
+            for (taxonomy, name), response in zip(pending, responses):
+                result[(taxonomy, name)] = self._handle_created(taxonomy, name, response['status'], response['body'])
+            return result
+        except Exception as e:
+            logger.error(f"❌ Error creating terms: {e}")
+            return result
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _flight_lock(self, key: Tuple[str, str, str]) -> threading.Lock:
+        with self._flight_guard:
+            lock = self._flight_locks.get(key)
+            if lock is None:
+                lock = self._flight_locks[key] = threading.Lock()
+            return lock
+
+    def ensure_fresh_once(self, taxonomy: str):
+        """ensure_fresh guarded so concurrent callers share one prefetch"""
+        with self._flight_lock((self.site_url, taxonomy, '')):
+            self.ensure_fresh(taxonomy)
+
+    def _create_single_flight(self, taxonomy: str, name: str) -> Optional[int]:
+        """Create a term; concurrent requests for the same name wait for the first"""
+        with self._flight_lock((self.site_url, taxonomy, normalize_term_name(name))):
+            term_id = self.lookup(taxonomy, name)
+            if term_id:
+                return term_id
+            try:
+                return self.create(taxonomy, name)
+            except Exception as e:
+                logger.error(f"❌ Error handling {taxonomy} term '{name}': {e}")
+                return None
+
+    def resolve(self, taxonomy: str, name: str) -> Optional[int]:
+        """
+        Get the id of a term by name, creating it if the site doesn't have it
+
+        Common case (cache synced, term known): no HTTP request at all.
+        """
+        if not name or not name.strip():
+            return None
+        name = name.strip()
+
+        self.ensure_fresh_once(taxonomy)
+        term_id = self.lookup(taxonomy, name)
+        if term_id:
+            return term_id
+
+        # Terms added on the site since the last sync (one GET, misses only)
+        if self.refresh_incremental(taxonomy):
+            term_id = self.lookup(taxonomy, name)
+            if term_id:
+                return term_id
+
+        return self._create_single_flight(taxonomy, name)
+
+    def resolve_terms(self, names_by_taxonomy: Dict[str, List[str]]) -> Dict[str, List[int]]:
+        """
+        Resolve names of several taxonomies at once
+
+        Cached names cost nothing; for the misses, one incremental refresh per
+        taxonomy runs concurrently, then all creates go out in one batch
+        request (or concurrently on sites without the batch API).
+
+        Args:
+            names_by_taxonomy: e.g. {'categories': [...], 'tags': [...]}
+
+        Returns:
+            Term ids per taxonomy (duplicates and failures dropped, order kept)
+        """
+        wanted = {
+            taxonomy: list(dict.fromkeys(n.strip() for n in (names or []) if n and n.strip()))
+            for taxonomy, names in names_by_taxonomy.items()
+        }
+        resolved = {taxonomy: {} for taxonomy in wanted}
+
+        for taxonomy, names in wanted.items():
+            if names:
+                self.ensure_fresh_once(taxonomy)
+            for name in names:
+                resolved[taxonomy][name] = self.lookup(taxonomy, name)
+
+        misses = {taxonomy: [n for n, term_id in found.items() if not term_id]
+                  for taxonomy, found in resolved.items()}
+
+        if any(misses.values()):
+            with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS, thread_name_prefix='wp-terms') as pool:
+                refreshed = {taxonomy: pool.submit(self.refresh_incremental, taxonomy)
+                             for taxonomy, names in misses.items() if names}
+                for taxonomy, future in refreshed.items():
+                    if future.result():
+                        for name in misses[taxonomy]:
+                            resolved[taxonomy][name] = self.lookup(taxonomy, name)
+
+            # All creates in one batch request (individual requests on older sites)
+            created = self.create_many([
+                (taxonomy, name)
+                for taxonomy, found in resolved.items()
+                for name, term_id in found.items() if not term_id
+            ])
+            for (taxonomy, name), term_id in created.items():
+                resolved[taxonomy][name] = term_id
+
+        result = {}
+        for taxonomy, names in wanted.items():
+            term_ids = []
+            for name in names:
+                term_id = resolved[taxonomy].get(name)
+                if term_id and term_id not in term_ids:
+                    term_ids.append(term_id)
+            result[taxonomy] = term_ids
+        return result
+
+    def resolve_many(self, taxonomy: str, names: List[str]) -> List[int]:
+        """Resolve several names to term ids (duplicates and failures dropped, order kept)"""
+        return self.resolve_terms({taxonomy: names}).get(taxonomy, [])
+
+    def invalidate_dropped_terms(self, post: Dict, category_ids: List[int], tag_ids: List[int]) -> bool:
+        """
+        Compare the terms WordPress saved on a post with the ids that were sent
+
+        WordPress silently skips term ids that no longer exist, so a missing id
+        means the cached term was deleted on the site. Those entries are dropped.
+
+        Returns:
+            True if any cached id was stale
+        """
+        stale = False
+        for taxonomy, sent in (('categories', category_ids), ('tags', tag_ids)):
+            if taxonomy not in post:
+                continue
+            saved = set(post.get(taxonomy) or [])
+            for term_id in sent or []:
+                if term_id not in saved:
+                    self.invalidate(taxonomy, term_id)
+                    stale = True
+        return stale
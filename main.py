@@ -8,13 +8,23 @@ import sys
 import json
 import sqlite3
 import threading
+
+# Headless mode (cron/systemd): hand over to the CLI before Tkinter is imported
+if __name__ == '__main__' and '--headless' in sys.argv[1:]:
+    sys.argv.remove('--headless')
+    from nexuzy.cli import main as headless_main
+    sys.exit(headless_main())
+
 import tkinter as tk
-from tkinter import messagebox, scrolledtext, ttk, filedialog
+from tkinter import messagebox, scrolledtext, ttk, filedialog, simpledialog
 from tkinter import font as tkfont
 from pathlib import Path
 import logging
 from datetime import datetime
 
+from core.database import DatabaseSetup
+from core.model_registry import models
+
 # Fix Windows encoding
 if sys.platform == 'win32':
     try:
@@ -117,43 +127,6 @@ MODEL_CONFIGS = {
     }
 }
 
-class DatabaseSetup:
-    def __init__(self, db_path='nexuzy.db'):
-        self.db_path = db_path
-        self.init_database()
-    
-    def init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('CREATE TABLE IF NOT EXISTS workspaces (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
-        cursor.execute('CREATE TABLE IF NOT EXISTS rss_feeds (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, feed_name TEXT NOT NULL, url TEXT NOT NULL, category TEXT DEFAULT "General", enabled BOOLEAN DEFAULT 1, added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (workspace_id) REFERENCES workspaces(id), UNIQUE(workspace_id, url))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS news_queue (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, headline TEXT NOT NULL, summary TEXT, source_url TEXT, source_domain TEXT, category TEXT, publish_date TEXT, image_url TEXT, verified_score REAL DEFAULT 0, verified_sources INTEGER DEFAULT 1, fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, status TEXT DEFAULT "new", FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS ai_drafts (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, news_id INTEGER, title TEXT, headline_suggestions TEXT, body_draft TEXT, summary TEXT, image_url TEXT, source_url TEXT, word_count INTEGER DEFAULT 0, generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS translations (id INTEGER PRIMARY KEY, draft_id INTEGER NOT NULL, language TEXT, title TEXT, body TEXT, approved BOOLEAN DEFAULT 0, translated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (draft_id) REFERENCES ai_drafts(id))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS wp_credentials (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, site_url TEXT, username TEXT, app_password TEXT, connected BOOLEAN DEFAULT 0, FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS ads_settings (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, header_code TEXT, footer_code TEXT, content_code TEXT, enabled BOOLEAN DEFAULT 1, FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS news_groups (id INTEGER PRIMARY KEY, workspace_id INTEGER NOT NULL, group_hash TEXT, source_count INTEGER DEFAULT 1, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (workspace_id) REFERENCES workspaces(id))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS grouped_news (id INTEGER PRIMARY KEY, group_id INTEGER NOT NULL, news_id INTEGER NOT NULL, similarity_score REAL, FOREIGN KEY (group_id) REFERENCES news_groups(id), FOREIGN KEY (news_id) REFERENCES news_queue(id))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS scraped_facts (id INTEGER PRIMARY KEY, news_id INTEGER NOT NULL, fact_type TEXT, content TEXT, confidence REAL DEFAULT 0.5, source_url TEXT, FOREIGN KEY (news_id) REFERENCES news_queue(id))')
-        cursor.execute('CREATE TABLE IF NOT EXISTS wordpress_posts (id INTEGER PRIMARY KEY, draft_id INTEGER NOT NULL, wp_post_id INTEGER, wp_site_url TEXT, status TEXT DEFAULT "draft", published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (draft_id) REFERENCES ai_drafts(id))')
-        
-        conn.commit()
-        conn.close()
-        logger.info("[OK] Database initialized with all tables")
-    
-    def ensure_default_workspace(self):
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM workspaces')
-            if cursor.fetchone()[0] == 0:
-                cursor.execute('INSERT INTO workspaces (name) VALUES (?)', ('Default Workspace',))
-                conn.commit()
-            conn.close()
-        except Exception as e:
-            logger.error(f"Error: {e}")
-
 class ModernButton(tk.Button):
     def __init__(self, parent, text, command=None, color='primary', **kwargs):
         bg_color = COLORS.get(color, COLORS['primary'])
@@ -281,6 +254,7 @@ class NexuzyPublisherApp(tk.Tk):
         db = DatabaseSetup(self.db_path)
         db.ensure_default_workspace()
         
+        self._configure_metrics()
         self._import_modules()
         self.create_modern_ui()
         self.load_workspaces()
@@ -298,6 +272,15 @@ class NexuzyPublisherApp(tk.Tk):
         except Exception as e:
             logger.warning(f"Could not load icon: {e}")
     
+    def _configure_metrics(self):
+        """Record stage timings in the database; optional Prometheus endpoint on localhost"""
+        try:
+            from core import metrics
+            port = os.environ.get('NEXUZY_METRICS_PORT') or metrics.load_metrics_port()
+            metrics.configure(self.db_path, port=int(port) if port else None)
+        except Exception as e:
+            logger.warning(f"Metrics disabled: {e}")
+    
     def _import_modules(self):
         try:
             from core.rss_manager import RSSManager
@@ -309,7 +292,7 @@ class NexuzyPublisherApp(tk.Tk):
         
         try:
             from core.vision_ai import VisionAI
-            self.vision_ai = VisionAI()
+            self.vision_ai = VisionAI(cache_db_path=self.db_path)
             self.models_status['vision_ai'] = 'Available'
         except:
             self.vision_ai = None
@@ -318,7 +301,7 @@ class NexuzyPublisherApp(tk.Tk):
         try:
             from core.news_matcher import NewsMatchEngine
             self.news_matcher = NewsMatchEngine(self.db_path)
-            self.models_status['sentence_transformer'] = 'Available' if self.news_matcher.model else 'Not Available'
+            self.models_status['sentence_transformer'] = 'Available' if models.is_available('news_matcher') else 'Not Available'
             logger.info("[OK] News Matcher")
         except:
             self.news_matcher = None
@@ -327,7 +310,7 @@ class NexuzyPublisherApp(tk.Tk):
         try:
             from core.ai_draft_generator import DraftGenerator
             self.draft_generator = DraftGenerator(self.db_path)
-            self.models_status['draft_generator'] = 'Available (GGUF)' if self.draft_generator.llm else 'Template Mode'
+            self.models_status['draft_generator'] = 'Available (GGUF)' if models.is_available('llm') else 'Template Mode'
             logger.info("[OK] Draft Generator")
         except:
             self.draft_generator = None
@@ -336,12 +319,22 @@ class NexuzyPublisherApp(tk.Tk):
         try:
             from core.translator import Translator
             self.translator = Translator(self.db_path)
-            self.models_status['translator'] = 'Available (NLLB-200)' if self.translator.translator else 'Template Mode'
+            self.models_status['translator'] = 'Available (NLLB-200)' if models.is_available('translator') else 'Template Mode'
             logger.info("[OK] Translator")
         except:
             self.translator = None
             self.models_status['translator'] = 'Not Available'
         
+        try:
+            from core.translation_queue import TranslationQueue
+            self.translation_queue = TranslationQueue(self.db_path, translator=self.translator, is_busy=self._is_generating_draft)
+            if self.translator:
+                self.translation_queue.start()
+            logger.info("[OK] Translation Queue")
+        except Exception as e:
+            logger.error(f"Translation Queue: {e}")
+            self.translation_queue = None
+        
         try:
             from core.wordpress_api import WordPressAPI
             self.wordpress_api = WordPressAPI(self.db_path)
@@ -349,6 +342,18 @@ class NexuzyPublisherApp(tk.Tk):
         except:
             self.wordpress_api = None
             logger.warning("WordPress API unavailable")
+        
+        try:
+            from core.publish_outbox import PublishOutbox
+            self.publish_outbox = PublishOutbox(self.db_path, on_complete=self._on_outbox_job_done)
+            self.publish_outbox.start()
+            logger.info("[OK] Publish Outbox")
+        except Exception as e:
+            logger.error(f"Publish Outbox: {e}")
+            self.publish_outbox = None
+    
+    def _is_generating_draft(self):
+        return bool(self.draft_generator and self.draft_generator.is_generating())
     
     def create_modern_ui(self):
         # Header
@@ -405,6 +410,7 @@ class NexuzyPublisherApp(tk.Tk):
             ("🌐 Translations", self.show_translations, 'warning'),
             ("🔗 WordPress", self.show_wordpress_config, 'primary'),
             ("🖼️ Vision AI", self.show_vision_ai, 'danger'),
+            ("⏱️ Performance", self.show_performance, 'text_light'),
             ("⚙️ Settings", self.show_settings, 'text_light'),
         ]
         
@@ -901,24 +907,14 @@ class NexuzyPublisherApp(tk.Tk):
         
         def check_thread():
             try:
-                # Download image temporarily
-                import requests
-                from PIL import Image
-                from io import BytesIO
-                
-                response = requests.get(image_url, timeout=10)
-                response.raise_for_status()  # Raise error for bad status
-                img = Image.open(BytesIO(response.content))
-                
-                # Save temporarily
-                temp_path = 'temp_image.jpg'
-                img.save(temp_path)
+                # Download into the shared image store (reused by AI Writer + WordPress)
+                from core.image_store import ImageStore
+                stored = ImageStore(self.db_path).fetch(image_url, timeout=10)
+                if not stored:
+                    raise Exception("Could not download image")
                 
                 # Check watermark
-                result = self.vision_ai.detect_watermark(temp_path)
-                
-                # Clean up
-                os.remove(temp_path)
+                result = self.vision_ai.detect_watermark(stored['path'])
                 
                 self.after(0, lambda res=result: self._watermark_check_complete(res))
             except Exception as e:
@@ -1123,38 +1119,66 @@ class NexuzyPublisherApp(tk.Tk):
         messagebox.showerror("Error", f"Failed:\n{error}")
     
     def publish_to_wordpress(self):
-        """Publish current draft to WordPress"""
+        """Queue current draft for publishing to WordPress"""
         if not hasattr(self, 'current_draft_id') or not self.current_draft_id:
             messagebox.showwarning("Warning", "Save draft first before publishing")
             return
         
-        if not self.wordpress_api:
-            messagebox.showerror("Error", "WordPress API not available")
+        if not self.publish_outbox:
+            messagebox.showerror("Error", "WordPress publishing not available")
             return
         
-        if messagebox.askyesno("Confirm", "Publish this draft to WordPress as draft post?"):
-            self.update_status("Publishing to WordPress...", 'warning')
-            
-            def publish_thread():
-                try:
-                    result = self.wordpress_api.publish_draft(self.current_draft_id, self.current_workspace_id)
-                    self.after(0, lambda res=result: self._publish_complete(res))
-                except Exception as e:
-                    self.after(0, lambda err=str(e): self._publish_error(err))
-            
-            threading.Thread(target=publish_thread, daemon=True).start()
+        when = simpledialog.askstring(
+            "Publish to WordPress",
+            "Queue this draft for WordPress (posted as draft for review).\n\n"
+            "Publish at (YYYY-MM-DD HH:MM), or leave blank for the next free slot:",
+            parent=self)
+        if when is None:
+            return
+        
+        scheduled_at = None
+        if when.strip():
+            try:
+                scheduled_at = datetime.strptime(when.strip(), '%Y-%m-%d %H:%M')
+            except ValueError:
+                messagebox.showerror("Error", "Use the format YYYY-MM-DD HH:MM")
+                return
+        
+        job = self.publish_outbox.enqueue(self.current_draft_id, self.current_workspace_id, scheduled_at=scheduled_at)
+        if not job:
+            messagebox.showerror("Error", "Failed to queue. Check WordPress credentials in WordPress settings.")
+            return
+        
+        if job['status'] == 'published':
+            if not messagebox.askyesno(
+                    "Already Published",
+                    f"This draft is already on WordPress.\n\nPost ID: {job['post_id']}\nURL: {job['post_url']}\n\n"
+                    "Update that post with the current draft?"):
+                return
+            job = self.publish_outbox.enqueue(self.current_draft_id, self.current_workspace_id,
+                                              scheduled_at=scheduled_at, update=True)
+            if not job:
+                messagebox.showerror("Error", "Failed to queue the update. Check WordPress credentials in WordPress settings.")
+                return
+            if job['action'] == 'update':
+                self.update_status(f"Update of post {job['post_id']} queued", 'success')
+                messagebox.showinfo("Queued", f"Update of post {job['post_id']} queued.\n\nThe outbox keeps retrying if the site is unreachable.")
+                return
+        
+        eta = self.publish_outbox.estimate_publish_time(job)
+        self.update_status(f"Queued for WordPress (~{eta.strftime('%d %b %H:%M')})", 'success')
+        messagebox.showinfo("Queued", f"Draft queued for WordPress.\n\nExpected: {eta.strftime('%Y-%m-%d %H:%M')}\n\nThe outbox keeps retrying if the site is unreachable.")
+    
+    def _on_outbox_job_done(self, job, result):
+        """Called from the outbox worker thread"""
+        self.after(0, lambda j=job, res=result: self._publish_complete(j, res))
     
-    def _publish_complete(self, result):
+    def _publish_complete(self, job, result):
         if result:
-            self.update_status("Published to WordPress!", 'success')
-            messagebox.showinfo("Success", f"Published to WordPress!\n\nPost ID: {result['post_id']}\nURL: {result['url']}\n\nStatus: Draft (review in WordPress)")
+            self.update_status(f"Published draft {job['draft_id']} to WordPress (post {result['post_id']})", 'success')
         else:
-            messagebox.showerror("Error", "Failed to publish. Check WordPress credentials in WordPress settings.")
+            self.update_status(f"Publish failed for draft {job['draft_id']}: {job.get('last_error') or 'unknown error'}", 'danger')
     
-    def _publish_error(self, error):
-        self.update_status("Publish failed", 'danger')
-        messagebox.showerror("Error", f"Failed to publish:\n{error}")
-
     def load_draft_into_editor(self, draft_id):
         """Loads a draft's content into the editor fields."""
         try:
@@ -1221,6 +1245,12 @@ class NexuzyPublisherApp(tk.Tk):
 
             conn.commit()
             conn.close()
+            
+            if self.translation_queue:
+                queued = self.translation_queue.enqueue_draft(self.current_draft_id, self.current_workspace_id)
+                if queued:
+                    message += f"\n\n🌐 {queued} translation(s) queued in background"
+            
             self.update_status("Draft saved!", 'success')
             messagebox.showinfo("Success", message)
             self.load_saved_drafts() # Refresh list
@@ -1400,6 +1430,28 @@ class NexuzyPublisherApp(tk.Tk):
         
         ModernButton(lang_frame, "🌐 Translate", self.translate_draft_real, 'warning').pack(side=tk.LEFT, padx=10)
         
+        # Auto-translate: languages queued automatically whenever a draft is saved
+        auto_frame = tk.Frame(self.content_frame, bg=COLORS['light'], relief=tk.RAISED, borderwidth=1)
+        auto_frame.pack(fill=tk.X, padx=30, pady=10, ipady=10)
+        
+        tk.Label(auto_frame, text="Auto-Translate:", bg=COLORS['light'], font=('Segoe UI', 10, 'bold')).pack(side=tk.LEFT, padx=10, anchor=tk.N)
+        
+        self.auto_lang_list = tk.Listbox(auto_frame, selectmode=tk.MULTIPLE, height=5, width=25, exportselection=False)
+        for lang in TRANSLATION_LANGUAGES:
+            self.auto_lang_list.insert(tk.END, lang)
+        self.auto_lang_list.pack(side=tk.LEFT, padx=5)
+        
+        if self.translation_queue:
+            for lang in self.translation_queue.get_target_languages(self.current_workspace_id):
+                if lang in TRANSLATION_LANGUAGES:
+                    self.auto_lang_list.selection_set(TRANSLATION_LANGUAGES.index(lang))
+        
+        ModernButton(auto_frame, "💾 Save Auto-Translate", self.save_auto_translate_languages, 'success').pack(side=tk.LEFT, padx=10, anchor=tk.N)
+        
+        self.translation_queue_label = tk.Label(auto_frame, text="", bg=COLORS['light'], fg=COLORS['text_light'], font=('Segoe UI', 9))
+        self.translation_queue_label.pack(side=tk.LEFT, padx=10, anchor=tk.N)
+        self._refresh_translation_queue_status()
+        
         preview_frame = tk.Frame(self.content_frame, bg=COLORS['white'])
         preview_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=10)
         
@@ -1411,6 +1463,36 @@ class NexuzyPublisherApp(tk.Tk):
         
         self.load_translation_drafts()
     
+    def save_auto_translate_languages(self):
+        if not self.translation_queue:
+            messagebox.showerror("Error", "Translation queue unavailable")
+            return
+        
+        languages = [self.auto_lang_list.get(i) for i in self.auto_lang_list.curselection()]
+        if self.translation_queue.set_target_languages(self.current_workspace_id, languages):
+            self.update_status("Auto-translate languages saved", 'success')
+            messagebox.showinfo("Success", f"Saved drafts will be translated to:\n{', '.join(languages) or 'None'}")
+        else:
+            messagebox.showerror("Error", "Could not save auto-translate languages")
+    
+    def _refresh_translation_queue_status(self, label=None):
+        """Update the queue counts every few seconds while the Translations page shows them"""
+        if label is None:
+            label = getattr(self, 'translation_queue_label', None)
+        if not self.translation_queue or label is None:
+            return
+        try:
+            if not label.winfo_exists():
+                return
+            counts = self.translation_queue.get_status_counts(self.current_workspace_id)
+            label.config(
+                text=f"Queue: {counts.get('pending', 0)} pending | {counts.get('running', 0)} running | "
+                     f"{counts.get('done', 0)} done | {counts.get('failed', 0)} failed"
+            )
+            label.after(5000, lambda: self._refresh_translation_queue_status(label))
+        except tk.TclError:
+            pass
+    
     def load_translation_drafts(self):
         try:
             conn = sqlite3.connect(self.db_path)
@@ -1517,6 +1599,25 @@ class NexuzyPublisherApp(tk.Tk):
         self.wp_pass_entry.insert(0, saved_pass or "xxxx")
         self.wp_pass_entry.pack(side=tk.LEFT, padx=10)
         
+        rate = self.publish_outbox.get_rate_limit(saved_url) if self.publish_outbox else {'posts_per_day': 10, 'burst': 1}
+        field_frame4 = tk.Frame(config_frame, bg=COLORS['light'])
+        field_frame4.pack(fill=tk.X, padx=20, pady=10)
+        tk.Label(field_frame4, text="Max Posts/Day:", bg=COLORS['light'], width=15, anchor=tk.W, font=('Segoe UI', 10, 'bold')).pack(side=tk.LEFT)
+        self.wp_rate_entry = tk.Entry(field_frame4, width=8)
+        self.wp_rate_entry.insert(0, f"{rate['posts_per_day']:g}")
+        self.wp_rate_entry.pack(side=tk.LEFT, padx=10)
+        tk.Label(field_frame4, text="Burst:", bg=COLORS['light'], font=('Segoe UI', 10, 'bold')).pack(side=tk.LEFT, padx=(10, 0))
+        self.wp_burst_entry = tk.Entry(field_frame4, width=5)
+        self.wp_burst_entry.insert(0, str(rate['burst']))
+        self.wp_burst_entry.pack(side=tk.LEFT, padx=10)
+        
+        if self.publish_outbox:
+            counts = self.publish_outbox.get_status_counts(self.current_workspace_id)
+            tk.Label(config_frame,
+                     text=f"Publish queue: {counts.get('queued', 0) + counts.get('publishing', 0)} waiting • "
+                          f"{counts.get('published', 0)} published • {counts.get('failed', 0)} failed",
+                     bg=COLORS['light'], fg=COLORS['text_light'], font=('Segoe UI', 9)).pack(padx=20, anchor=tk.W)
+        
         btn_frame = tk.Frame(config_frame, bg=COLORS['light'])
         btn_frame.pack(fill=tk.X, padx=20, pady=20)
         ModernButton(btn_frame, "💾 Save", self.save_wordpress_settings, 'primary').pack(side=tk.LEFT, padx=5)
@@ -1535,6 +1636,15 @@ class NexuzyPublisherApp(tk.Tk):
             messagebox.showerror("Error", "Fill all fields")
             return
         
+        try:
+            posts_per_day = float(self.wp_rate_entry.get().strip())
+            burst = int(self.wp_burst_entry.get().strip())
+            if posts_per_day <= 0 or burst < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Max Posts/Day must be a positive number and Burst at least 1")
+            return
+        
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -1548,6 +1658,13 @@ class NexuzyPublisherApp(tk.Tk):
             
             conn.commit()
             conn.close()
+            if self.publish_outbox:
+                self.publish_outbox.set_rate_limit(url, posts_per_day, burst)
+            try:
+                from core.wp_client_pool import invalidate_workspace
+                invalidate_workspace(self.current_workspace_id)
+            except Exception as e:
+                logger.debug(f"WordPress client pool: {e}")
             self.update_status("WordPress saved!", 'success')
             messagebox.showinfo("Success", "Settings saved!")
         except Exception as e:
@@ -1653,6 +1770,48 @@ class NexuzyPublisherApp(tk.Tk):
         self.update_status("Vision AI error", 'danger')
         messagebox.showerror("Error", f"Error:\n{error}")
     
+    def show_performance(self):
+        self.clear_content()
+        self.update_status("Performance", 'text_light')
+        
+        tk.Label(self.content_frame, text="⏱️ Performance (last 24 hours)", font=('Segoe UI', 20, 'bold'), bg=COLORS['white']).pack(padx=30, pady=20, anchor=tk.W)
+        tk.Label(self.content_frame, text="Time per stage and operation. p50 is the typical duration, p95 the slow tail.", font=('Segoe UI', 10), bg=COLORS['white'], fg=COLORS['text_light']).pack(padx=30, anchor=tk.W)
+        
+        table_frame = tk.Frame(self.content_frame, bg=COLORS['white'])
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=10)
+        
+        columns = ('stage', 'span', 'count', 'p50', 'p95', 'total', 'errors', 'tokens')
+        headings = ('Stage', 'Operation', 'Count', 'p50', 'p95', 'Total', 'Errors', 'Tokens/s')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=18)
+        for column, heading in zip(columns, headings):
+            tree.heading(column, text=heading)
+            tree.column(column, width=200 if column == 'span' else 90, anchor=tk.W if column in ('stage', 'span') else tk.E)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        def fmt_seconds(value):
+            if value is None:
+                return '-'
+            return f"{value * 1000:.0f} ms" if value < 1 else f"{value:.2f} s"
+        
+        def refresh():
+            from core import metrics
+            tree.delete(*tree.get_children())
+            rows = metrics.registry.summary(hours=24, db_path=self.db_path)
+            for row in sorted(rows, key=lambda r: (r['stage'], -r['total'])):
+                tokens = row['tokens_per_second']
+                tree.insert('', tk.END, values=(
+                    row['stage'], row['span'], row['count'],
+                    fmt_seconds(row['p50']), fmt_seconds(row['p95']), fmt_seconds(row['total']),
+                    row['errors'], f"{tokens:.1f}" if tokens else '-'
+                ))
+            self.update_status(f"Performance: {len(rows)} operations timed in the last 24 hours", 'text_light')
+        
+        ModernButton(self.content_frame, "🔄 Refresh", refresh, 'primary').pack(padx=30, pady=10, anchor=tk.W)
+        refresh()
+    
     def show_settings(self):
         self.clear_content()
         self.update_status("Settings", 'text_light')
@@ -1678,6 +1837,8 @@ class NexuzyPublisherApp(tk.Tk):
             tk.Label(top_row, text=status, font=('Segoe UI', 9, 'bold'), bg=status_color, fg=COLORS['white'], padx=8, pady=2).pack(side=tk.RIGHT)
             tk.Label(content, text=f"{config['purpose']} | {config['size']}", font=('Segoe UI', 9), bg=COLORS['white'], fg=COLORS['text_light']).pack(anchor=tk.W)
         
+        self._create_model_memory_panel()
+        
         # Ads section
         ads_frame = tk.Frame(self.content_frame, bg=COLORS['light'], relief=tk.RAISED, borderwidth=1)
         ads_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=10)
@@ -1711,6 +1872,52 @@ class NexuzyPublisherApp(tk.Tk):
         
         ModernButton(ads_frame, "💾 Save Ads", self.save_ads_settings, 'success').pack(padx=20, pady=15, anchor=tk.W)
     
+    def _create_model_memory_panel(self):
+        """Loaded models against the RAM budget; idle models are unloaded and reload on use"""
+        memory_frame = tk.Frame(self.content_frame, bg=COLORS['light'], relief=tk.RAISED, borderwidth=1)
+        memory_frame.pack(fill=tk.X, padx=30, pady=10)
+        
+        header = tk.Frame(memory_frame, bg=COLORS['light'])
+        header.pack(fill=tk.X, padx=20, pady=(15, 5))
+        tk.Label(header, text="🧠 Model Memory", font=('Segoe UI', 14, 'bold'), bg=COLORS['light']).pack(side=tk.LEFT)
+        summary_label = tk.Label(header, font=('Segoe UI', 10), bg=COLORS['light'], fg=COLORS['text_light'])
+        summary_label.pack(side=tk.RIGHT)
+        
+        rows_frame = tk.Frame(memory_frame, bg=COLORS['light'])
+        rows_frame.pack(fill=tk.X, padx=20, pady=5)
+        
+        def refresh():
+            if not rows_frame.winfo_exists():
+                return
+            status = models.status()
+            summary_label.config(text=f"{status['used_mb']:,.0f} / {status['budget_mb']:,.0f} MB in RAM | idle unload after {status['idle_unload_minutes']:.0f} min")
+            for widget in rows_frame.winfo_children():
+                widget.destroy()
+            if not status['models']:
+                tk.Label(rows_frame, text="No models registered yet", font=('Segoe UI', 9), bg=COLORS['light'], fg=COLORS['text_light']).pack(anchor=tk.W)
+            for model in status['models']:
+                row = tk.Frame(rows_frame, bg=COLORS['white'])
+                row.pack(fill=tk.X, pady=2)
+                tk.Label(row, text=model['display_name'], font=('Segoe UI', 10, 'bold'), bg=COLORS['white'], width=38, anchor=tk.W).pack(side=tk.LEFT, padx=10, pady=4)
+                if model['in_use']:
+                    state, color = "In use", 'success'
+                elif model['loaded']:
+                    state, color = f"Loaded, idle {model['idle_seconds'] / 60:.0f} min", 'primary'
+                elif model['available']:
+                    state, color = "Unloaded (loads on use)", 'text_light'
+                else:
+                    state, color = "Not available", 'warning'
+                tk.Label(row, text=state, font=('Segoe UI', 9, 'bold'), bg=COLORS[color], fg=COLORS['white'], padx=8, pady=2).pack(side=tk.RIGHT, padx=10)
+                tk.Label(row, text=f"~{model['size_mb']:,.0f} MB | loaded {model['loads']}x", font=('Segoe UI', 9), bg=COLORS['white'], fg=COLORS['text_light']).pack(side=tk.RIGHT, padx=10)
+            self.after(5000, refresh)
+        
+        def unload_idle():
+            unloaded = models.unload_idle(0)
+            self.update_status(f"Unloaded {len(unloaded)} idle model(s)" if unloaded else "No idle models to unload", 'text_light')
+        
+        ModernButton(memory_frame, "📤 Unload Idle Models", unload_idle, 'primary').pack(padx=20, pady=(5, 15), anchor=tk.W)
+        refresh()
+
     def save_ads_settings(self):
         if not self.current_workspace_id:
             messagebox.showwarning("Warning", "Select workspace")
@@ -1751,4 +1958,7 @@ def main():
     app.mainloop()
 
 if __name__ == '__main__':
+    # Vision AI batch scans use a process pool; needed for frozen Windows builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,10 @@
+"""
+Nexuzy Publisher Desk - Headless entry point
+
+    python -m nexuzy run-pipeline --workspace "Default Workspace"
+    python main.py --headless publish
+
+See nexuzy/cli.py for the subcommands. Nothing here imports Tkinter.
+"""
+
+__version__ = '3.0'
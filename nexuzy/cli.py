@@ -0,0 +1,398 @@
+"""
+Nexuzy Headless CLI - Run the desk's stages without the GUI
+
+    python -m nexuzy fetch                      RSS feeds -> news_queue
+    python -m nexuzy group                      group similar headlines
+    python -m nexuzy scrape  [--limit 20]       facts from source articles
+    python -m nexuzy draft   [--limit 5]        AI drafts for new stories
+    python -m nexuzy translate [--languages ..] queued/auto translations
+    python -m nexuzy publish [--new-drafts]     WordPress via the publish outbox
+    python -m nexuzy run-pipeline               all of the above, in order
+    python -m nexuzy run-pipeline --concurrent  stages overlap (core/pipeline.py)
+
+(`python main.py --headless <command>` is the same thing.)
+
+FEATURES:
+✅ Never imports Tkinter; each stage imports only the core modules it
+   needs, so `fetch` does not pay for loading the LLM or translator
+✅ Same core classes, database and rate limits as the desktop app
+✅ Per-stage item counts and timings (table or --json), non-zero exit
+   status if a stage failed - suitable for cron / systemd timers
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.pipeline import (select_drafts_to_publish, select_drafts_to_translate,
+                           select_news_to_draft, select_news_to_scrape)
+
+logger = logging.getLogger('nexuzy.cli')
+
+STAGES = ('fetch', 'group', 'scrape', 'draft', 'translate', 'publish')
+STAGE_HELP = {
+    'fetch': 'Fetch enabled RSS feeds into the news queue',
+    'group': 'Group similar headlines from different sources',
+    'scrape': 'Scrape facts, quotes and names from source articles',
+    'draft': 'Generate AI drafts for stories without one',
+    'translate': 'Queue translations and work through the translation queue',
+    'publish': 'Queue drafts in the publish outbox and publish what is due',
+}
+
+
+class StageContext:
+    """State shared by the stages of one CLI run"""
+
+    def __init__(self, db_path: str, workspace_id: int, options: argparse.Namespace):
+        self.db_path = db_path
+        self.workspace_id = workspace_id
+        self.options = options
+        # Filled by earlier stages so later ones work on this run's output
+        self.draft_ids: List[int] = []
+        self.translated_draft_ids: List[int] = []
+        self.in_pipeline = False
+
+    def option(self, name: str, default=None):
+        value = getattr(self.options, name, None)
+        return default if value is None else value
+
+
+def _query(db_path: str, sql: str, params: Tuple = ()) -> List[Tuple]:
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def resolve_workspace(db_path: str, value: Optional[str]) -> Optional[Tuple[int, str]]:
+    """Workspace by id or name (first workspace if value is None)"""
+    if value is None:
+        rows = _query(db_path, 'SELECT id, name FROM workspaces ORDER BY id LIMIT 1')
+    elif str(value).isdigit():
+        rows = _query(db_path, 'SELECT id, name FROM workspaces WHERE id = ?', (int(value),))
+    else:
+        rows = _query(db_path, 'SELECT id, name FROM workspaces WHERE name = ?', (value,))
+    return rows[0] if rows else None
+
+
+# ----------------------------------------------------------------------
+# Stages - each returns (items processed, detail) and imports lazily
+# ----------------------------------------------------------------------
+
+def stage_fetch(ctx: StageContext) -> Tuple[int, str]:
+    from core.rss_manager import RSSManager
+
+    count, message = RSSManager(ctx.db_path).fetch_news_from_feeds(
+        ctx.workspace_id, today_only=bool(ctx.option('today_only', False)))
+    return count, ' | '.join(line for line in message.splitlines()[1:] if line)
+
+
+def stage_group(ctx: StageContext) -> Tuple[int, str]:
+    from core.model_registry import models
+    from core.news_matcher import NewsMatchEngine
+
+    matcher = NewsMatchEngine(ctx.db_path)
+    if not models.is_available('news_matcher'):
+        return 0, 'similarity model not available - skipped'
+    groups = matcher.group_similar_headlines(ctx.workspace_id, threshold=ctx.option('threshold', 0.7))
+    stories = sum(len(news_ids) for news_ids in groups.values())
+    return len(groups), f"{stories} stories grouped"
+
+
+def stage_scrape(ctx: StageContext) -> Tuple[int, str]:
+    from core.content_scraper import ContentScraper
+
+    candidates = select_news_to_scrape(ctx.db_path, ctx.workspace_id, ctx.option('scrape_limit', 20))
+    if not candidates:
+        return 0, 'nothing to scrape'
+    # One concurrent batch; per-domain politeness is handled by the scrape engine
+    results = ContentScraper(ctx.db_path).scrape_articles(candidates)
+    scraped = sum(1 for extracted in results.values() if extracted)
+    return scraped, f"{len(candidates) - scraped} failed"
+
+
+def stage_draft(ctx: StageContext) -> Tuple[int, str]:
+    news_ids = ctx.option('news_ids') or select_news_to_draft(
+        ctx.db_path, ctx.workspace_id, ctx.option('draft_limit', 5))
+    if not news_ids:
+        return 0, 'no new stories'
+
+    from core.ai_draft_generator import DraftGenerator
+
+    generator = DraftGenerator(ctx.db_path)
+    errors = []
+    for news_id in news_ids:
+        draft = generator.generate_draft(news_id)
+        if draft and draft.get('id') and not draft.get('error'):
+            ctx.draft_ids.append(draft['id'])
+        else:
+            errors.append(f"news {news_id}: {(draft or {}).get('error', 'no result')}")
+    detail = f"drafts {', '.join(map(str, ctx.draft_ids))}" if ctx.draft_ids else ''
+    if errors:
+        detail = '; '.join(filter(None, [detail, errors[0], f"{len(errors)} failed" if len(errors) > 1 else '']))
+    return len(ctx.draft_ids), detail
+
+
+def stage_translate(ctx: StageContext) -> Tuple[int, str]:
+    from core.translation_queue import TranslationQueue
+
+    # Translator (and its model) is loaded by the queue on the first job only
+    queue = TranslationQueue(ctx.db_path)
+    languages = [lang.strip() for lang in (ctx.option('languages') or '').split(',') if lang.strip()] or None
+
+    if ctx.option('translate_draft_ids'):
+        draft_ids = ctx.option('translate_draft_ids')
+    elif ctx.in_pipeline:
+        draft_ids = ctx.draft_ids
+    else:
+        draft_ids = select_drafts_to_translate(ctx.db_path, ctx.workspace_id, ctx.option('translate_limit', 10))
+
+    queued = sum(queue.enqueue_draft(draft_id, ctx.workspace_id, languages=languages) for draft_id in draft_ids)
+    if draft_ids and not queued and not (languages or queue.get_target_languages(ctx.workspace_id)):
+        logger.warning("No target languages - pass --languages or set auto-translate languages in Settings")
+
+    processed = queue.run_pending()
+    for draft_id in draft_ids:
+        for job in queue.get_jobs(draft_id):
+            if job['status'] == 'done' and job['translated_draft_id']:
+                ctx.translated_draft_ids.append(job['translated_draft_id'])
+    counts = queue.get_status_counts(ctx.workspace_id)
+    return processed, f"{queued} queued, {counts.get('failed', 0)} failed, {counts.get('pending', 0)} pending"
+
+
+def stage_publish(ctx: StageContext) -> Tuple[int, str]:
+    from core.publish_outbox import PublishOutbox
+
+    outcomes: Dict[str, int] = {}
+
+    def on_complete(job, result):
+        status = (job or {}).get('status', 'unknown')
+        outcomes[status] = outcomes.get(status, 0) + 1
+
+    outbox = PublishOutbox(ctx.db_path, on_complete=on_complete)
+
+    if ctx.option('publish_draft_ids'):
+        draft_ids = ctx.option('publish_draft_ids')
+    elif ctx.in_pipeline:
+        draft_ids = ctx.draft_ids + ctx.translated_draft_ids
+    elif ctx.option('new_drafts'):
+        draft_ids = select_drafts_to_publish(ctx.db_path, ctx.workspace_id, ctx.option('publish_limit', 10))
+    else:
+        draft_ids = []
+
+    for draft_id in draft_ids:
+        outbox.enqueue(draft_id, ctx.workspace_id)
+
+    # Publish everything that is due; jobs held back by the site's rate
+    # limit stay queued for the next run (or the desktop app's worker)
+    while outbox.process_next() == 0:
+        pass
+
+    counts = outbox.get_status_counts(ctx.workspace_id)
+    return outcomes.get('published', 0), (f"{outcomes.get('failed', 0)} failed, "
+                                          f"{counts.get('queued', 0)} still queued")
+
+
+STAGE_FUNCTIONS: Dict[str, Callable[[StageContext], Tuple[int, str]]] = {
+    'fetch': stage_fetch,
+    'group': stage_group,
+    'scrape': stage_scrape,
+    'draft': stage_draft,
+    'translate': stage_translate,
+    'publish': stage_publish,
+}
+
+
+def run_stage(name: str, ctx: StageContext) -> Dict:
+    """Run one stage and time it; failures are reported, not raised"""
+    logger.info(f"▶️ Stage {name}")
+    start = time.perf_counter()
+    ok = True
+    try:
+        items, detail = STAGE_FUNCTIONS[name](ctx)
+    except Exception as e:
+        logger.exception(f"❌ Stage {name} failed")
+        items, detail, ok = 0, f"error: {e}", False
+    seconds = time.perf_counter() - start
+    logger.info(f"⏱️ {name}: {items} in {seconds:.1f}s")
+    return {'stage': name, 'ok': ok, 'items': items, 'seconds': round(seconds, 3), 'detail': detail}
+
+
+# ----------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------
+
+def _add_stage_options(parser: argparse.ArgumentParser, stage: str, prefixed: bool = False):
+    """Options of one stage; prefixed ('--draft-limit') when several stages share a parser"""
+    def flag(name: str) -> str:
+        return f"--{stage}-{name}" if prefixed and name == 'limit' else f"--{name}"
+
+    if stage == 'fetch':
+        parser.add_argument('--today-only', action='store_true', help="Only keep today's entries")
+    elif stage == 'group':
+        parser.add_argument('--threshold', type=float, help='Headline similarity threshold (default 0.7)')
+    elif stage == 'scrape':
+        parser.add_argument(flag('limit'), dest='scrape_limit', type=int, help='Stories to scrape (default 20)')
+    elif stage == 'draft':
+        parser.add_argument(flag('limit'), dest='draft_limit', type=int, help='Drafts to generate (default 5)')
+        if not prefixed:
+            parser.add_argument('--news-id', dest='news_ids', type=int, action='append',
+                                help='Draft this story (repeatable)')
+    elif stage == 'translate':
+        parser.add_argument('--languages', help='Comma-separated languages (default: workspace auto-translate)')
+        if not prefixed:
+            parser.add_argument(flag('limit'), dest='translate_limit', type=int,
+                                help='Untranslated drafts to queue (default 10)')
+            parser.add_argument('--draft-id', dest='translate_draft_ids', type=int, action='append',
+                                help='Translate this draft (repeatable)')
+    elif stage == 'publish' and not prefixed:
+        parser.add_argument('--draft-id', dest='publish_draft_ids', type=int, action='append',
+                            help='Queue this draft for publishing (repeatable)')
+        parser.add_argument('--new-drafts', action='store_true',
+                            help='Queue every draft that was never published')
+        parser.add_argument(flag('limit'), dest='publish_limit', type=int,
+                            help='Drafts to queue with --new-drafts (default 10)')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='nexuzy', description='Nexuzy Publisher Desk (headless)')
+    parser.add_argument('--db', default='nexuzy.db', help='SQLite database (default: nexuzy.db)')
+    parser.add_argument('--workspace', help='Workspace id or name (default: first workspace)')
+    parser.add_argument('--json', action='store_true', help='Print the stage report as JSON')
+    parser.add_argument('--log-level', default='INFO', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'))
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='Serve Prometheus metrics on 127.0.0.1:PORT while running '
+                             '(default: metrics_port in config.json, otherwise off)')
+
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+    for stage in STAGES:
+        _add_stage_options(commands.add_parser(stage, help=STAGE_HELP[stage]), stage)
+
+    pipeline = commands.add_parser('run-pipeline', help='Run the stages in order')
+    pipeline.add_argument('--stages', default=','.join(STAGES),
+                          help=f"Comma-separated subset of {','.join(STAGES)}")
+    for stage in STAGES:
+        _add_stage_options(pipeline, stage, prefixed=True)
+    staged = pipeline.add_argument_group('concurrent mode')
+    staged.add_argument('--concurrent', action='store_true',
+                        help='Run the stages at the same time, connected by bounded queues')
+    staged.add_argument('--scrape-workers', type=int, default=4, help='Concurrent scrapers (default 4)')
+    staged.add_argument('--publish-workers', type=int, default=2, help='Concurrent publishers (default 2)')
+    staged.add_argument('--queue-size', type=int, default=8, help='Queue capacity per stage (default 8)')
+    staged.add_argument('--no-resume', dest='resume', action='store_false',
+                        help='Do not pick up work left unfinished by earlier runs')
+    staged.add_argument('--publish-new-drafts', action='store_true',
+                        help='Also publish earlier drafts that were never queued')
+    staged.add_argument('--progress', type=float, default=10.0, metavar='SECONDS',
+                        help='Log queue depths every SECONDS (default 10)')
+    return parser
+
+
+def _configure_logging(level: str):
+    logging.basicConfig(
+        level=getattr(logging, level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('nexuzy_publisher.log', encoding='utf-8'),
+            logging.StreamHandler(sys.stderr)
+        ]
+    )
+
+
+def print_report(results: List[Dict], as_json: bool = False):
+    if as_json:
+        print(json.dumps({'stages': results, 'seconds': round(sum(r['seconds'] for r in results), 3)}, indent=2))
+        return
+    print(f"\n{'stage':<10} {'status':<7} {'items':>6} {'seconds':>9}  detail")
+    for result in results:
+        print(f"{result['stage']:<10} {'ok' if result['ok'] else 'FAILED':<7} {result['items']:>6} "
+              f"{result['seconds']:>9.1f}  {result['detail']}")
+    print(f"{'total':<10} {'':<7} {'':>6} {sum(r['seconds'] for r in results):>9.1f}")
+
+
+def print_pipeline_report(stats: List[Dict], seconds: float, as_json: bool = False):
+    if as_json:
+        print(json.dumps({'stages': stats, 'seconds': round(seconds, 3)}, indent=2))
+        return
+    print(f"\n{'stage':<10} {'workers':>7} {'done':>6} {'failed':>6} {'per s':>7} {'busy s':>8} {'blocked s':>10}")
+    for stage in stats:
+        print(f"{stage['stage']:<10} {stage['workers']:>7} {stage['processed']:>6} {stage['failed']:>6} "
+              f"{stage['per_second']:>7.2f} {stage['busy_seconds']:>8.1f} {stage['blocked_seconds']:>10.1f}")
+    print(f"{'total':<10} {seconds:>47.1f}s wall")
+
+
+def run_concurrent(args: argparse.Namespace, workspace_id: int, stages: List[str]) -> int:
+    """run-pipeline --concurrent: fetch and publish can be left out, the middle stages always run"""
+    from core.pipeline import build_desk_pipeline
+
+    languages = [lang.strip() for lang in (args.languages or '').split(',') if lang.strip()] or None
+    pipeline = build_desk_pipeline(
+        args.db, workspace_id,
+        fetch='fetch' in stages, today_only=args.today_only,
+        threshold=args.threshold or 0.7,
+        scrape_limit=args.scrape_limit or 20, draft_limit=args.draft_limit or 5,
+        languages=languages, publish='publish' in stages,
+        publish_new_drafts=args.publish_new_drafts,
+        scrape_workers=args.scrape_workers, publish_workers=args.publish_workers,
+        queue_size=args.queue_size, resume=args.resume)
+
+    def progress(stats: List[Dict]):
+        logger.info('📊 ' + ' | '.join(
+            f"{s['stage']} {s['processed']} done, {s['queue_depth']}/{s['queue_size']} queued" for s in stats))
+
+    start = time.perf_counter()
+    stats = pipeline.run(progress=progress, progress_interval=max(0.5, args.progress))
+    print_pipeline_report(stats, time.perf_counter() - start, as_json=args.json)
+    return 0 if not any(s['failed'] for s in stats) else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if sys.platform == 'win32':
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+            sys.stderr.reconfigure(encoding='utf-8')
+        except Exception:
+            pass
+    _configure_logging(args.log_level)
+
+    from core.database import DatabaseSetup
+
+    db = DatabaseSetup(args.db)
+    db.ensure_default_workspace()
+
+    from core import metrics
+
+    metrics.configure(args.db, port=args.metrics_port or metrics.load_metrics_port())
+
+    workspace = resolve_workspace(args.db, args.workspace)
+    if not workspace:
+        logger.error(f"Workspace not found: {args.workspace}")
+        return 2
+    logger.info(f"Workspace: {workspace[1]} (id {workspace[0]})")
+
+    if args.command == 'run-pipeline':
+        stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+        unknown = [s for s in stages if s not in STAGE_FUNCTIONS]
+        if unknown:
+            logger.error(f"Unknown stage(s): {', '.join(unknown)}")
+            return 2
+        if args.concurrent:
+            return run_concurrent(args, workspace[0], stages)
+    else:
+        stages = [args.command]
+
+    ctx = StageContext(args.db, workspace[0], args)
+    ctx.in_pipeline = args.command == 'run-pipeline'
+    results = [run_stage(stage, ctx) for stage in stages]
+
+    print_report(results, as_json=args.json)
+    return 0 if all(r['ok'] for r in results) else 1
@@ -0,0 +1,79 @@
+"""Shared fixtures: repo root on sys.path, an isolated HTTP cache, a local origin server"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core import http_cache  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fresh on-disk HTTP cache for sessions created during the test"""
+    store = http_cache.HTTPCache(str(tmp_path / 'http_cache'))
+    http_cache.set_cache(store)
+    yield store
+    http_cache.set_cache(None)
+
+
+class OriginServer:
+    """Threaded server answering GET/HEAD from a {path: (status, headers, body)} table"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.hits = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, send_body: bool):
+                server.hits.append((self.command, self.path))
+                status, headers, body = server.routes.get(self.path, (404, {}, b''))
+                if headers.get('ETag') and self.headers.get('If-None-Match') == headers['ETag']:
+                    status, body = 304, b''
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if 'Content-Length' not in headers:
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body and status != 304:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply(True)
+
+            def do_HEAD(self):
+                self._reply(False)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def origin():
+    servers = []
+
+    def start(routes):
+        servers.append(OriginServer(routes))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
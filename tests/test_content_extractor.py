@@ -0,0 +1,30 @@
+"""Content extractor: <form>-wrapped pages and the fallback flag"""
+
+import pytest
+
+from core.content_extractor import LXML_AVAILABLE, extract_main_content
+
+pytestmark = pytest.mark.skipif(not LXML_AVAILABLE, reason='lxml not installed')
+
+PARAGRAPH = ('The council approved the new budget on Tuesday, after a long debate, '
+             'and work on the bridge is expected to start next spring.')
+
+
+def test_form_wrapped_page_keeps_article():
+    html = f"""<html><body><form id="aspnetForm" method="post">
+<input type="hidden" name="__VIEWSTATE" value="abc" />
+<div class="article"><h1>Budget approved</h1>{f'<p>{PARAGRAPH}</p>' * 4}</div>
+<div class="poll"><label>Option one in the reader poll</label><button>Vote</button></div>
+</form></body></html>"""
+    page = extract_main_content(html)
+
+    assert page['paragraphs'] == [PARAGRAPH] * 4
+    assert 'reader poll' not in page['text']
+    assert not page['fallback']
+
+
+def test_fallback_flag():
+    page = extract_main_content('<html><body><div>Short note.</div><p>Another line.</p></body></html>')
+
+    assert page['fallback']
+    assert 'Short note.' in page['text'] and 'Another line.' in page['text']
@@ -0,0 +1,37 @@
+"""Gutenberg converter: block markup for the WordPress clients and the formatter"""
+
+from core.gutenberg import convert_html_to_blocks
+
+
+def test_pre_text():
+    assert convert_html_to_blocks('<pre>x = 1\ny = 2</pre>') == (
+        '<!-- wp:code -->\n<pre class="wp-block-code"><code>x = 1\ny = 2</code></pre>\n<!-- /wp:code -->')
+
+
+def test_pre_code_is_not_doubled():
+    expected = '<!-- wp:code -->\n<pre class="wp-block-code"><code>x = 1\ny = 2</code></pre>\n<!-- /wp:code -->'
+    assert convert_html_to_blocks('<pre><code>x = 1\ny = 2</code></pre>') == expected
+    assert convert_html_to_blocks('<pre>\n<code class="language-py">x = 1\ny = 2</code>\n</pre>') == expected
+
+
+def test_inline_code_inside_pre_is_kept():
+    assert '<code>a <code>b</code> c</code>' in convert_html_to_blocks('<pre>a <code>b</code> c</pre>')
+
+
+def test_blocks_in_document_order():
+    blocks = convert_html_to_blocks('<h3>Title</h3><p>One <b>two</b></p><ul><li>a</li><li>b</li></ul>'
+                                    '<img src="/x.jpg" class="wp-image-7">').split('\n\n')
+
+    assert blocks == [
+        '<!-- wp:heading {"level":3} -->\n<h3 class="wp-block-heading">Title</h3>\n<!-- /wp:heading -->',
+        '<!-- wp:paragraph -->\n<p>One <b>two</b></p>\n<!-- /wp:paragraph -->',
+        '<!-- wp:list -->\n<ul><li>a</li><li>b</li></ul>\n<!-- /wp:list -->',
+        '<!-- wp:image {"id":7,"sizeSlug":"large"} -->\n<figure class="wp-block-image size-large">'
+        '<img class="wp-image-7" src="/x.jpg" alt=""/></figure>\n<!-- /wp:image -->',
+    ]
+
+
+def test_featured_image_leads():
+    blocks = convert_html_to_blocks('<p>Body</p>', featured_media_id=5).split('\n\n')
+    assert blocks[0].startswith('<!-- wp:image {"id":5,"sizeSlug":"large"} -->')
+    assert convert_html_to_blocks('   ', featured_media_id=5) == ''
@@ -0,0 +1,46 @@
+"""HTTP cache: streamed misses stay readable, cached HEADs keep their Content-Length"""
+
+from benchmarks.wp_stub import WPStubServer
+from core.http_cache import cached_session
+from core.image_store import ImageStore
+from core.wp_media import WPMediaUploader
+
+JPEG = bytes([0xFF, 0xD8, 0xFF, 0xE0]) + bytes(range(256)) * 40
+IMAGE_HEADERS = {'Content-Type': 'image/jpeg', 'ETag': '"photo-1"', 'Cache-Control': 'max-age=3600'}
+
+
+def test_stream_miss_leaves_raw_readable(cache, origin):
+    server = origin({'/photo.jpg': (200, IMAGE_HEADERS, JPEG)})
+    session = cached_session('test')
+
+    with session.get(f"{server.url}/photo.jpg", stream=True) as response:
+        assert response.raw.read() == JPEG
+    with session.get(f"{server.url}/photo.jpg", stream=True) as response:
+        assert response.from_cache
+        assert response.raw.read() == JPEG
+    assert server.hits == [('GET', '/photo.jpg')]
+
+
+def test_upload_of_cacheable_image(cache, origin, tmp_path):
+    server = origin({'/photo.jpg': (200, IMAGE_HEADERS, JPEG)})
+    db_path = str(tmp_path / 'nexuzy.db')
+    store = ImageStore(db_path, root=str(tmp_path / 'images'), session=cached_session('images'))
+
+    with WPStubServer() as wordpress:
+        uploader = WPMediaUploader(db_path, cached_session('wordpress'), wordpress.url, image_store=store)
+        media_id = uploader.upload_from_url(f"{server.url}/photo.jpg", title='Photo')
+        assert media_id
+        assert wordpress.state.requests['POST /wp-json/wp/v2/media'] == 1
+        assert wordpress.state.bytes_in >= len(JPEG)
+
+
+def test_cached_head_keeps_content_length(cache, origin):
+    headers = {'Content-Type': 'image/jpeg', 'Content-Length': '12345', 'Cache-Control': 'max-age=3600'}
+    server = origin({'/large.jpg': (200, headers, b'')})
+    session = cached_session('test')
+
+    first = session.head(f"{server.url}/large.jpg")
+    second = session.head(f"{server.url}/large.jpg")
+    assert second.from_cache
+    assert first.headers['Content-Length'] == second.headers['Content-Length'] == '12345'
+    assert server.hits == [('HEAD', '/large.jpg')]
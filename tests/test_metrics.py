@@ -0,0 +1,39 @@
+"""Metrics: nearest-rank percentiles and the background flusher"""
+
+import sqlite3
+import time
+
+from core import metrics
+from core.metrics import MetricsRegistry, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 21))
+    assert percentile(values, 50) == 10
+    assert percentile(values, 95) == 19
+    assert percentile(values, 100) == 20
+    assert percentile(values, 0) == 1
+    assert percentile(list(range(1, 101)), 7) == 7
+    assert percentile([], 50) is None
+
+
+def test_full_buffer_wakes_flusher(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'FLUSH_BATCH_SIZE', 5)
+    db_path = str(tmp_path / 'metrics.db')
+    registry = MetricsRegistry()
+    registry.configure(db_path)
+    try:
+        for _ in range(5):
+            registry.count('items')
+        deadline = time.time() + 2
+        rows = 0
+        while time.time() < deadline and not rows:
+            time.sleep(0.02)
+            conn = sqlite3.connect(db_path)
+            rows = conn.execute('SELECT COUNT(*) FROM metrics_samples').fetchone()[0]
+            conn.close()
+        assert rows == 5
+        assert not registry._stop_event.is_set()
+    finally:
+        registry.stop_flusher()
+    assert registry._flusher is None
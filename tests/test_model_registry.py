@@ -0,0 +1,25 @@
+"""Model registry: availability is answered without loading anything"""
+
+from core.model_registry import ModelRegistry
+
+
+def test_is_available_does_not_load():
+    registry = ModelRegistry(budget_mb=4096, idle_minutes=0)
+    loads = []
+    registry.register('writer', lambda: loads.append(1) or object(), size_mb=100, check=lambda: True)
+    registry.register('missing', lambda: loads.append(1) or object(), size_mb=100, check=lambda: False)
+
+    assert registry.is_available('writer')
+    assert not registry.is_available('missing')
+    assert not registry.is_available('unregistered')
+    assert loads == []
+    assert not registry.is_loaded('writer')
+
+
+def test_failed_load_is_unavailable():
+    registry = ModelRegistry(budget_mb=4096, idle_minutes=0)
+    registry.register('broken', lambda: None, size_mb=100, check=lambda: True)
+
+    assert registry.is_available('broken')
+    assert registry.get('broken') is None
+    assert not registry.is_available('broken')
@@ -0,0 +1,25 @@
+"""Staged pipeline: stop() reaches handlers that loop inside one item"""
+
+import time
+
+from core.pipeline import Stage, StagedPipeline
+
+
+def test_stop_ends_looping_handler():
+    steps = []
+
+    def publish(_):
+        # Like the publish stage: keep processing while jobs are due
+        while not pipeline.is_stopping():
+            steps.append(1)
+            time.sleep(0.01)
+        return None
+
+    pipeline = StagedPipeline([Stage('publish', publish, source=True)])
+    pipeline.start()
+    time.sleep(0.05)
+    assert pipeline.is_running() and not pipeline.is_stopping()
+
+    pipeline.stop()
+    assert pipeline.join(timeout=2)
+    assert steps
@@ -0,0 +1,187 @@
+"""Publish outbox state machine: queue, publish, retry, give up, update, refunds"""
+
+import sqlite3
+
+import pytest
+
+from core import publish_outbox
+from core.database import DatabaseSetup
+from core.publish_outbox import PublishOutbox
+
+SITE = 'https://news.example.com'
+
+
+class FakeWordPress:
+    """Stands in for WordPressAPI: scripted publish outcomes, records calls"""
+
+    def __init__(self):
+        self.outcomes = []          # 'saved' / 'rejected' / 'unknown' / 'not_sent' / Exception
+        self.calls = []
+        self.existing = None
+        self.last_publish_outcome = None
+
+    def publish_draft(self, draft_id, workspace_id, idempotency_key=None, post_id=None):
+        self.calls.append((draft_id, post_id))
+        outcome = self.outcomes.pop(0) if self.outcomes else 'saved'
+        if isinstance(outcome, Exception):
+            raise outcome
+        self.last_publish_outcome = outcome
+        if outcome != 'saved':
+            return None
+        post_id = post_id or 500 + len(self.calls)
+        return {'post_id': post_id, 'url': f"{SITE}/?p={post_id}"}
+
+    def find_post_by_idempotency_key(self, workspace_id, idempotency_key):
+        return self.existing
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    # Failed jobs are due again immediately
+    monkeypatch.setattr(publish_outbox, 'BACKOFF_BASE_SECONDS', 0)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'nexuzy.db')
+    DatabaseSetup(path)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO workspaces (id, name) VALUES (1, 'Desk')")
+    conn.execute("INSERT INTO wp_credentials (workspace_id, site_url, username, app_password) VALUES (1, ?, 'u', 'p')",
+                 (SITE + '/',))
+    conn.executemany("INSERT INTO ai_drafts (id, workspace_id, title, body_draft) VALUES (?, 1, 'Title', 'Body')",
+                     [(1,), (2,)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def api():
+    return FakeWordPress()
+
+
+@pytest.fixture
+def outbox(db_path, api):
+    box = PublishOutbox(db_path, wordpress_api=api, max_attempts=3)
+    box.set_rate_limit(SITE, posts_per_day=1, burst=2)
+    return box
+
+
+def tokens(db_path):
+    conn = sqlite3.connect(db_path)
+    value = conn.execute('SELECT tokens FROM publish_rate_limits WHERE site_url = ?', (SITE,)).fetchone()[0]
+    conn.close()
+    return value
+
+
+def test_queue_then_publish(outbox, api):
+    job = outbox.enqueue(1, 1)
+    assert job['created'] and job['status'] == 'queued' and job['action'] == 'create'
+
+    assert outbox.process_next() == 0
+    job = outbox.get_job(job['id'])
+    assert job['status'] == 'published' and job['post_id'] == 501
+
+    again = outbox.enqueue(1, 1)
+    assert not again['created'] and again['id'] == job['id']
+    assert outbox.process_next() is None
+    assert len(api.calls) == 1
+
+
+def test_rate_limit_holds_jobs_back(outbox, api):
+    for draft_id in (1, 2):
+        outbox.enqueue(draft_id, 1)
+    outbox.set_rate_limit(SITE, posts_per_day=1, burst=1)
+
+    assert outbox.process_next() == 0
+    wait = outbox.process_next()
+    assert wait is not None and wait > 3600
+    assert outbox.get_status_counts(1) == {'published': 1, 'queued': 1}
+
+
+def test_rejected_post_refunds_token(outbox, api, db_path):
+    api.outcomes = ['rejected']
+    job = outbox.enqueue(1, 1)
+    before = tokens(db_path)
+
+    outbox.process_next()
+    assert outbox.get_job(job['id'])['status'] == 'queued'
+    assert tokens(db_path) == pytest.approx(before, abs=0.01)
+
+
+@pytest.mark.parametrize('outcome', ['unknown', ConnectionError('read timed out')])
+def test_ambiguous_failure_keeps_token(outbox, api, db_path, outcome):
+    api.outcomes = [outcome]
+    job = outbox.enqueue(1, 1)
+    before = tokens(db_path)
+
+    outbox.process_next()
+    assert outbox.get_job(job['id'])['status'] == 'queued'
+    assert tokens(db_path) == pytest.approx(before - 1, abs=0.01)
+
+
+def test_retry_finds_post_from_interrupted_attempt(outbox, api):
+    api.outcomes = ['unknown']
+    job = outbox.enqueue(1, 1)
+    outbox.process_next()
+
+    api.existing = {'post_id': 777, 'url': f"{SITE}/?p=777"}
+    outbox.process_next()
+    job = outbox.get_job(job['id'])
+    assert job['status'] == 'published' and job['post_id'] == 777
+    assert len(api.calls) == 1
+
+
+def test_gives_up_after_max_attempts_and_enqueue_retries(outbox, api):
+    outbox.set_rate_limit(SITE, posts_per_day=1, burst=5)
+    api.outcomes = ['rejected'] * 3
+    job = outbox.enqueue(1, 1)
+    for _ in range(3):
+        outbox.process_next()
+    assert outbox.get_job(job['id'])['status'] == 'failed'
+
+    again = outbox.enqueue(1, 1)
+    assert again['id'] == job['id'] and again['status'] == 'queued' and again['attempts'] == 0
+    outbox.process_next()
+    assert outbox.get_job(job['id'])['status'] == 'published'
+
+
+def test_deleted_draft_fails_without_spending_token(outbox, db_path):
+    job = outbox.enqueue(1, 1)
+    before = tokens(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute('DELETE FROM ai_drafts WHERE id = 1')
+    conn.commit()
+    conn.close()
+
+    outbox.process_next()
+    job = outbox.get_job(job['id'])
+    assert job['status'] == 'failed' and job['last_error'] == 'Draft no longer exists'
+    assert tokens(db_path) == pytest.approx(before, abs=0.01)
+
+
+def test_update_pushes_edits_to_existing_post(outbox, api, db_path):
+    first = outbox.enqueue(1, 1)
+    outbox.process_next()
+    outbox.set_rate_limit(SITE, posts_per_day=1, burst=1)
+    before = tokens(db_path)
+
+    update = outbox.enqueue(1, 1, update=True)
+    assert update['created'] and update['action'] == 'update' and update['post_id'] == 501
+    assert update['id'] != first['id']
+
+    assert outbox.process_next() == 0
+    assert api.calls[-1] == (1, 501)
+    assert outbox.get_job(update['id'])['status'] == 'published'
+    assert tokens(db_path) == pytest.approx(before, abs=0.01)
+
+
+def test_cancel_only_unpublished_jobs(outbox):
+    queued = outbox.enqueue(1, 1)
+    assert outbox.cancel(queued['id'])
+    assert outbox.get_job(queued['id'])['status'] == 'cancelled'
+
+    published = outbox.enqueue(2, 1)
+    outbox.process_next()
+    assert not outbox.cancel(published['id'])
@@ -0,0 +1,91 @@
+"""Translation queue: saves re-queue only on edits, re-translations overwrite the same rows"""
+
+import sqlite3
+
+import pytest
+
+from core.database import DatabaseSetup
+from core.translation_queue import TranslationQueue
+from core.translator import Translator
+
+
+class EchoTranslator(Translator):
+    """Translator with the model replaced by a marker prefix"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.translation_cache = {}
+        self.calls = 0
+
+    def translate_text(self, text, target_language, force_refresh=False):
+        self.calls += 1
+        return f"<{target_language}> {text}", False
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'nexuzy.db')
+    DatabaseSetup(path)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO workspaces (id, name) VALUES (1, 'Desk')")
+    conn.execute("INSERT INTO ai_drafts (id, workspace_id, title, body_draft) VALUES (1, 1, 'Flood defences', 'First text')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def counts(db_path):
+    conn = sqlite3.connect(db_path)
+    drafts = conn.execute("SELECT COUNT(*) FROM ai_drafts WHERE title LIKE '%[Spanish]'").fetchone()[0]
+    translations = conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+    conn.close()
+    return drafts, translations
+
+
+def test_unchanged_save_queues_nothing(db_path):
+    queue = TranslationQueue(db_path, translator=EchoTranslator(db_path))
+    assert queue.enqueue_draft(1, 1, ['Spanish']) == 1
+    assert queue.run_pending() == 1
+
+    assert queue.enqueue_draft(1, 1, ['Spanish']) == 0
+    assert queue.run_pending() == 0
+    assert counts(db_path) == (1, 1)
+
+
+def test_edit_updates_existing_translation(db_path):
+    queue = TranslationQueue(db_path, translator=EchoTranslator(db_path))
+    queue.enqueue_draft(1, 1, ['Spanish'])
+    queue.run_pending()
+    first = queue.get_jobs(1)[0]['translated_draft_id']
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE ai_drafts SET body_draft = 'Edited text' WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    assert queue.enqueue_draft(1, 1, ['Spanish']) == 1
+    assert queue.run_pending() == 1
+    job = queue.get_jobs(1)[0]
+    assert job['status'] == 'done'
+    assert job['translated_draft_id'] == first
+    assert counts(db_path) == (1, 1)
+
+    conn = sqlite3.connect(db_path)
+    body = conn.execute('SELECT body_draft FROM ai_drafts WHERE id = ?', (first,)).fetchone()[0]
+    conn.close()
+    assert body == '<Spanish> Edited text'
+
+
+def test_translated_draft_deleted_is_recreated(db_path):
+    queue = TranslationQueue(db_path, translator=EchoTranslator(db_path))
+    queue.enqueue_draft(1, 1, ['Spanish'])
+    queue.run_pending()
+    conn = sqlite3.connect(db_path)
+    conn.execute('DELETE FROM ai_drafts WHERE id = ?', (queue.get_jobs(1)[0]['translated_draft_id'],))
+    conn.execute("UPDATE ai_drafts SET title = 'Flood defences approved' WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    queue.enqueue_draft(1, 1, ['Spanish'])
+    queue.run_pending()
+    assert counts(db_path) == (1, 1)
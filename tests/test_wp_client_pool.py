@@ -0,0 +1,67 @@
+"""WordPress client pool: credential changes replace the pooled client"""
+
+import sqlite3
+
+import pytest
+
+from core import wp_client_pool
+from core.database import DatabaseSetup
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'nexuzy.db')
+    DatabaseSetup(path)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO workspaces (id, name) VALUES (1, 'Desk')")
+    conn.execute("INSERT INTO wp_credentials (workspace_id, site_url, username, app_password) "
+                 "VALUES (1, 'https://a.example.com', 'editor', 'old-pass')")
+    conn.commit()
+    conn.close()
+    yield path
+    wp_client_pool.close_all()
+
+
+def update_credentials(db_path, **values):
+    conn = sqlite3.connect(db_path)
+    for column, value in values.items():
+        conn.execute(f'UPDATE wp_credentials SET {column} = ? WHERE workspace_id = 1', (value,))
+    conn.commit()
+    conn.close()
+
+
+def test_client_reused_while_credentials_unchanged(db_path):
+    assert wp_client_pool.get_client(db_path, 1) is wp_client_pool.get_client(db_path, 1)
+
+
+def test_password_change_noticed_after_ttl(db_path, monkeypatch):
+    client = wp_client_pool.get_client(db_path, 1)
+    update_credentials(db_path, app_password='new-pass')
+    assert wp_client_pool.get_client(db_path, 1) is client   # row still cached
+
+    monkeypatch.setattr(wp_client_pool, 'CREDENTIALS_TTL_SECONDS', 0)
+    fresh = wp_client_pool.get_client(db_path, 1)
+    assert fresh is not client
+    assert fresh.session.auth == ('editor', 'new-pass')
+
+
+def test_site_change_replaces_client(db_path, monkeypatch):
+    monkeypatch.setattr(wp_client_pool, 'CREDENTIALS_TTL_SECONDS', 0)
+    old = wp_client_pool.get_client(db_path, 1)
+    update_credentials(db_path, site_url='https://b.example.com/')
+
+    client = wp_client_pool.get_client(db_path, 1)
+    assert client.site_url == 'https://b.example.com'
+    assert (1, 'https://a.example.com') not in wp_client_pool._clients
+    assert old is not client
+
+
+def test_invalidate_applies_change_at_once(db_path):
+    client = wp_client_pool.get_client(db_path, 1)
+    update_credentials(db_path, app_password='new-pass')
+    wp_client_pool.invalidate_workspace(1)
+    assert wp_client_pool.get_client(db_path, 1) is not client
+
+
+def test_missing_credentials(db_path):
+    assert wp_client_pool.get_client(db_path, 2) is None
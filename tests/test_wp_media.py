@@ -0,0 +1,26 @@
+"""WordPress media relay: images are deduplicated by content before posting"""
+
+import requests
+
+from benchmarks.wp_stub import WPStubServer
+from core.image_store import ImageStore
+from core.wp_media import WPMediaUploader
+
+JPEG = bytes([0xFF, 0xD8, 0xFF, 0xE0]) + bytes(range(256)) * 40
+
+
+def test_same_bytes_from_new_url_reuse_media(origin, tmp_path):
+    server = origin({'/a/photo.jpg': (200, {'Content-Type': 'image/jpeg'}, JPEG),
+                     '/b/photo-copy.jpg': (200, {'Content-Type': 'image/jpeg'}, JPEG)})
+    db_path = str(tmp_path / 'nexuzy.db')
+    store = ImageStore(db_path, root=str(tmp_path / 'images'), session=requests.Session())
+
+    with WPStubServer() as wordpress:
+        uploader = WPMediaUploader(db_path, requests.Session(), wordpress.url, image_store=store)
+        first = uploader.upload_from_url(f"{server.url}/a/photo.jpg")
+        second = uploader.upload_from_url(f"{server.url}/b/photo-copy.jpg")
+        again = uploader.upload_from_url(f"{server.url}/b/photo-copy.jpg")
+
+        assert first and first == second == again
+        assert wordpress.state.requests['POST /wp-json/wp/v2/media'] == 1
+    assert server.hits == [('GET', '/a/photo.jpg'), ('GET', '/b/photo-copy.jpg')]